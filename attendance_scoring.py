@@ -0,0 +1,111 @@
+# ============================================================
+# [Attendance Scoring] 출석 점수 계산 (벡터 연산 + 규칙 테이블)
+# ============================================================
+# 수집기 안의 행별 if/else (시간 문자열 사전식 비교) 대신, 명단 전체(또는 몇 달치
+# 히스토리)의 입/퇴실 시간을 한 번에 분 단위로 바꾸고 규칙을 배열 연산으로 적용한다.
+# 정책이 바뀌면 다시 크롤링하지 않고 로컬 히스토리만 재채점하면 된다.
+#
+#   점수: 1=출석, 0.5=지각/조퇴/퇴실 누락, 0=결석
+#   사유: present / late / early_leave / no_checkout / absent / excused
+
+import numpy as np
+import pandas as pd
+
+from daily_summary import publish_summaries
+
+REASONS = ("present", "late", "early_leave", "no_checkout", "absent", "excused")
+
+
+def to_minutes(times) -> np.ndarray:
+    """'09:05' / '9:05:30' -> 545.0 (분). '-', '', None 등은 NaN"""
+    # 시간 문자열 종류는 적으므로 고유값만 파싱한 뒤 코드로 펼침
+    codes, uniques = pd.factorize(pd.Series(times, dtype="object").astype(str))
+    parts = pd.Series(uniques, dtype="object").str.extract(r"^\s*(\d{1,2}):(\d{2})")
+    minutes = (pd.to_numeric(parts[0], errors="coerce") * 60 + pd.to_numeric(parts[1], errors="coerce")).to_numpy()
+    return np.append(minutes, np.nan)[codes]  # codes == -1 (결측) -> NaN
+
+
+class ScoringRules:
+    """
+    late_cutoff / leave_cutoff: 기본 기준 ("HH:MM")
+    overrides: {날짜: {"late_cutoff": "HH:MM", "leave_cutoff": "HH:MM"}} (반일 수업 등 날짜별 기준)
+    excused:   {(날짜, 이름), ...} 또는 {(날짜, 이름): 메모} (공결 -> 출석 처리)
+    """
+
+    def __init__(self, late_cutoff: str = "09:10", leave_cutoff: str = "21:00",
+                 overrides: dict = None, excused=None):
+        self.late_cutoff = late_cutoff
+        self.leave_cutoff = leave_cutoff
+        self.overrides = overrides or {}
+        self.excused = set(excused or ())
+
+    @classmethod
+    def from_config(cls, config) -> "ScoringRules":
+        return cls(
+            late_cutoff=config.LATE_CUTOFF,
+            leave_cutoff=config.LEAVE_CUTOFF,
+            overrides=getattr(config, "CUTOFF_OVERRIDES", None),
+            excused=getattr(config, "EXCUSED", None),
+        )
+
+    def cutoffs(self, dates: pd.Series) -> tuple:
+        """날짜 배열 -> (지각 기준 분, 조퇴 기준 분) 배열"""
+        late = pd.Series(to_minutes([self.late_cutoff])[0], index=dates.index)
+        leave = pd.Series(to_minutes([self.leave_cutoff])[0], index=dates.index)
+        for key, column in (("late_cutoff", late), ("leave_cutoff", leave)):
+            table = {d: to_minutes([o[key]])[0] for d, o in self.overrides.items() if key in o}
+            if table:
+                mapped = dates.map(table)
+                column.loc[mapped.notna()] = mapped[mapped.notna()]
+        return late.to_numpy(), leave.to_numpy()
+
+
+def score(df: pd.DataFrame, rules: ScoringRules) -> pd.DataFrame:
+    """
+    (날짜, 이름, 입실시간, 퇴실시간) -> 같은 DataFrame 에 '상태', '사유' 컬럼을 채워서 반환.
+    지각이 조퇴/퇴실 누락보다 우선 (기존 수집기 규칙과 동일).
+    """
+    out = df.copy()
+    if out.empty:
+        out["상태"], out["사유"] = pd.Series(dtype=float), pd.Series(dtype=object)
+        return out
+    dates = out['날짜'].astype(str)
+    in_m, out_m = to_minutes(out['입실시간']), to_minutes(out['퇴실시간'])
+    late_c, leave_c = rules.cutoffs(dates)
+
+    has_in, has_out = ~np.isnan(in_m), ~np.isnan(out_m)
+    excused = np.zeros(len(out), dtype=bool)
+    if rules.excused:
+        keys = pd.MultiIndex.from_arrays([dates, out['이름'].astype(str)])
+        excused = keys.isin(list(rules.excused))
+
+    conditions = [excused, ~has_in, in_m > late_c, has_out & (out_m < leave_c), ~has_out]
+    out["상태"] = np.select(conditions, [1.0, 0.0, 0.5, 0.5, 0.5], default=1.0)
+    out["사유"] = np.select(conditions, ["excused", "absent", "late", "early_leave", "no_checkout"], default="present")
+    return out
+
+
+def score_records(records: list, rules: ScoringRules) -> list:
+    """수집기 레코드 목록 -> 상태가 채워진 레코드 목록 (사유는 시트에 올리지 않음)"""
+    if not records:
+        return []
+    return score(pd.DataFrame(records), rules).drop(columns=["사유"]).to_dict("records")
+
+
+def rescore_history(store, rules: ScoringRules, start: str = None, end: str = None, spreadsheet=None) -> dict:
+    """
+    로컬 히스토리의 출석 기록을 새 규칙으로 재채점 (크롤링 없음).
+    점수가 바뀐 날짜만 변경 파티션이 되어 다음 동기화 때 시트에 반영된다.
+    바뀐 날짜의 일별 요약(daily_summary)도 다시 계산 (spreadsheet 를 주면 요약 탭까지 동기화).
+    반환값: {"changed_dates": [...], "reasons": {사유: 건수}}
+    """
+    df = store.frame("attendance", start=start, end=end)
+    if df.empty:
+        return {"changed_dates": [], "reasons": {}}
+    scored = score(df, rules)
+    changed = store.replace_dates("attendance", scored.drop(columns=["사유"]).to_dict("records"))
+    reasons = scored["사유"].value_counts().to_dict()
+    print(f"   🧮 출석 재채점 {len(scored)}건 -> 변경 날짜 {len(changed)}개 / 사유별 {reasons}")
+    if changed:
+        publish_summaries(store, "attendance", changed, spreadsheet)
+    return {"changed_dates": changed, "reasons": reasons}
@@ -0,0 +1,253 @@
+# ============================================================
+# [Benchmark] 수집/파싱/업로드 단계별 스케일링 측정
+# ============================================================
+# 합성 명단(100 ~ 5,000명)으로 단계별 소요 시간과 호출 수를 잰다.
+#   - 파서/채점/업로드(save_data): 브라우저 없이 항상 실행 (로컬 시트 백엔드로 API 호출/셀 수 집계)
+#   - HTTP 수집기: 로컬 JSON API 스텁을 aiohttp 로 수집 (브라우저 경로와 같은 레코드인지 확인)
+#   - 크롤링(--browser): 로컬 HTTP 합성 백오피스를 실제 크롬으로 수집 (WebDriver 왕복 수 집계)
+# 결과는 logs/benchmarks.jsonl 에 누적하고, 같은 (규모, 단계)의 직전 기록과 비교해서 출력.
+#
+#   python benchmarks/run_benchmarks.py
+#   python benchmarks/run_benchmarks.py --sizes 100,1000 --browser
+
+import os
+import sys
+import tempfile
+
+# 벤치마크 전용 로컬 히스토리/스냅샷 (실사용 data/ 를 건드리지 않도록 import 전에 지정)
+WORK_DIR = tempfile.mkdtemp(prefix="qaqc_bench_")
+os.environ["HISTORY_DB_PATH"] = os.path.join(WORK_DIR, "history.sqlite")
+os.environ["SAVE_SNAPSHOTS"] = "0"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import contextlib
+import io
+import json
+import shutil
+import time
+from collections import Counter
+from datetime import datetime
+
+import pandas as pd
+
+import daily_attendance as att
+import daily_til_bot as til
+from attendance_scoring import ScoringRules, score
+from sheet_backend import LocalSpreadsheet
+from roster_registry import RosterRegistry, memory_bytes
+from trends import til_trends
+
+from synthetic import BackofficeServer, SyntheticCohort
+
+REPORT_PATH = "logs/benchmarks.jsonl"
+DEFAULT_SIZES = (100, 1000, 5000)
+
+
+class Bench:
+    """단계 측정 + 결과 누적 (stdout 은 --verbose 가 아니면 숨김)"""
+
+    def __init__(self, verbose: bool = False):
+        self.verbose = verbose
+        self.results = []
+
+    def run(self, size: int, stage: str, fn, counters=None):
+        """counters: 호출 전후 스냅샷을 뜰 Counter 반환 함수 목록 {라벨: fn}"""
+        before = {label: Counter(get()) for label, get in (counters or {}).items()}
+        sink = contextlib.nullcontext() if self.verbose else contextlib.redirect_stdout(io.StringIO())
+        started = time.perf_counter()
+        with sink:
+            value = fn()
+        elapsed = time.perf_counter() - started
+        result = {"size": size, "stage": stage, "sec": round(elapsed, 4)}
+        for label, get in (counters or {}).items():
+            delta = Counter(get())
+            delta.subtract(before[label])
+            result[label] = {k: v for k, v in delta.items() if v}
+        self.results.append(result)
+        return value
+
+
+def previous_results(path: str) -> dict:
+    """{(규모, 단계): 직전 초}"""
+    previous = {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                row = json.loads(line)
+                previous[(row["size"], row["stage"])] = row["sec"]
+    except FileNotFoundError:
+        pass
+    return previous
+
+
+def bench_offline(bench: Bench, cohort: SyntheticCohort):
+    size = len(cohort.names)
+    rules = ScoringRules.from_config(att.Config())
+    target = cohort.target_date
+
+    # 1. 파서 (extract_rows 결과 -> 레코드)
+    rows = cohort.attendance_rows()
+    records = bench.run(size, "parse_attendance", lambda: att.parse_attendance_rows(rows, target, rules))
+    modals = {name: cohort.modal_rows(name) for name in cohort.names}
+    bench.run(size, "parse_til_modals", lambda: [til.parse_modal_rows(m, {target}) for m in modals.values()])
+
+    # 2. 채점 (이력 전체 재채점)
+    history = pd.DataFrame(cohort.attendance_history())
+    bench.run(size, f"score_history_{len(cohort.dates)}d", lambda: score(history, rules))
+
+    # 3. 업로드: 최초 저장 -> 같은 데이터 재저장 (변경 없음) -> 1명만 바뀐 재저장
+    if os.path.exists(os.environ["HISTORY_DB_PATH"]):
+        os.remove(os.environ["HISTORY_DB_PATH"])
+    spreadsheet = LocalSpreadsheet(":memory:")
+    counters = {"calls": lambda: spreadsheet.metrics.calls, "cells": lambda: spreadsheet.metrics.cells}
+    manager = att.AttendanceSheetManager(spreadsheet)
+    bench.run(size, "save_attendance_first", lambda: manager.save_data(records), counters)
+    bench.run(size, "save_attendance_unchanged", lambda: manager.save_data(records), counters)
+    changed = [dict(r) for r in records]
+    changed[0]["상태"] = 0.0 if changed[0]["상태"] else 1.0
+    bench.run(size, "save_attendance_one_change", lambda: manager.save_data(changed), counters)
+
+    til_df = pd.DataFrame(
+        [{"이름": n, "날짜": target, "제출여부": cohort.submissions[n][target]} for n in cohort.names]
+    )
+    til_manager = til.GoogleSheetManager(spreadsheet)
+    bench.run(size, "save_til_first", lambda: til_manager.save_data(til_df), counters)
+    bench.run(size, "save_til_unchanged", lambda: til_manager.save_data(til_df), counters)
+
+    # 4. 대시보드 트렌드 (날짜 x 학생 행렬)
+    long_til = pd.DataFrame(
+        [{"날짜": d, "이름": n, "제출여부": v} for n, dates in cohort.submissions.items() for d, v in dates.items()]
+    )
+    registry = RosterRegistry()
+    compact_til = bench.run(size, "compact_til", lambda: registry.compact_til(long_til))
+    print(f"   🧮 TIL 히스토리 메모리 {memory_bytes(long_til) / 1024:.0f}KB -> {memory_bytes(compact_til) / 1024:.0f}KB (정수 압축)")
+    bench.run(size, "trends_til", lambda: til_trends(compact_til))
+
+
+def bench_http(bench: Bench, cohort: SyntheticCohort, concurrency: int = 8) -> list:
+    """브라우저 없는 HTTP 수집기 (결과가 파서 경로와 같은지도 확인). 반환값: 불일치 메시지 목록"""
+    try:
+        import http_collector
+    except ImportError:
+        print("⚠️ aiohttp 없음 -> HTTP 수집기 측정 생략")
+        return []
+    size = len(cohort.names)
+    target = cohort.target_date
+    with BackofficeServer(cohort) as server:
+        class HttpConfig(att.Config):
+            BACKOFFICE_URL = server.url
+            HTTP_CONCURRENCY = concurrency
+
+        counters = {"http": lambda: Counter(requests=server.requests)}
+        records = bench.run(size, "http_attendance", lambda: http_collector.collect_attendance(HttpConfig(), target), counters)
+        til_records = bench.run(size, "http_til", lambda: http_collector.collect_til(HttpConfig(), target), counters)
+
+    mismatches = []
+    expected = att.parse_attendance_rows(cohort.attendance_rows(), target, ScoringRules.from_config(att.Config()))
+    if records != expected:
+        mismatches.append(f"[{size}명] HTTP 출석 레코드가 파서 경로와 다름")
+    if til_records != [{"이름": n, "날짜": target, "제출여부": cohort.submissions[n][target]} for n in cohort.names]:
+        mismatches.append(f"[{size}명] HTTP TIL 레코드가 합성 데이터와 다름")
+    for message in mismatches:
+        print(f"❌ {message}")
+    return mismatches
+
+
+def launch_benchmark_browser():
+    """헤드리스 크롬 1개 (없으면 None)"""
+    chrome = shutil.which("google-chrome") or shutil.which("chromium") or shutil.which("chromium-browser")
+    if not chrome:
+        return None
+
+    class BenchConfig(til.Config):
+        IS_SERVER = True
+        USE_NETWORK_CAPTURE = False
+        CHROME_APP_PATH = chrome
+
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            driver = til.ChromeManager.launch_chrome(BenchConfig())
+    except SystemExit:
+        return None
+
+    # WebDriver 왕복 수 집계 (find_elements / execute_script / click 등 모든 명령)
+    driver.bench_commands = Counter()
+    execute = driver.execute
+
+    def counting_execute(command, params=None):
+        driver.bench_commands[command] += 1
+        return execute(command, params)
+
+    driver.execute = counting_execute
+    return driver, BenchConfig
+
+
+def bench_browser(bench: Bench, cohort: SyntheticCohort, driver, config_cls, page_size: int):
+    size = len(cohort.names)
+    target = cohort.target_date
+    with BackofficeServer(cohort, page_size=page_size) as server:
+        counters = {"webdriver": lambda: driver.bench_commands, "http": lambda: Counter(requests=server.requests)}
+
+        driver.get(f"{server.url}/attendance")
+        crawler = att.AttendanceCrawler(driver, att.Config())
+        bench.run(size, "crawl_attendance", lambda: crawler.collect_data(target), counters)
+
+        driver.get(f"{server.url}/til")
+        til_crawler = til.BackOfficeCrawler(driver, config_cls())
+        til_crawler.MAX_PAGES = size // page_size + 2
+        bench.run(size, "crawl_til", lambda: til_crawler.collect_data(target), counters)
+
+
+def print_report(results: list, previous: dict):
+    print(f"\n{'규모':>6} {'단계':<28} {'초':>9} {'직전':>9} {'변화':>7}  호출/셀")
+    for r in results:
+        prev = previous.get((r["size"], r["stage"]))
+        change = f"{(r['sec'] / prev - 1) * 100:+.0f}%" if prev else ""
+        extra = " ".join(
+            f"{label}={dict(r[label])}" for label in ("calls", "cells", "webdriver", "http") if r.get(label)
+        )
+        print(f"{r['size']:>6} {r['stage']:<28} {r['sec']:>9.4f} {prev if prev is not None else '':>9} {change:>7}  {extra}")
+
+
+def save_report(results: list, path: str = REPORT_PATH):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    stamp = datetime.now().isoformat(timespec="seconds")
+    with open(path, "a", encoding="utf-8") as f:
+        for r in results:
+            f.write(json.dumps({"ts": stamp, **r}, ensure_ascii=False) + "\n")
+    print(f"\n📝 결과 기록: {path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="합성 명단 기반 오프라인 벤치마크")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="명단 크기 (쉼표 구분)")
+    parser.add_argument("--days", type=int, default=20, help="이력 영업일 수")
+    parser.add_argument("--page-size", type=int, default=10, help="TIL 목록 페이지당 행 수")
+    parser.add_argument("--browser", action="store_true", help="헤드리스 크롬으로 크롤링 단계까지 측정")
+    parser.add_argument("--verbose", action="store_true", help="수집기 로그 출력")
+    args = parser.parse_args()
+
+    bench = Bench(verbose=args.verbose)
+    mismatches = []
+    browser = launch_benchmark_browser() if args.browser else None
+    if args.browser and browser is None:
+        print("⚠️ 크롬을 찾을 수 없어 크롤링 단계는 생략합니다.")
+    try:
+        for size in [int(s) for s in args.sizes.split(",") if s.strip()]:
+            print(f"🏋️ 명단 {size}명 x {args.days}일 측정 중...")
+            cohort = SyntheticCohort(size, days=args.days)
+            bench_offline(bench, cohort)
+            mismatches += bench_http(bench, cohort)
+            if browser:
+                bench_browser(bench, cohort, browser[0], browser[1], args.page_size)
+    finally:
+        if browser:
+            browser[0].quit()
+        shutil.rmtree(WORK_DIR, ignore_errors=True)
+
+    print_report(bench.results, previous_results(REPORT_PATH))
+    save_report(bench.results)
+    if mismatches:
+        print(f"\n🚨 결과 불일치 {len(mismatches)}건")
+        sys.exit(1)
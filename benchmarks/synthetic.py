@@ -0,0 +1,217 @@
+# ============================================================
+# [Benchmark] 합성 백오피스 (대규모 명단 + 로컬 HTTP 서버)
+# ============================================================
+# 실제 백오피스와 같은 마크업 모양만 흉내 낸다.
+#   - 출석: div.css-1xm32e0 행 (이름 / 과정 / 상태 / 입실 / 퇴실 순서의 줄)
+#   - TIL: tr.ant-table-row 목록 + ant 페이지네이션 + '제출 내역 보기' 모달
+# 같은 데이터로 extract_rows() 결과 모양의 페이로드도 만들어 브라우저 없는 파서 측정에 사용.
+# /api/attendance, /api/til/* 는 HTTP 수집기(http_collector) 용 JSON API 스텁.
+
+import json
+import random
+import threading
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def business_dates(end: str, days: int) -> list:
+    """end 이전 영업일(주말 제외) days 개, 오름차순"""
+    cursor = datetime.strptime(end, "%Y-%m-%d")
+    dates = []
+    while len(dates) < days:
+        if cursor.weekday() < 5:
+            dates.append(cursor.strftime("%Y-%m-%d"))
+        cursor -= timedelta(days=1)
+    return sorted(dates)
+
+
+class SyntheticCohort:
+    """학생 n 명 x 영업일 days 일 (seed 고정 -> 실행마다 같은 데이터)"""
+
+    def __init__(self, students: int, days: int = 20, end: str = "2025-12-05", seed: int = 7):
+        rng = random.Random(seed)
+        self.names = [f"학생{i:05d}" for i in range(students)]
+        self.dates = business_dates(end, days)
+        self.target_date = self.dates[-1]
+        self.submissions = {
+            name: {d: int(rng.random() < 0.85) for d in self.dates} for name in self.names
+        }
+        self.times = {}
+        for name in self.names:
+            roll = rng.random()
+            if roll < 0.05:
+                self.times[name] = ("-", "-")
+            else:
+                in_time = f"09:{rng.randint(0, 9):02d}" if roll < 0.85 else f"09:{rng.randint(11, 59):02d}"
+                out_time = "21:00" if rng.random() < 0.9 else f"{rng.randint(17, 20):02d}:{rng.randint(0, 59):02d}"
+                self.times[name] = (in_time, out_time)
+
+    # ---------------- extract_rows() 모양 페이로드 ----------------
+
+    def attendance_rows(self) -> list:
+        rows = []
+        for name in self.names:
+            in_time, out_time = self.times[name]
+            lines = [name, "QA 4기", "수강중", in_time, out_time]
+            rows.append({"text": "\n".join(lines), "cells": lines, "buttons": []})
+        return rows
+
+    def modal_rows(self, name: str) -> list:
+        return [
+            {"text": "", "cells": [d, "제출" if v else "미제출"], "buttons": []}
+            for d, v in sorted(self.submissions[name].items(), reverse=True)
+        ]
+
+    def attendance_history(self) -> list:
+        """이력 레코드 (날짜 x 학생, 채점 전)"""
+        rng = random.Random(11)
+        records = []
+        for d in self.dates:
+            for name in self.names:
+                in_time = "-" if rng.random() < 0.05 else f"09:{rng.randint(0, 30):02d}"
+                out_time = "-" if in_time == "-" else ("21:00" if rng.random() < 0.9 else "18:30")
+                records.append({"날짜": d, "이름": name, "입실시간": in_time, "퇴실시간": out_time})
+        return records
+
+    # ---------------- JSON API (http_collector 스텁) ----------------
+
+    def attendance_api(self) -> dict:
+        def stamp(t):
+            return None if t == "-" else f"{self.target_date}T{t}:00"
+        return {"data": [
+            {"user": {"id": i, "name": n}, "checkIn": stamp(self.times[n][0]), "checkOut": stamp(self.times[n][1])}
+            for i, n in enumerate(self.names)
+        ]}
+
+    def students_api(self, page: int, size: int) -> dict:
+        chunk = self.names[(page - 1) * size:page * size]
+        offset = (page - 1) * size
+        return {"data": [{"id": offset + i, "name": n} for i, n in enumerate(chunk)], "total": len(self.names)}
+
+    def history_api(self, user_id: int) -> dict:
+        name = self.names[user_id]
+        return {"data": [{"date": d, "status": "SUBMITTED" if v else "NOT_SUBMITTED"}
+                         for d, v in sorted(self.submissions[name].items(), reverse=True)]}
+
+    # ---------------- HTML ----------------
+
+    def attendance_html(self) -> str:
+        rows = "".join(
+            f'<div class="css-1xm32e0"><div>{n}</div><div>QA 4기</div><div>수강중</div>'
+            f'<div>{self.times[n][0]}</div><div>{self.times[n][1]}</div></div>'
+            for n in self.names
+        )
+        return f"<html><body><div class='ant-select-selector'>QA 4기</div>{rows}</body></html>"
+
+    def til_html(self, page_size: int) -> str:
+        return TIL_APP.replace("__PAGE_SIZE__", str(page_size)).replace("__TOTAL__", str(len(self.names)))
+
+
+# 목록/모달은 XHR 로 받아서 그리는 SPA (실제 백오피스처럼 페이지 이동 시 전체 로드 없음)
+TIL_APP = """<html><body>
+<table><tbody id="rows"></tbody></table>
+<ul id="pager" class="ant-pagination"></ul>
+<div id="modal" style="display:none"><div class="ant-modal-content">
+  <table><tbody id="mrows"></tbody></table><button onclick="closeModal()"><span>OK</span></button>
+</div></div>
+<script>
+var PAGE_SIZE = __PAGE_SIZE__, TOTAL = __TOTAL__, PAGES = Math.max(1, Math.ceil(TOTAL / PAGE_SIZE));
+function get(url, cb) { var x = new XMLHttpRequest(); x.onload = function () { cb(JSON.parse(x.responseText)); }; x.open('GET', url); x.send(); }
+function li(cls, title, label, onclick) {
+  return '<li class="' + cls + '" title="' + title + '" onclick="' + onclick + '"><a>' + label + '</a></li>';
+}
+function render(page) {
+  get('/api/roster?page=' + page + '&size=' + PAGE_SIZE, function (names) {
+    document.getElementById('rows').innerHTML = names.map(function (n) {
+      return '<tr class="ant-table-row"><td>' + n + '</td><td>QA 4기</td><td><button onclick="openModal(\\'' + n + '\\')"><span>제출 내역 보기</span></button></td></tr>';
+    }).join('');
+    var items = [];
+    items.push(li('ant-pagination-prev' + (page === 1 ? ' ant-pagination-disabled' : ''), '', '&lt;', 'render(' + Math.max(1, page - 1) + ')'));
+    [1, page - 1, page, page + 1, PAGES].filter(function (p, i, a) { return p >= 1 && p <= PAGES && a.indexOf(p) === i; })
+      .sort(function (a, b) { return a - b; })
+      .forEach(function (p) { items.push(li('ant-pagination-item ant-pagination-item-' + p + (p === page ? ' ant-pagination-item-active' : ''), p, p, 'render(' + p + ')')); });
+    items.push(li('ant-pagination-next' + (page === PAGES ? ' ant-pagination-disabled' : ''), '', '&gt;', 'render(' + Math.min(PAGES, page + 1) + ')'));
+    document.getElementById('pager').innerHTML = items.join('');
+  });
+}
+function openModal(name) {
+  get('/api/history?name=' + encodeURIComponent(name), function (rows) {
+    document.getElementById('mrows').innerHTML = rows.length ? rows.map(function (r) {
+      return '<tr class="ant-table-row"><td>' + r[0] + '</td><td>' + r[1] + '</td></tr>';
+    }).join('') : '<tr class="ant-table-placeholder"><td>No data</td></tr>';
+    document.getElementById('modal').style.display = 'block';
+  });
+}
+function closeModal() { document.getElementById('modal').style.display = 'none'; document.getElementById('mrows').innerHTML = ''; }
+render(1);
+</script></body></html>"""
+
+
+class BackofficeServer:
+    """합성 백오피스를 127.0.0.1 임의 포트로 서비스 (with 문으로 시작/종료)"""
+
+    COHORT = {"category": "QA/QC", "course": "QA 4기"}  # 수집기 Config.CATEGORY / COURSE_NAME
+
+    def __init__(self, cohort: SyntheticCohort, page_size: int = 10):
+        self.cohort = cohort
+        self.page_size = page_size
+        self.requests = 0
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def in_cohort(self, query: dict) -> bool:
+        """명단/출석 API 는 기수 필터가 맞을 때만 데이터 반환 (필터 없는 요청은 빈 응답)"""
+        return all(query.get(k) == v for k, v in self.COHORT.items())
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, body: str, content_type: str):
+                data = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                server.requests += 1
+                url = urlparse(self.path)
+                query = {k: v[0] for k, v in parse_qs(url.query).items()}
+                cohort = server.cohort
+                if url.path == "/attendance":
+                    self._send(cohort.attendance_html(), "text/html")
+                elif url.path == "/til":
+                    self._send(cohort.til_html(server.page_size), "text/html")
+                elif url.path == "/api/roster":
+                    page, size = int(query.get("page", 1)), int(query.get("size", server.page_size))
+                    self._send(json.dumps(cohort.names[(page - 1) * size:page * size], ensure_ascii=False), "application/json")
+                elif url.path == "/api/attendance":
+                    payload = cohort.attendance_api() if server.in_cohort(query) else {"data": []}
+                    self._send(json.dumps(payload, ensure_ascii=False), "application/json")
+                elif url.path == "/api/til/students":
+                    page, size = int(query.get("page", 1)), int(query.get("size", 100))
+                    payload = cohort.students_api(page, size) if server.in_cohort(query) else {"data": [], "total": 0}
+                    self._send(json.dumps(payload, ensure_ascii=False), "application/json")
+                elif url.path == "/api/til/history":
+                    self._send(json.dumps(cohort.history_api(int(query["userId"])), ensure_ascii=False), "application/json")
+                elif url.path == "/api/history":
+                    rows = [r["cells"] for r in cohort.modal_rows(query.get("name", ""))]
+                    self._send(json.dumps(rows, ensure_ascii=False), "application/json")
+                else:
+                    self.send_error(404)
+
+        return Handler
+
+    def __enter__(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
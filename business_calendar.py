@@ -0,0 +1,194 @@
+# ============================================================
+# [Business Calendar] 공용 영업일 달력 + 시트 누락일(갭) 스캐너
+# ============================================================
+# 공휴일 표가 출석/TIL 스크립트에 따로 있었고 (출석은 2025년만), 최근 영업일을
+# 하루씩 거꾸로 걸어서 찾았다. 여기서는 공휴일 표를 한 곳에 두고
+# 정렬된 영업일 인덱스를 미리 만들어 이분 탐색으로 답한다.
+#   - is_business_day / previous_business_day / next_business_day / business_days(a, b)
+#   - 갭 스캐너: 워크시트별 기록된 날짜와 영업일 인덱스를 비교 -> 백필할 날짜 목록
+#
+#   python business_calendar.py --gaps                  # 시트별 누락 수집일
+#   python business_calendar.py --gaps --start 2025-11-03
+
+import argparse
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
+
+HOLIDAYS_KR = {
+    # 2025년
+    "2025-01-01": "신정", "2025-01-27": "설날 연휴", "2025-01-28": "설날",
+    "2025-01-29": "설날 연휴", "2025-01-30": "설날 대체공휴일",
+    "2025-03-01": "삼일절", "2025-03-03": "삼일절 대체공휴일",
+    "2025-05-05": "어린이날", "2025-05-06": "부처님오신날 대체공휴일",
+    "2025-06-03": "대통령선거(임시)", "2025-06-06": "현충일",
+    "2025-08-15": "광복절", "2025-10-03": "개천절",
+    "2025-10-05": "추석 연휴", "2025-10-06": "추석", "2025-10-07": "추석 연휴",
+    "2025-10-08": "추석 대체공휴일", "2025-10-09": "한글날", "2025-12-25": "크리스마스",
+    # 2026년
+    "2026-01-01": "새해", "2026-02-16": "설날 연휴", "2026-02-17": "설날",
+    "2026-02-18": "설날 연휴", "2026-03-01": "삼일절", "2026-03-02": "삼일절 대체공휴일",
+    "2026-05-05": "어린이날", "2026-05-24": "부처님오신날",
+    "2026-05-25": "부처님오신날 대체공휴일", "2026-06-06": "현충일",
+    "2026-08-15": "광복절", "2026-08-17": "광복절 대체공휴일",
+    "2026-09-24": "추석 연휴", "2026-09-25": "추석", "2026-09-26": "추석 연휴",
+    "2026-09-27": "추석 연휴", "2026-10-03": "개천절", "2026-10-05": "개천절 대체공휴일",
+    "2026-10-09": "한글날", "2026-12-25": "크리스마스",
+}
+
+# 갭 스캔 대상: {라벨: 워크시트 제목 (None = 첫 번째 시트)}
+GAP_SHEETS = {"til": None, "attendance": "raw_attendance_logs"}
+
+
+def _iso(value) -> str:
+    return value.strftime("%Y-%m-%d") if isinstance(value, (date, datetime)) else str(value)[:10]
+
+
+class BusinessCalendar:
+    """주말 + 공휴일을 뺀 영업일 인덱스 (ISO 문자열 정렬 = 날짜 정렬)"""
+
+    def __init__(self, holidays: dict = None):
+        self.holidays = dict(HOLIDAYS_KR if holidays is None else holidays)
+        years = sorted({int(d[:4]) for d in self.holidays}) or [date.today().year]
+        self.covered = (years[0], years[-1])  # 공휴일 표가 있는 연도 범위
+        self.days = []
+        self._span = None
+        self._build(date(years[0], 1, 1), date(years[-1], 12, 31))
+
+    def _build(self, first: date, last: date):
+        days, cursor = [], first
+        while cursor <= last:
+            iso = cursor.strftime("%Y-%m-%d")
+            if cursor.weekday() < 5 and iso not in self.holidays:
+                days.append(iso)
+            cursor += timedelta(days=1)
+        self.days = days
+        self._span = (first.strftime("%Y-%m-%d"), last.strftime("%Y-%m-%d"))
+
+    def _ensure(self, *isos, pad: int = 0):
+        """
+        인덱스 범위 밖 날짜면 연 단위로 확장 (공휴일 표가 없는 해는 주말만 제외).
+        pad: 이전/다음 영업일 탐색용 여유 연도 (-1 = 전년도까지, 1 = 다음 해까지)
+        """
+        first_year = int(min(isos)[:4]) + min(pad, 0)
+        last_year = int(max(isos)[:4]) + max(pad, 0)
+        if int(self._span[0][:4]) <= first_year and last_year <= int(self._span[1][:4]):
+            return
+        for iso in isos:
+            if not self.covered[0] <= int(iso[:4]) <= self.covered[1]:
+                print(f"   ⚠️ {iso[:4]}년 공휴일 정보 없음 (주말만 제외) -> business_calendar.HOLIDAYS_KR 갱신 필요")
+        self._build(date(min(first_year, int(self._span[0][:4])), 1, 1),
+                    date(max(last_year, int(self._span[1][:4])), 12, 31))
+
+    # ---------------- 조회 (O(log n)) ----------------
+
+    def is_business_day(self, day) -> bool:
+        iso = _iso(day)
+        self._ensure(iso)
+        i = bisect_left(self.days, iso)
+        return i < len(self.days) and self.days[i] == iso
+
+    def holiday_name(self, day) -> str:
+        return self.holidays.get(_iso(day))
+
+    def previous_business_day(self, day, inclusive: bool = False) -> str:
+        """day 이전(inclusive 면 당일 포함) 가장 가까운 영업일"""
+        iso = _iso(day)
+        self._ensure(iso, pad=-1)
+        i = (bisect_right if inclusive else bisect_left)(self.days, iso)
+        return self.days[i - 1] if i else None
+
+    def next_business_day(self, day, inclusive: bool = False) -> str:
+        iso = _iso(day)
+        self._ensure(iso, pad=1)
+        i = (bisect_left if inclusive else bisect_right)(self.days, iso)
+        return self.days[i] if i < len(self.days) else None
+
+    def business_days(self, start, end) -> list:
+        """[start, end] 구간의 영업일 (오름차순)"""
+        start, end = _iso(start), _iso(end)
+        if start > end:
+            return []
+        self._ensure(start, end)
+        return self.days[bisect_left(self.days, start):bisect_right(self.days, end)]
+
+    def holidays_between(self, start, end) -> list:
+        """(start, end) 구간의 평일 공휴일 [(날짜, 이름)] (건너뛴 날 안내용)"""
+        start, end = _iso(start), _iso(end)
+        return [(d, n) for d, n in sorted(self.holidays.items())
+                if start < d < end and datetime.strptime(d, "%Y-%m-%d").weekday() < 5]
+
+    # ---------------- 갭 스캔 ----------------
+
+    def missing_days(self, existing, start=None, end=None) -> list:
+        """[start, end] 영업일 중 existing 에 없는 날 (start 기본: 기록된 가장 이른 날)"""
+        existing = {_iso(d) for d in existing if d}
+        if start is None:
+            if not existing:
+                return []
+            start = min(existing)
+        end = end or self.previous_business_day(date.today())
+        return [d for d in self.business_days(start, end) if d not in existing]
+
+
+CALENDAR = BusinessCalendar()
+
+
+# ============================================================
+# 수집 대상 날짜 (봇 / 경량 CLI 공용, 표준 라이브러리만 사용)
+# ============================================================
+def attendance_target_date(now: datetime = None) -> str:
+    """출석: 오늘(KST)이 영업일이면 오늘, 주말/공휴일이면 None"""
+    kst_now = now or datetime.utcnow() + timedelta(hours=9)
+    today = kst_now.strftime("%Y-%m-%d")
+    print(f"🕒 [Timezone] 한국 시간(KST): {kst_now.strftime('%Y-%m-%d %H:%M:%S')}")
+    if CALENDAR.is_business_day(today):
+        return today
+    if kst_now.weekday() >= 5:
+        print(f"🛌 오늘은 주말({today})입니다. 봇이 쉽니다.")
+    else:
+        print(f"🏖️ 오늘은 공휴일({CALENDAR.holiday_name(today)})입니다. 봇이 쉽니다.")
+    return None
+
+
+def til_target_date(now: datetime = None) -> str:
+    """TIL: 가장 최근 영업일 (오늘 제외, 주말/공휴일 건너뜀)"""
+    today = (now or datetime.now()).date()
+    target = CALENDAR.previous_business_day(today)
+    for day, name in CALENDAR.holidays_between(target, today):
+        print(f"🏖️ 공휴일 스킵: {day} ({name})")
+    return target
+
+
+def scan_gaps(spreadsheet, sheets: dict = None, start=None, end=None, calendar: BusinessCalendar = None) -> dict:
+    """워크시트별 누락 수집일 {라벨: [날짜...]} (날짜 컬럼만 읽음)"""
+    from sheet_writer import IncrementalSheetWriter
+    import gspread
+
+    calendar = calendar or CALENDAR
+    gaps = {}
+    for label, title in (sheets or GAP_SHEETS).items():
+        try:
+            worksheet = spreadsheet.worksheet(title) if title else spreadsheet.sheet1
+        except gspread.exceptions.WorksheetNotFound:
+            print(f"   ⚠️ [{label}] 워크시트 '{title}' 없음 -> 스캔 생략")
+            continue
+        existing = IncrementalSheetWriter(worksheet).existing_dates()
+        gaps[label] = calendar.missing_days(existing, start, end)
+    return gaps
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="영업일 달력 / 시트 누락일 스캔")
+    parser.add_argument("--gaps", action="store_true", help="워크시트별 누락 수집일 출력")
+    parser.add_argument("--start", default=None, help="스캔 시작일 (기본: 시트에 기록된 가장 이른 날)")
+    parser.add_argument("--end", default=None, help="스캔 종료일 (기본: 어제 기준 최근 영업일)")
+    args = parser.parse_args()
+
+    if args.gaps:
+        from sheet_backend import open_spreadsheet
+        for label, missing in scan_gaps(open_spreadsheet(), start=args.start, end=args.end).items():
+            print(f"🔎 [{label}] 누락 영업일 {len(missing)}일: {', '.join(missing) if missing else '없음'}")
+    else:
+        today = date.today()
+        print(f"📅 오늘 {_iso(today)} 영업일 여부: {CALENDAR.is_business_day(today)}")
+        print(f"   이전 영업일: {CALENDAR.previous_business_day(today)} / 다음 영업일: {CALENDAR.next_business_day(today)}")
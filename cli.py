@@ -0,0 +1,82 @@
+# ============================================================
+# [CLI] 경량 진입점: 쉬는 날은 무거운 모듈을 import 하지 않고 바로 종료
+# ============================================================
+# daily_attendance.py / run_pipeline.py 는 모듈 로드만으로 selenium, pandas, gspread,
+# oauth2client 를 가져온다. 여기서는 표준 라이브러리 + 공용 달력만으로 수집 날짜와
+# 실행 여부를 먼저 정하고, 실제로 수집할 때만 파이프라인을 import 한다.
+#
+#   python cli.py                                   # 출석 + TIL (쉬는 날이면 수 ms 안에 종료)
+#   python cli.py --stages til
+#   python cli.py --stages attendance --check       # 판단만 (GITHUB_OUTPUT 에 run=true/false)
+#
+# 종료 코드: 요청한 단계 중 수집/저장 결과가 없는 단계가 있으면 1
+
+import argparse
+import os
+import sys
+import time
+
+_STARTED = time.perf_counter()
+
+from business_calendar import attendance_target_date, til_target_date
+
+STAGES = ("attendance", "til")
+
+
+def resolve_dates(stages, attendance_date: str = None, til_date: str = None) -> dict:
+    """{단계: 수집 날짜} (수집할 날이 없는 단계는 빠짐)"""
+    dates = {}
+    if "attendance" in stages:
+        dates["attendance"] = attendance_date or attendance_target_date()
+    if "til" in stages:
+        dates["til"] = til_date or til_target_date()
+    return {stage: d for stage, d in dates.items() if d}
+
+
+def write_github_output(values: dict):
+    """GitHub Actions 다음 스텝에서 쓸 출력 (로컬이면 무시)"""
+    path = os.environ.get("GITHUB_OUTPUT")
+    if not path:
+        return
+    with open(path, "a", encoding="utf-8") as f:
+        for key, value in values.items():
+            f.write(f"{key}={value}\n")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="출석 + TIL 경량 실행 (쉬는 날은 즉시 종료)")
+    parser.add_argument("--stages", default=",".join(STAGES), help="실행 단계 (쉼표 구분: attendance,til)")
+    parser.add_argument("--attendance-date", default=None, help="출석 수집 날짜 (기본: 오늘 KST)")
+    parser.add_argument("--til-date", default=None, help="TIL 수집 날짜 (기본: 최근 영업일)")
+    parser.add_argument("--check", action="store_true", help="수집 여부만 판단하고 종료")
+    args = parser.parse_args(argv)
+
+    stages = [s.strip() for s in args.stages.split(",") if s.strip() in STAGES]
+    dates = resolve_dates(stages, args.attendance_date, args.til_date)
+    decided = time.perf_counter() - _STARTED
+    summary = " / ".join(f"{s}: {dates.get(s, '생략')}" for s in stages)
+    print(f"🗓️ {summary} (판단 {decided * 1000:.0f}ms)")
+
+    write_github_output({"run": str(bool(dates)).lower(), "stages": ",".join(dates)})
+    if not dates:
+        print("😴 수집할 단계가 없습니다. 무거운 모듈 로드 없이 종료")
+        return 0
+    if args.check:
+        return 0
+
+    # 실제 수집이 있을 때만 selenium / pandas / gspread 로드
+    import_started = time.perf_counter()
+    import run_pipeline
+    imported = time.perf_counter() - import_started
+    print(f"📦 모듈 로드 {imported:.2f}s")
+
+    result = run_pipeline.run_pipeline(
+        list(dates), attendance_date=dates.get("attendance"), til_date=dates.get("til"),
+        startup={"decide_sec": round(decided, 4), "import_sec": round(imported, 3)},
+    )
+    # 요청 단계가 빈 결과로 끝나면 실패 코드 (워크플로가 실패로 표시 -> 재실행 시 체크포인트부터)
+    return 1 if result["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
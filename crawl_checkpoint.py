@@ -0,0 +1,113 @@
+# ============================================================
+# [Crawl Checkpoint] TIL 수집 진행 상황 저장 -> 재실행 시 남은 페이지/학생만 수집
+# ============================================================
+# 7페이지에서 StaleElement/모달 멈춤/Actions 타임아웃으로 죽어도 그때까지 수집한
+# 내용은 디스크에 남는다. 같은 날짜(들)로 다시 돌리면
+#   - 완료된 페이지는 건너뛰고 (첫 미완료 페이지로 바로 이동)
+#   - 미완료 페이지에서도 이미 모달을 본 학생은 다시 열지 않는다
+# 수집이 끝까지 성공하면 파일을 지운다.
+#
+#   data/checkpoints/til_<날짜 또는 기간>.json
+#   {"dates": [...], "updated_at": ..., "pages": {"3": [레코드...]}, "students": {"이름": {날짜: 0/1}}}
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+DEFAULT_DIR = os.environ.get("TIL_CHECKPOINT_DIR", "data/checkpoints")
+MAX_AGE_HOURS = float(os.environ.get("TIL_CHECKPOINT_MAX_AGE_HOURS", "12"))  # 이보다 오래되면 새로 수집
+
+
+def _key(dates: list) -> str:
+    if len(dates) == 1:
+        return dates[0]
+    return f"{dates[0]}_{dates[-1]}_{len(dates)}d"
+
+
+class CrawlCheckpoint:
+    """대상 날짜별 진행 상황 (병렬 워커에서 동시에 기록 가능, 기록마다 원자적 저장)"""
+
+    def __init__(self, target_dates, root: str = DEFAULT_DIR, max_age_hours: float = MAX_AGE_HOURS):
+        self.dates = sorted([target_dates] if isinstance(target_dates, str) else target_dates)
+        self.path = os.path.join(root, f"til_{_key(self.dates)}.json")
+        self._lock = threading.Lock()
+        self.pages = {}     # {페이지: [레코드]}
+        self.students = {}  # {이름: {날짜: 제출여부}} (모달로 확인한 학생)
+        self._load(max_age_hours)
+
+    def _load(self, max_age_hours: float):
+        try:
+            if time.time() - os.path.getmtime(self.path) > max_age_hours * 3600:
+                print(f"   🗑️ 오래된 체크포인트 무시: {self.path}")
+                return
+            with open(self.path, encoding="utf-8") as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            print(f"   ⚠️ 체크포인트 읽기 실패 (새로 수집): {e}")
+            return
+        if state.get("dates") != self.dates:
+            return
+        self.pages = {int(p): records for p, records in state.get("pages", {}).items()}
+        self.students = state.get("students", {})
+        if self.pages or self.students:
+            print(f"   ♻️ 체크포인트 이어받기: 완료 페이지 {sorted(self.pages)} / 확인된 학생 {len(self.students)}명")
+
+    def _flush(self):
+        state = {
+            "dates": self.dates, "updated_at": datetime.now().isoformat(timespec="seconds"),
+            "pages": {str(p): records for p, records in sorted(self.pages.items())},
+            "students": self.students,
+        }
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(state, f, ensure_ascii=False)
+            os.replace(tmp, self.path)  # 쓰는 도중 죽어도 이전 파일은 온전
+        except Exception as e:
+            print(f"   ⚠️ 체크포인트 저장 실패: {e}")
+
+    # ---------------- 기록 ----------------
+
+    def mark_student(self, name: str, history: dict):
+        with self._lock:
+            self.students[name] = {d: history.get(d, 0) for d in self.dates}
+            self._flush()
+
+    def mark_page(self, page: int, records: list):
+        with self._lock:
+            self.pages[page] = records
+            self._flush()
+
+    def clear(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    # ---------------- 조회 ----------------
+
+    def student(self, name: str):
+        """모달로 확인했던 학생의 {날짜: 제출여부} (없으면 None)"""
+        return self.students.get(name)
+
+    def first_pending_page(self) -> int:
+        page = 1
+        while page in self.pages:
+            page += 1
+        return page
+
+    def records(self) -> list:
+        """완료 페이지 레코드 (페이지 순서, (이름, 날짜) 중복 제거)"""
+        merged, seen = [], set()
+        for page in sorted(self.pages):
+            for record in self.pages[page]:
+                key = (record["이름"], record["날짜"])
+                if key in seen: continue
+                seen.add(key)
+                merged.append(record)
+        return merged
@@ -9,15 +9,25 @@ import time
 import os
 import sys
 import json
+import socket
+import subprocess
 import pandas as pd
-from datetime import datetime, timedelta
 from dotenv import load_dotenv
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
+from sheet_backend import open_spreadsheet
+from history_store import HistoryStore
+from daily_summary import publish_summaries, get_or_create_worksheet
+from waits import SmartWait, WaitProfiler
+from table_extract import extract_rows, row_lines
+from attendance_scoring import ScoringRules, score_records
+from snapshot_store import SnapshotStore
+import run_metrics
+import lean_browser
+from session_manager import SessionManager, load_cookies, selenium_cookies
+from driver_resolver import resolve_chromedriver
+from business_calendar import attendance_target_date
 
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -44,6 +54,10 @@ class Config:
 
     LATE_CUTOFF = "09:10"
     LEAVE_CUTOFF = "21:00"
+    # 날짜별 기준 (반일 수업 등): {"2025-12-24": {"leave_cutoff": "13:00"}}
+    CUTOFF_OVERRIDES = {}
+    # 공결 (출석 처리): {("2025-12-01", "홍길동"), ...}
+    EXCUSED = set()
     
     USER_DATA_DIR = os.path.expanduser("~/apm_profile")
     CHROME_DEBUG_PORT = 9222 
@@ -58,43 +72,40 @@ class Config:
     DATA_COLLECTION_WAIT = 1.0
     MODAL_WAIT = 1.5
 
-    HOLIDAYS_KR = {
-        "2025-01-01": "신정", "2025-01-27": "설날 연휴", "2025-01-28": "설날", 
-        "2025-01-29": "설날 연휴", "2025-01-30": "설날 대체공휴일",
-        "2025-03-01": "삼일절", "2025-03-03": "삼일절 대체공휴일", 
-        "2025-05-05": "어린이날", "2025-05-06": "부처님오신날 대체공휴일",
-        "2025-06-03": "대통령선거(임시)", "2025-06-06": "현충일", 
-        "2025-08-15": "광복절", "2025-10-03": "개천절",
-        "2025-10-05": "추석 연휴", "2025-10-06": "추석", "2025-10-07": "추석 연휴", 
-        "2025-10-08": "추석 대체공휴일", "2025-10-09": "한글날", "2025-12-25": "크리스마스"
-    }
+    # 조건 기반 대기별 소요 시간 기록 (실행마다 한 줄씩 누적)
+    WAIT_PROFILE_PATH = "logs/wait_profile.jsonl"
+
+    # 원본 표 스냅샷 저장 (replay.py 로 브라우저 없이 재처리)
+    SAVE_SNAPSHOTS = os.environ.get("SAVE_SNAPSHOTS", "1") == "1"
+
+    # 경량 브라우저: 이미지/폰트/미디어/트래커 요청 차단 (표를 그리는 JS/XHR 은 유지)
+    LEAN_BROWSER = os.environ.get("LEAN_BROWSER", "1") == "1"
+
+    # 수집 방식: "selenium" (기본, 크롬 렌더링) / "http" (브라우저 없이 백오피스 API 직접 호출, http_collector)
+    COLLECTOR = os.environ.get("COLLECTOR_BACKEND", "selenium").lower()
+    HTTP_CONCURRENCY = int(os.environ.get("HTTP_CONCURRENCY", "8"))
 
 # ============================================================
 # 2. DateCalculator
 # ============================================================
 class DateCalculator:
+    """공휴일/영업일은 공용 달력 (business_calendar.CALENDAR) 한 곳에서 관리"""
+
     @staticmethod
     def get_target_date(config: Config) -> str:
-        # KST 시간 보정
-        kst_now = datetime.utcnow() + timedelta(hours=9)
-        today = kst_now.date()
-        today_str = today.strftime("%Y-%m-%d")
-        
-        print(f"🕒 [Timezone] 한국 시간(KST): {kst_now.strftime('%Y-%m-%d %H:%M:%S')}")
-        
-        if today.weekday() >= 5:
-            print(f"🛌 오늘은 주말({today_str})입니다. 봇이 쉽니다.")
-            return None
-        if today_str in config.HOLIDAYS_KR:
-            print(f"🏖️ 오늘은 공휴일({config.HOLIDAYS_KR[today_str]})입니다. 봇이 쉽니다.")
-            return None
-            
-        return today_str
+        """오늘(KST)이 영업일이면 오늘, 아니면 None"""
+        return attendance_target_date()
 
 # ============================================================
 # 3. ChromeManager
 # ============================================================
 class ChromeManager:
+    @staticmethod
+    def driver_service(config: Config) -> Service:
+        """캐시된 chromedriver 사용 (크롬 버전이 그대로면 네트워크 조회 없음)"""
+        path = resolve_chromedriver(config.CHROME_APP_PATH)
+        return Service(path) if path else Service()
+
     @staticmethod
     def is_port_open(port):
         with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
@@ -102,7 +113,7 @@ class ChromeManager:
             return s.connect_ex(('127.0.0.1', port)) == 0
 
     @staticmethod
-    def launch_chrome(config: Config):
+    def launch_chrome(config: Config, profiler: WaitProfiler = None):
         options = webdriver.ChromeOptions()
         
         if config.IS_SERVER:
@@ -113,10 +124,14 @@ class ChromeManager:
             options.add_argument("--window-size=1920,1080")
             user_agent = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"
             options.add_argument(f"user-agent={user_agent}")
+            if config.LEAN_BROWSER:
+                lean_browser.apply_options(options)
             
             try:
-                driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+                driver = webdriver.Chrome(service=ChromeManager.driver_service(config), options=options)
                 driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+                if config.LEAN_BROWSER:
+                    lean_browser.enable(driver)
                 return driver
             except Exception as e:
                 print(f"❌ 크롬 실행 실패: {e}")
@@ -132,13 +147,17 @@ class ChromeManager:
                     f"--user-data-dir={config.USER_DATA_DIR}"
                 ]
                 subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                time.sleep(3)
+                SmartWait(None, profiler).until(
+                    "chrome_debug_port", lambda _: ChromeManager.is_port_open(config.CHROME_DEBUG_PORT), timeout=15, budget=3
+                )
             else:
                 print(f"   ⚡ 기존 크롬 연결")
 
             options.add_experimental_option("debuggerAddress", f"127.0.0.1:{config.CHROME_DEBUG_PORT}")
             try:
-                driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+                driver = webdriver.Chrome(service=ChromeManager.driver_service(config), options=options)
+                if config.LEAN_BROWSER:
+                    lean_browser.enable(driver)  # 기존 크롬: 시작 옵션 대신 CDP 차단만
                 return driver
             except Exception as e:
                 print(f"❌ 연결 실패: {e}")
@@ -147,33 +166,56 @@ class ChromeManager:
 # ============================================================
 # 4. Attendance Crawler (직통 URL 적용)
 # ============================================================
+def parse_attendance_rows(rows: list, target_date: str, rules: ScoringRules) -> list:
+    """extract_rows 결과 -> 채점된 레코드 (라이브 수집과 스냅샷 재처리가 같은 파서 사용)"""
+    total_data = []
+    for i, row in enumerate(rows):
+        try:
+            text_list = row_lines(row)
+            if len(text_list) < 5: continue
+
+            name = text_list[0].strip()     # 0번: 이름
+            in_time = text_list[3].strip()  # 3번: 입실
+            out_time = text_list[4].strip() # 4번: 퇴실
+
+            total_data.append({
+                "날짜": target_date,
+                "이름": name,
+                "입실시간": in_time or "-",
+                "퇴실시간": out_time or "-",
+            })
+        except Exception as e:
+            print(f"   ❌ {i+1}번째 행 에러: {e}")
+            continue
+
+    # 점수는 명단 전체를 한 번에 채점 (규칙: LATE/LEAVE_CUTOFF, CUTOFF_OVERRIDES, EXCUSED)
+    return score_records(total_data, rules)
+
 class AttendanceCrawler:
-    def __init__(self, driver, config: Config):
+    def __init__(self, driver, config: Config, profiler: WaitProfiler = None, snapshots: SnapshotStore = None):
         self.driver = driver
         self.config = config
+        self.snapshots = snapshots
         self.wait = WebDriverWait(driver, config.WAIT_TIMEOUT)
+        self.waits = SmartWait(driver, profiler, timeout=config.WAIT_TIMEOUT)
     
     def force_click(self, element):
         self.driver.execute_script("arguments[0].click();", element)
 
-    def navigate_to_attendance(self):
-        """쿠키 주입 후 직통 URL로 이동 (메뉴 클릭 삭제)"""
+    def navigate_to_attendance(self, inject_cookies: bool = True):
+        """쿠키 주입 후 직통 URL로 이동 (메뉴 클릭 삭제). 이미 로그인된 세션이면 inject_cookies=False"""
         print("\n🔗 백오피스 진입 (쿠키 작업 시작)...")
         
         # 1. 도메인 설정을 위해 메인 페이지 먼저 접속 (빈 페이지라도 가야 함)
-        self.driver.get(self.config.BACKOFFICE_URL)
+        if inject_cookies:
+            self.driver.get(self.config.BACKOFFICE_URL)
         
         # [서버] 쿠키 주입
-        if self.config.IS_SERVER:
-            cookies_json = os.environ.get("BACKOFFICE_COOKIES")
-            if cookies_json:
+        if self.config.IS_SERVER and inject_cookies:
+            if os.environ.get("BACKOFFICE_COOKIES"):
                 print("🍪 [서버] 쿠키 주입 시도...")
                 try:
-                    cookies = json.loads(cookies_json)
-                    for cookie in cookies:
-                        if 'expiry' in cookie: del cookie['expiry']
-                        if 'sameSite' in cookie: del cookie['sameSite']
-                        if 'domain' in cookie: del cookie['domain']
+                    for cookie in selenium_cookies(load_cookies()):
                         try: self.driver.add_cookie(cookie)
                         except: pass
                     
@@ -184,8 +226,8 @@ class AttendanceCrawler:
         print(f"🚀 대시보드로 순간이동: {self.config.ATTENDANCE_URL}")
         self.driver.get(self.config.ATTENDANCE_URL)
         
-        # 3. 로컬/서버 모두 로딩 대기
-        time.sleep(5) 
+        # 3. 로컬/서버 모두 로딩 대기 (드롭다운이 뜨거나 로그인 페이지로 튕길 때까지만)
+        self.waits.until("dashboard_landing", self._landing_settled, budget=5)
 
         # 4. 로그인 성공 여부 확인
         current_url = self.driver.current_url
@@ -201,6 +243,15 @@ class AttendanceCrawler:
         else:
             print("✅ 로그인 유지 성공!")
 
+    def _landing_settled(self, driver):
+        """로딩 완료 + (필터 드롭다운 표시 or 로그인 페이지로 이동) 여부"""
+        if driver.execute_script("return document.readyState") != "complete":
+            return False
+        url = driver.current_url
+        if "login" in url or "google.com" in url:
+            return True
+        return bool(driver.find_elements(By.CSS_SELECTOR, ".ant-select-selector"))
+
     def select_options(self):
         print("👉 [출석부] 옵션 선택 시작...")
         try:
@@ -210,7 +261,7 @@ class AttendanceCrawler:
                 cat_elem = self.wait.until(EC.element_to_be_clickable((By.XPATH, cat_xpath)))
                 self.force_click(cat_elem)
                 print("   ✅ 카테고리 'QA/QC' 선택")
-                time.sleep(1)
+                self.waits.network_idle("category_selected", budget=1)
             except: pass
 
             # 2. [기수 선택] ActionChains
@@ -222,7 +273,6 @@ class AttendanceCrawler:
                 )))
                 actions = ActionChains(self.driver)
                 actions.move_to_element(course_box).click().perform()
-                time.sleep(1)
 
                 target_course = "4회차"
                 course_opt = self.wait.until(EC.element_to_be_clickable((
@@ -234,7 +284,7 @@ class AttendanceCrawler:
             except Exception as e:
                 print(f"   ⚠️ 기수 선택 패스: {e}")
             
-            time.sleep(2)
+            self.waits.network_idle("course_selected", budget=2)
 
             # 3. [마케팅 기수 선택]
             print("   ⏳ 마케팅 기수 선택 중...")
@@ -246,7 +296,6 @@ class AttendanceCrawler:
                     actions.move_to_element(marketing_box).click().perform()
                 except:
                     self.force_click(marketing_box)
-                time.sleep(1)
                 
                 marketing_target = "품질관리(QAQC)" 
                 try:
@@ -260,7 +309,7 @@ class AttendanceCrawler:
             else:
                 print("   ⚠️ 두 번째 드롭다운 못 찾음")
 
-            time.sleep(1)
+            self.waits.network_idle("marketing_selected", budget=1)
 
             # 4. [조회] 버튼
             print("   🔍 조회 버튼 클릭...")
@@ -270,94 +319,114 @@ class AttendanceCrawler:
                 print("   ✅ 조회 버튼 클릭 완료")
             except: pass
             
-            time.sleep(5)
+            self.waits.network_idle("search_results", budget=5)
 
         except Exception as e:
             print(f"❌ 옵션 선택 중 오류: {e}")
 
     def collect_data(self, target_date) -> list:
         print(f"\n🐢 출석 데이터 수집 시작 (타겟: {target_date})")
-        total_data = []
         
         print("   ⏳ 테이블 로딩 중...")
         try:
             WebDriverWait(self.driver, 20).until(EC.presence_of_element_located((By.CLASS_NAME, "css-1xm32e0")))
-            time.sleep(2)
+            self.waits.rows_settled("attendance_rows", ".css-1xm32e0", budget=2)
         except:
             print("   ⚠️ 데이터 로딩 실패 or 없음")
             return []
         
-        rows = self.driver.find_elements(By.CLASS_NAME, "css-1xm32e0")
+        # 전체 행 텍스트를 execute_script 1회로 (행마다 row.text 왕복 X)
+        rows = extract_rows(self.driver, ".css-1xm32e0")
         print(f"   📄 총 {len(rows)}명의 데이터 발견")
+        if self.snapshots:
+            self.snapshots.put("attendance_table", rows, date=target_date)
 
-        for i, row in enumerate(rows):
-            try:
-                text_list = row.text.split('\n')
-                if len(text_list) < 5: continue
-
-                name = text_list[0].strip()     # 0번: 이름
-                in_time = text_list[3].strip()  # 3번: 입실
-                out_time = text_list[4].strip() # 4번: 퇴실
+        total_data = parse_attendance_rows(rows, target_date, ScoringRules.from_config(self.config))
+        for record in total_data[::5]:
+            print(f"   🔍 {record['이름']}: {record['입실시간']} ~ {record['퇴실시간']} -> 점수: {record['상태']}")
+        return total_data
 
-                if in_time == "-": in_time = ""
-                if out_time == "-": out_time = ""
-                
-                status = 0
-                if in_time:
-                    if in_time <= self.config.LATE_CUTOFF:
-                        status = 1 # 정상
-                        if out_time and out_time < self.config.LEAVE_CUTOFF:
-                            status = 0.5 # 조퇴
-                        elif not out_time:
-                             status = 0.5 
-                    else:
-                        status = 0.5 # 지각
-                        
-                if i % 5 == 0:
-                    print(f"   🔍 {name}: {in_time if in_time else '-'} ~ {out_time if out_time else '-'} -> 점수: {status}")
-
-                total_data.append({
-                    "날짜": target_date,
-                    "이름": name,
-                    "입실시간": in_time if in_time else "-",
-                    "퇴실시간": out_time if out_time else "-",
-                    "상태": status
-                })
+def _collect_over_http(config: Config, target_date: str) -> list:
+    """크롬 없이 백오피스 API 로 수집 (COLLECTOR_BACKEND=http)"""
+    from http_collector import collect_attendance
+    try:
+        with run_metrics.span("attendance_collect"):
+            data = collect_attendance(config, target_date)
+        run_metrics.incr("attendance_rows", len(data))
+        return data
+    except Exception as e:
+        print(f"❌ 에러 발생: {e}")
+        run_metrics.incr("errors.attendance")
+        return []
+
+def extract_attendance_data(target_date: str, driver=None, profiler: WaitProfiler = None) -> list:
+    """출석 수집. driver 를 넘기면 이미 로그인된 세션으로 보고 브라우저 실행/쿠키 주입 생략"""
+    config = Config()
+    owns_profiler = profiler is None
+    profiler = profiler or WaitProfiler()
+    inject_cookies = driver is None
+    if driver is None:
+        # 크롬 띄우기 전에 쿠키 만료/세션 확인 (죽은 쿠키면 수 초 안에 중단)
+        if config.IS_SERVER:
+            try:
+                SessionManager(config.BACKOFFICE_URL).preflight()
             except Exception as e:
-                print(f"   ❌ {i+1}번째 행 에러: {e}")
-                continue
-        return total_data
+                print(f"❌ 에러 발생: {e}")
+                return []
+        if config.COLLECTOR == "http":
+            return _collect_over_http(config, target_date)
+        with run_metrics.span("browser_launch"):
+            driver = ChromeManager.launch_chrome(config, profiler)
+    try:
+        snapshots = SnapshotStore() if config.SAVE_SNAPSHOTS else None
+        crawler = AttendanceCrawler(driver, config, profiler, snapshots=snapshots)
+        with run_metrics.span("login"):
+            crawler.navigate_to_attendance(inject_cookies=inject_cookies)
+        with run_metrics.span("select_options"):
+            crawler.select_options()
+        with run_metrics.span("attendance_collect"):
+            data = crawler.collect_data(target_date)
+        run_metrics.incr("attendance_rows", len(data))
+        return data
+    except Exception as e:
+        print(f"❌ 에러 발생: {e}")
+        run_metrics.incr("errors.attendance")
+        return []
+    finally:
+        if inject_cookies:  # 직접 띄운 브라우저만 (통합 실행은 파이프라인에서 보고)
+            lean_browser.report(driver, "attendance")
+        if owns_profiler:
+            profiler.report(config.WAIT_PROFILE_PATH, label=f"attendance {target_date}")
 
 # ============================================================
 # 5. 구글 시트 업로더
 # ============================================================
 class AttendanceSheetManager:
-    def __init__(self):
-        json_file = "qaqc-pipeline.json"
-        sheet_url = os.environ.get("TIL_SHEET_URL")
-        scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
-        creds = ServiceAccountCredentials.from_json_keyfile_name(json_file, scope)
-        client = gspread.authorize(creds)
-        self.sheet = client.open_by_url(sheet_url)
-        self.worksheet = self.sheet.worksheet("raw_attendance_logs") 
+    def __init__(self, spreadsheet=None):
+        """
+        spreadsheet: 이미 열린 Spreadsheet (통합 실행 시 인증 1회 공유).
+        없으면 SHEET_BACKEND 설정(gspread / local)으로 새로 연다.
+        """
+        if spreadsheet is None:
+            spreadsheet = open_spreadsheet()
+        self.sheet = spreadsheet
+        self.worksheet = get_or_create_worksheet(self.sheet, "raw_attendance_logs")
 
     def save_data(self, new_data):
-        df = pd.DataFrame(new_data)
-        existing_data = self.worksheet.get_all_records()
-        existing_df = pd.DataFrame(existing_data)
-        
-        target_date = new_data[0]['날짜']
-        if not existing_df.empty:
-            existing_df['날짜'] = existing_df['날짜'].astype(str)
-            existing_df = existing_df[existing_df['날짜'] != target_date]
-            
-        final_df = pd.concat([df, existing_df], ignore_index=True)
-        final_df = final_df.fillna("-")
-        if '날짜' in final_df.columns:
-            final_df = final_df.sort_values(by='날짜', ascending=False)
-
-        self.worksheet.clear()
-        self.worksheet.update([final_df.columns.values.tolist()] + final_df.values.tolist())
+        # 1. 로컬 히스토리에 먼저 기록 -> 2. 내용이 바뀐 날짜만 시트로 동기화
+        with run_metrics.span("sheet_write"):
+            store = HistoryStore()
+            try:
+                store.bootstrap_from_sheet("attendance", self.worksheet)
+                store.replace_dates("attendance", new_data)
+                store.sync_to_sheet("attendance", self.worksheet)
+                # 3. 날짜별 KPI 요약 갱신 (대시보드는 요약만 읽음)
+                dates = sorted({str(r.get('날짜')) for r in new_data if r.get('날짜')})
+                publish_summaries(store, "attendance", dates, self.sheet)
+            finally:
+                store.close()
+        if hasattr(self.sheet, "metrics"):
+            self.sheet.metrics.report("출석 저장 누적")
         print("✅ 출석 데이터 저장 완료!")
 
 # ============================================================
@@ -365,6 +434,7 @@ class AttendanceSheetManager:
 # ============================================================
 if __name__ == "__main__":
     print("🔥 [출석 봇] 가동 시작")
+    run_metrics.start_run("attendance")
     config = Config()
     
     if TARGET_DATE_OVERRIDE:
@@ -375,25 +445,16 @@ if __name__ == "__main__":
         print(f"🤖 [자동 모드] 날짜: {target_date}")
 
     if target_date:
-        driver = ChromeManager.launch_chrome(config)
-        if driver:
+        data = extract_attendance_data(target_date)
+        if data:
+            print(f"📊 {len(data)}건 수집 완료")
             try:
-                crawler = AttendanceCrawler(driver, config)
-                crawler.navigate_to_attendance() 
-                crawler.select_options()         
-                data = crawler.collect_data(target_date) 
-                if data:
-                    print(f"📊 {len(data)}건 수집 완료")
-                    try:
-                        uploader = AttendanceSheetManager()
-                        uploader.save_data(data)
-                    except Exception as e:
-                        print(f"❌ 시트 저장 실패: {e}")
-                else:
-                    print("⚠️ 수집된 데이터 없음")
+                uploader = AttendanceSheetManager()
+                uploader.save_data(data)
             except Exception as e:
-                print(f"❌ 에러 발생: {e}")
-            finally:
-                pass
+                print(f"❌ 시트 저장 실패: {e}")
+        else:
+            print("⚠️ 수집된 데이터 없음")
     else:
-        print("😴 주말/공휴일입니다.")
\ No newline at end of file
+        print("😴 주말/공휴일입니다.")
+    run_metrics.finish_run()
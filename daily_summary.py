@@ -0,0 +1,78 @@
+# ============================================================
+# [Daily Summary] 일별 KPI 요약 (저장 시점에 1회 집계)
+# ============================================================
+# 대시보드가 매 rerun 마다 원본 행을 필터링/집계하던 것을, 수집기가 저장할 때
+# 날짜당 1행(구분별)으로 미리 계산해 둔다.
+# 대시보드 KPI 카드/차트는 이 요약만 읽고, 원본 행은 상세 표를 펼칠 때만 로드.
+
+import pandas as pd
+
+SUMMARY_SHEET = "daily_summary"
+SUBMIT_PATTERN = "1|제출|완료"
+
+
+def _names(series: pd.Series) -> str:
+    return ", ".join(series.astype(str).tolist())
+
+
+def summarize_til(df: pd.DataFrame, date: str) -> dict:
+    """TIL 원본 행(이름/제출여부) -> 요약 1행"""
+    submitted = df['제출여부'].astype(str).str.contains(SUBMIT_PATTERN)
+    total = len(df)
+    submit_cnt = int(submitted.sum())
+    return {
+        "날짜": date, "구분": "TIL", "총원": total,
+        "제출": submit_cnt, "미제출": total - submit_cnt,
+        "비율": round(submit_cnt / total * 100, 1) if total else 0.0,
+        "미제출자": _names(df.loc[~submitted, '이름']),
+    }
+
+
+def summarize_attendance(df: pd.DataFrame, date: str) -> dict:
+    """출석 원본 행(이름/상태) -> 요약 1행 (1=출석, 0.5=지각/조퇴, 0=결석)"""
+    status = pd.to_numeric(df['상태'], errors='coerce').fillna(0)
+    total = len(df)
+    present = status == 1
+    late = status == 0.5
+    absent = status == 0
+    return {
+        "날짜": date, "구분": "출석", "총원": total,
+        "출석": int(present.sum()), "지각조퇴": int(late.sum()), "결석": int(absent.sum()),
+        "비율": round(float(present.sum()) / total * 100, 1) if total else 0.0,
+        "지각조퇴자": _names(df.loc[late, '이름']),
+        "결석자": _names(df.loc[absent, '이름']),
+    }
+
+
+SUMMARIZERS = {"til": summarize_til, "attendance": summarize_attendance}
+
+
+def get_or_create_worksheet(spreadsheet, title: str):
+    import gspread
+    try:
+        return spreadsheet.worksheet(title)
+    except gspread.exceptions.WorksheetNotFound:
+        print(f"   🆕 '{title}' 탭 생성")
+        return spreadsheet.add_worksheet(title=title, rows=1000, cols=12)
+
+
+def publish_summaries(store, kind: str, dates: list, spreadsheet=None) -> list:
+    """
+    로컬 히스토리의 해당 날짜 원본 -> 요약 계산 -> 로컬 저장 -> (spreadsheet 있으면) 요약 탭 동기화.
+    요약은 항상 날짜 전체 행 기준으로 다시 계산 (부분 수집이어도 정확).
+    """
+    summaries = []
+    for date in dates:
+        df = store.frame(kind, date=date)
+        if not df.empty:
+            summaries.append(SUMMARIZERS[kind](df, date))
+    if not summaries:
+        return []
+    store.replace_dates("daily_summary", summaries, keep_others=True)
+    if spreadsheet is not None:
+        try:
+            store.sync_to_sheet("daily_summary", get_or_create_worksheet(spreadsheet, SUMMARY_SHEET))
+        except Exception as e:
+            print(f"   ⚠️ 요약 탭 동기화 실패: {e}")
+    print(f"   📈 [{kind}] 일별 요약 {len(summaries)}건 갱신")
+    return summaries
@@ -7,24 +7,42 @@
 # 특정 날짜를 수집하려면 "2025-11-27" 처럼 문자열로 적으세요.
 TARGET_DATE_OVERRIDE = None 
 
+# 👇 [백필 설정] 여러 날짜를 한 번에 수집 (학생별 모달 1회 방문으로 모든 날짜 추출)
+# None = 사용 안 함 / ("2025-11-03", "2025-11-28") = 기간 지정 / "missing" = 시트에 빠진 영업일 전체
+BACKFILL_RANGE = None
+
 import subprocess
 import time
 import os
 import sys
 import socket
 import json
+import queue
+import shutil
+import tempfile
+import threading
 import pandas as pd
-from datetime import datetime, timedelta
 from dotenv import load_dotenv
 
 # [Google Sheet & OAuth]
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
+from sheet_backend import open_spreadsheet
+from sheet_writer import IncrementalSheetWriter
+from history_store import HistoryStore
+from daily_summary import publish_summaries
+from network_capture import PerformanceLogCapture, normalize_status
+from waits import SmartWait, WaitProfiler
+from table_extract import extract_rows, click_row_button
+from driver_resolver import resolve_chromedriver
+from session_manager import SessionManager, load_cookies, selenium_cookies
+from snapshot_store import SnapshotStore
+from crawl_checkpoint import CrawlCheckpoint
+from business_calendar import CALENDAR, til_target_date
+import run_metrics
+import lean_browser
 
 # [Selenium Libraries]
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -77,47 +95,50 @@ class Config:
     PAGE_NAVIGATION_WAIT = 2
     MODAL_WAIT = 0.8 
 
-    HOLIDAYS_KR = {
-        # 2025년
-        "2025-01-01": "신정", "2025-01-27": "설날 연휴", "2025-01-28": "설날", 
-        "2025-01-29": "설날 연휴", "2025-01-30": "설날 대체공휴일",
-        "2025-03-01": "삼일절", "2025-03-03": "삼일절 대체공휴일", 
-        "2025-05-05": "어린이날", "2025-05-06": "부처님오신날 대체공휴일",
-        "2025-06-03": "대통령선거(임시)", "2025-06-06": "현충일", 
-        "2025-08-15": "광복절", "2025-10-03": "개천절",
-        "2025-10-05": "추석 연휴", "2025-10-06": "추석", "2025-10-07": "추석 연휴", 
-        "2025-10-08": "추석 대체공휴일", "2025-10-09": "한글날", "2025-12-25": "크리스마스",
-        # 2026년
-        "2026-01-01": "새해", "2026-02-16": "설날 연휴", "2026-02-17": "설날", 
-        "2026-02-18": "설날 연휴", "2026-03-01": "삼일절", "2026-03-02": "삼일절 대체공휴일",
-        "2026-05-05": "어린이날", "2026-05-24": "부처님오신날", 
-        "2026-05-25": "부처님오신날 대체공휴일", "2026-06-06": "현충일",
-        "2026-08-15": "광복절", "2026-08-17": "광복절 대체공휴일",
-        "2026-09-24": "추석 연휴", "2026-09-25": "추석", "2026-09-26": "추석 연휴", 
-        "2026-09-27": "추석 연휴", "2026-10-03": "개천절", "2026-10-05": "개천절 대체공휴일",
-        "2026-10-09": "한글날", "2026-12-25": "크리스마스"
-    }
+    # 네트워크 캡처 모드: 대시보드 XHR 응답(JSON)에서 제출 내역 파싱 -> 모달 생략
+    # 캡처에 없는 학생만 기존 모달 경로로 확인
+    USE_NETWORK_CAPTURE = True
+    CAPTURE_URL_KEYWORDS = ["til"]
+
+    # 병렬 수집 워커 수 (1 = 기존 단일 브라우저 순차 수집)
+    CRAWL_WORKERS = int(os.environ.get("TIL_CRAWL_WORKERS", "1"))
+
+    # 조건 기반 대기별 소요 시간 기록 (실행마다 한 줄씩 누적)
+    WAIT_PROFILE_PATH = "logs/wait_profile.jsonl"
+
+    # 원본 표 스냅샷 저장 (replay.py 로 브라우저 없이 재처리)
+    SAVE_SNAPSHOTS = os.environ.get("SAVE_SNAPSHOTS", "1") == "1"
+
+    # 경량 브라우저: 이미지/폰트/미디어/트래커 요청 차단 (표를 그리는 JS/XHR 은 유지)
+    LEAN_BROWSER = os.environ.get("LEAN_BROWSER", "1") == "1"
+
+    # 수집 방식: "selenium" (기본, 크롬 렌더링) / "http" (브라우저 없이 백오피스 API 직접 호출, http_collector)
+    COLLECTOR = os.environ.get("COLLECTOR_BACKEND", "selenium").lower()
+    HTTP_CONCURRENCY = int(os.environ.get("HTTP_CONCURRENCY", "8"))
+
+    # 증분 수집: 이미 '제출(1)'로 기록된 학생은 모달 생략 (0/미기록 학생만 재확인)
+    # 제출 취소까지 잡아내야 하는 전체 재검증은 TIL_DELTA_CRAWL=0
+    DELTA_CRAWL = os.environ.get("TIL_DELTA_CRAWL", "1") == "1"
+
+    # 페이지/학생 단위 체크포인트 (중간에 죽으면 재실행 시 남은 작업만 수집)
+    USE_CHECKPOINT = os.environ.get("TIL_CHECKPOINT", "1") == "1"
 
 # ============================================================
 # 1. 날짜 계산기
 # ============================================================
 
 class DateCalculator:
+    """공휴일/영업일은 공용 달력 (business_calendar.CALENDAR) 한 곳에서 관리"""
+
     @staticmethod
     def get_target_date(config: Config) -> str:
-        """가장 최근 영업일(평일) 계산"""
-        cursor = datetime.now().date()
-        cursor -= timedelta(days=1) # 어제부터 탐색
-        while True:
-            cursor_str = cursor.strftime("%Y-%m-%d")
-            if cursor.weekday() >= 5: # 주말
-                cursor -= timedelta(days=1)
-                continue
-            if cursor_str in config.HOLIDAYS_KR: # 공휴일
-                print(f"🏖️ 공휴일 스킵: {cursor_str}")
-                cursor -= timedelta(days=1)
-                continue
-            return cursor_str
+        """가장 최근 영업일 (오늘 제외, 주말/공휴일 건너뜀)"""
+        return til_target_date()
+
+    @staticmethod
+    def business_days(config: Config, start: str, end: str) -> list:
+        """[start, end] 구간의 영업일 목록 (오름차순, 주말/공휴일 제외)"""
+        return CALENDAR.business_days(start, end)
 
 # ============================================================
 # 2. 브라우저 관리자
@@ -125,7 +146,13 @@ class DateCalculator:
 
 class ChromeManager:
     @staticmethod
-    def launch_chrome(config: Config):
+    def driver_service(config: Config) -> Service:
+        """캐시된 chromedriver 사용 (크롬 버전이 그대로면 네트워크 조회 없음)"""
+        path = resolve_chromedriver(config.CHROME_APP_PATH)
+        return Service(path) if path else Service()
+
+    @staticmethod
+    def launch_chrome(config: Config, profile_dir: str = None):
         options = webdriver.ChromeOptions()
         
         # [중요] 환경별 브라우저 설정
@@ -143,18 +170,26 @@ class ChromeManager:
         else:
             # 🍎 [로컬 모드] 화면 띄움 + 내 프로필 사용
             print("🍎 [로컬 모드] 맥 스튜디오 환경 감지 -> 화면 띄움 + 프로필 사용")
-            options.add_argument(f"--user-data-dir={config.USER_DATA_DIR}")
+            options.add_argument(f"--user-data-dir={profile_dir or config.USER_DATA_DIR}")
             options.add_argument("--window-size=1600,900")
         
         # 공통 설정
         options.add_argument("--disable-blink-features=AutomationControlled")
         options.add_experimental_option("excludeSwitches", ["enable-automation"])
         options.add_experimental_option("useAutomationExtension", False)
+        if config.USE_NETWORK_CAPTURE:
+            PerformanceLogCapture.enable(options)
+        if config.LEAN_BROWSER:
+            lean_browser.apply_options(options)
 
         print("🕵️‍♂️ 크롬 드라이버 초기화 중...")
         try:
-            driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+            driver = webdriver.Chrome(service=ChromeManager.driver_service(config), options=options)
             driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            if config.LEAN_BROWSER:
+                lean_browser.enable(driver)
+            elif config.USE_NETWORK_CAPTURE:
+                lean_browser.attach_stats(driver, lean=False)  # 차단 없는 실행 = 절감량 기준값
             return driver
         except Exception as e:
             print(f"❌ 크롬 실행 실패: {e}")
@@ -164,11 +199,37 @@ class ChromeManager:
 # 3. 크롤러 로직
 # ============================================================
 
+def _describe_dates(target_date) -> str:
+    if isinstance(target_date, str):
+        return target_date
+    dates = sorted(target_date)
+    return f"{dates[0]} ~ {dates[-1]}, {len(dates)}일" if dates else "없음"
+
+def parse_modal_rows(rows: list, wanted: set) -> dict:
+    """제출 내역 모달 행 -> {날짜: 제출여부} (원하는 날짜만, 라이브/스냅샷 재처리 공용)"""
+    history = {}
+    for cols in (r["cells"] for r in rows):
+        if len(cols) < 2: continue
+        row_date = cols[0]
+        if row_date in wanted:
+            history[row_date] = normalize_status(cols[1])
+            if len(history) == len(wanted): break
+    return history
+
 class BackOfficeCrawler:
-    def __init__(self, driver, config: Config):
+    def __init__(self, driver, config: Config, profiler: WaitProfiler = None, snapshots: SnapshotStore = None,
+                 checkpoint: CrawlCheckpoint = None):
         self.driver = driver
         self.config = config
+        self.snapshots = snapshots
+        self.checkpoint = checkpoint
+        self.known = {}  # 증분 수집: 이미 제출 확인된 학생 {이름: {날짜: 1}}
         self.wait = WebDriverWait(driver, config.WAIT_TIMEOUT)
+        self.waits = SmartWait(driver, profiler, timeout=config.WAIT_TIMEOUT)
+        self.capture = PerformanceLogCapture(driver, config.CAPTURE_URL_KEYWORDS) if config.USE_NETWORK_CAPTURE else None
+        self.captured = {}  # {이름: {날짜: 제출여부}}
+        self.failed_pages = set()  # 실패 학생이 있었던 페이지 (체크포인트 완료 처리 안 됨)
+        self.complete = False      # 마지막 collect_data 가 모든 페이지를 실패 없이 끝냈는지
     
     def force_click(self, element):
         try: element.click()
@@ -180,7 +241,7 @@ class BackOfficeCrawler:
             alert = self.driver.switch_to.alert
             print(f"⚠️ 경고창 발견: {alert.text}")
             alert.accept()
-            time.sleep(1)
+            self.waits.document_ready("alert_closed", budget=1)
         except: pass
 
     def select_options(self):
@@ -201,29 +262,29 @@ class BackOfficeCrawler:
             cat_xpath = f"//*[contains(text(), '{self.config.CATEGORY}')]"
             cat_elem = self.wait.until(EC.element_to_be_clickable((By.XPATH, cat_xpath)))
             self.force_click(cat_elem)
-            time.sleep(self.config.MENU_CLICK_WAIT)
+            self.waits.network_idle("category_selected", budget=self.config.MENU_CLICK_WAIT)
             
             # 2. 코스
             dropdowns = self.driver.find_elements(By.CSS_SELECTOR, ".ant-select-selector")
             if dropdowns:
                 self.force_click(dropdowns[0])
-                time.sleep(1)
                 cond = " and ".join([f"contains(., '{k}')" for k in self.config.COURSE_KEYWORDS])
                 opt = self.wait.until(EC.element_to_be_clickable((By.XPATH, f"//div[contains(@class, 'ant-select-item-option') and {cond}]")))
                 self.force_click(opt)
-                time.sleep(self.config.MENU_CLICK_WAIT)
+                self.waits.network_idle("course_selected", budget=self.config.MENU_CLICK_WAIT)
             
             # 3. 기수
             dropdowns = self.driver.find_elements(By.CSS_SELECTOR, ".ant-select-selector")
             if len(dropdowns) >= 2:
                 self.force_click(dropdowns[1])
-                time.sleep(1)
-                batch_opts = self.driver.find_elements(By.XPATH, f"//div[contains(@class, 'ant-select-item-option') and contains(., '{self.config.BATCH_NAME}')]")
+                batch_xpath = f"//div[contains(@class, 'ant-select-item-option') and contains(., '{self.config.BATCH_NAME}')]"
+                self.waits.until("batch_dropdown_open", lambda d: any(o.is_displayed() for o in d.find_elements(By.XPATH, batch_xpath)), budget=1)
+                batch_opts = self.driver.find_elements(By.XPATH, batch_xpath)
                 for opt in batch_opts:
                     if opt.is_displayed():
                         self.force_click(opt)
                         break
-                time.sleep(self.config.MENU_CLICK_WAIT)
+                self.waits.network_idle("batch_selected", budget=self.config.MENU_CLICK_WAIT)
             
             print("✅ 옵션 선택 완료")
         except Exception as e:
@@ -231,194 +292,579 @@ class BackOfficeCrawler:
             print(f"⚠️ 옵션 선택 실패: {e}")
             raise Exception("OPTIONS_SELECTION_FAILED: 로그인 실패 또는 DOM 요소 누락.")
 
-    def navigate_and_search(self):
+    def navigate_and_search(self, cookies: list = None, inject_cookies: bool = True):
+        """inject_cookies=False: 이미 로그인된 세션 (통합 실행에서 다른 수집기가 먼저 로그인한 경우)"""
         print("\n🔗 백오피스 진입...")
         self.driver.get(self.config.BACKOFFICE_URL)
         
-        # [서버용 쿠키 주입]
-        if self.config.IS_SERVER:
-            cookies_json = os.environ.get("BACKOFFICE_COOKIES")
-            if cookies_json:
-                print("🍪 쿠키 주입 시도...")
-                try:
-                    cookies = json.loads(cookies_json)
-                    for cookie in cookies:
-                        if 'expiry' in cookie: del cookie['expiry']
-                        if 'sameSite' in cookie: del cookie['sameSite']
-                        if 'domain' in cookie: del cookie['domain']
-                        try: self.driver.add_cookie(cookie)
-                        except: pass
+        with run_metrics.span("login"):
+            # [서버용 쿠키 주입] (병렬 워커는 기본 브라우저의 세션 쿠키를 넘겨받음)
+            if inject_cookies and (self.config.IS_SERVER or cookies is not None):
+                cookies_json = os.environ.get("BACKOFFICE_COOKIES")
+                if cookies_json or cookies is not None:
+                    print("🍪 쿠키 주입 시도...")
+                    try:
+                        if cookies is None:
+                            cookies = load_cookies(cookies_json)
+                        for cookie in selenium_cookies(cookies):
+                            try: self.driver.add_cookie(cookie)
+                            except: pass
                     
-                    self.driver.refresh()
-                    time.sleep(8) # 쿠키 적용 및 리디렉션 대기 시간 증가
-                    self.handle_alert()
+                        self.driver.refresh()
+                        # 쿠키 적용 및 리디렉션: 메뉴가 뜨거나 로그인 페이지로 튕길 때까지만 대기
+                        self.waits.until("cookie_login_redirect", self._landing_settled, budget=8)
+                        self.handle_alert()
                     
-                    # [최종 로그인 체크]
-                    if "login" in self.driver.current_url or "google.com" in self.driver.current_url:
-                        print(f"🚨 [치명적 실패] 쿠키 주입 후에도 로그인 페이지에 갇힘. (URL: {self.driver.current_url})")
-                        raise Exception("LOGIN_FAILED: 쿠키 만료 또는 IP 차단.")
-
-                except Exception as e: 
-                    print(f"⚠️ 쿠키 처리 중 오류: {e}")
-                    raise Exception("COOKIE_PROCESSING_ERROR: 쿠키 JSON 형식이 잘못되었거나 오류 발생.")
-        else:
-            print("ℹ️ [로컬] 기존 로그인 세션 사용 중... (3초 대기)")
-            time.sleep(3)
+                        # [최종 로그인 체크]
+                        if "login" in self.driver.current_url or "google.com" in self.driver.current_url:
+                            print(f"🚨 [치명적 실패] 쿠키 주입 후에도 로그인 페이지에 갇힘. (URL: {self.driver.current_url})")
+                            raise Exception("LOGIN_FAILED: 쿠키 만료 또는 IP 차단.")
+
+                    except Exception as e: 
+                        print(f"⚠️ 쿠키 처리 중 오류: {e}")
+                        raise Exception("COOKIE_PROCESSING_ERROR: 쿠키 JSON 형식이 잘못되었거나 오류 발생.")
+            else:
+                print("ℹ️ 기존 로그인 세션 사용 중... (페이지 로딩 대기)")
+                self.waits.until("local_session_landing", self._landing_settled, budget=3)
 
         # [메뉴 이동]
         try:
-            time.sleep(2)
+            self.waits.document_ready("menu_ready", budget=2)
             menu_xpath = "//span[contains(text(), 'TIL 제출 현황 관리')]"
             menu = self.driver.find_elements(By.XPATH, menu_xpath)
             if not menu or not menu[0].is_displayed():
                 op_menu = self.driver.find_element(By.XPATH, "//*[contains(text(), '내배캠 운영')]")
                 self.force_click(op_menu)
-                time.sleep(1)
             real_menu = self.wait.until(EC.element_to_be_clickable((By.XPATH, menu_xpath)))
             self.force_click(real_menu)
-            time.sleep(2)
+            self.waits.until("til_page_loaded", lambda d: d.find_elements(By.CSS_SELECTOR, ".ant-select-selector"), budget=2)
         except: pass
         
         # [옵션 선택 및 조회]
-        self.select_options()
+        with run_metrics.span("select_options"):
+            self.select_options()
+            
+            try:
+                search_btn = self.wait.until(EC.element_to_be_clickable((By.XPATH, "//button[contains(., '조회하기')]")))
+                self.force_click(search_btn)
+                self.waits.network_idle("search_results", budget=3)
+                self.handle_alert()
+            except: pass
+
+    def _landing_settled(self, driver):
+        """로딩 완료 + (좌측 메뉴 표시 or 로그인 페이지로 이동) 여부"""
+        if driver.execute_script("return document.readyState") != "complete":
+            return False
+        url = driver.current_url
+        if "login" in url or "google.com" in url:
+            return True
+        return bool(driver.find_elements(By.XPATH, "//*[contains(text(), '내배캠 운영') or contains(text(), 'TIL 제출 현황 관리')]"))
+
+    MAX_PAGES = 50
+
+    def scan_page(self, target_dates, page: int = None):
+        """
+        현재 페이지 학생들의 제출 여부 수집 (행이 없으면 None). 날짜 여러 개면 모달 1회로 전부 추출.
+        page 를 주면 실패 학생 없이 끝난 경우 체크포인트에 완료 페이지로 기록.
+        """
+        dates = [target_dates] if isinstance(target_dates, str) else list(target_dates)
+        wanted = set(dates)
+        page_data = []
+        failures = 0
+        decisions = {}  # {이름: {"source": captured/known/checkpoint/modal/failed, "history": {날짜: 값}}} -> replay 용
+        self.waits.rows_settled("page_rows", "tr.ant-table-row", timeout=self.config.WAIT_TIMEOUT / 2,
+                                budget=self.config.DATA_COLLECTION_WAIT)
         
+        # 행/셀 텍스트를 execute_script 1회로 (행마다 find_elements 왕복 X)
+        rows = extract_rows(self.driver, "tr.ant-table-row")
+        if not rows:
+            print("   ⚠️ 데이터 없음 (끝)")
+            return None
+        if self.snapshots:
+            self.snapshots.put("til_page", rows, dates=dates)
+        
+        # [네트워크 캡처] 지금까지 들어온 API 응답 반영
+        if self.capture:
+            fresh = self.capture.capture_history()
+            for name, history in fresh.items():
+                self.captured.setdefault(name, {}).update(history)
+            if fresh and self.snapshots:
+                self.snapshots.put("til_captured", fresh)
+            print(f"   📡 캡처된 제출 내역: {len(self.captured)}명")
+
+        row_count = len(rows)
+        for i, row in enumerate(rows):
+            try:
+                if not row["cells"]: continue
+                name = row["cells"][0]
+                print(f"   🔍 ({i+1}/{row_count}) {name}님...", end="\r")
+
+                # [네트워크 캡처] 대상 날짜가 전부 들어 있을 때만 사용 (일부만 있으면 모달로 확인)
+                if name in self.captured and wanted <= self.captured[name].keys():
+                    run_metrics.incr("til_captured_hits")
+                    decisions[name] = {"source": "captured", "history": {d: self.captured[name][d] for d in dates}}
+                    page_data.extend({"이름": name, "날짜": d, "제출여부": self.captured[name][d]} for d in dates)
+                    continue
+
+                # [증분 수집] 대상 날짜 모두 이미 제출로 기록된 학생
+                if name in self.known:
+                    run_metrics.incr("til_delta_skips")
+                    decisions[name] = {"source": "known", "history": {d: 1 for d in dates}}
+                    page_data.extend({"이름": name, "날짜": d, "제출여부": 1} for d in dates)
+                    continue
+
+                # [체크포인트] 이전 실행에서 이미 모달을 본 학생
+                saved = self.checkpoint.student(name) if self.checkpoint else None
+                if saved is not None:
+                    run_metrics.incr("til_checkpoint_hits")
+                    decisions[name] = {"source": "checkpoint", "history": {d: saved.get(d, 0) for d in dates}}
+                    page_data.extend({"이름": name, "날짜": d, "제출여부": saved.get(d, 0)} for d in dates)
+                    continue
+                
+                modal_started = time.perf_counter()
+                if not click_row_button(self.driver, "tr.ant-table-row", i, "제출 내역 보기"):
+                    raise Exception(f"'{name}' 제출 내역 버튼 없음")
+                
+                modal = self.waits.until("modal_open", self.visible_modal, timeout=self.config.WAIT_TIMEOUT)
+                if not modal:
+                    raise Exception(f"'{name}' 제출 내역 모달이 열리지 않음")
+                if not self.wait_modal_history(modal):
+                    raise Exception(f"'{name}' 제출 내역 로드 안 됨 (빈 표 확인 불가)")
+                
+                modal_rows = extract_rows(self.driver, "tr.ant-table-row", root=modal)
+                if self.snapshots:
+                    self.snapshots.put("til_modal", modal_rows, name=name)
+                history = parse_modal_rows(modal_rows, wanted)  # {날짜: 제출여부} (원하는 날짜만)
+                
+                close = modal.find_element(By.XPATH, ".//button[contains(., 'OK')]")
+                self.force_click(close)
+                self.waits.until("modal_closed", EC.invisibility_of_element(modal), budget=0.3)
+                page_data.extend({"이름": name, "날짜": d, "제출여부": history.get(d, 0)} for d in dates)
+                decisions[name] = {"source": "modal", "history": {d: history.get(d, 0) for d in dates}}
+                if self.checkpoint:
+                    self.checkpoint.mark_student(name, history)
+                run_metrics.observe("modal_latency", time.perf_counter() - modal_started)
+                run_metrics.incr("til_modals")
+                
+            except Exception as e:
+                print(f"\n   ❌ 에러: {e}")
+                run_metrics.incr("errors.scan_page")
+                failures += 1
+                if row["cells"]:
+                    decisions[row["cells"][0]] = {"source": "failed", "history": {}}
+                try:
+                    webdriver.ActionChains(self.driver).send_keys(Keys.ESCAPE).perform()
+                    self.waits.until("modal_escape", EC.invisibility_of_element_located((By.CSS_SELECTOR, ".ant-modal-content")), timeout=3, budget=1)
+                except: pass
+                continue
+        run_metrics.incr("til_rows", len(page_data))
+        if self.snapshots:
+            self.snapshots.put("til_decisions", decisions, dates=dates, page=page)
+        if failures:
+            self.failed_pages.add(page)
+        elif self.checkpoint and page is not None:
+            self.checkpoint.mark_page(page, page_data)
+        return page_data
+
+    # 닫히는 중(페이드 아웃)인 이전 모달은 wrap 이 display:none 이 되기 전까지 DOM 에 남아 있음
+    MODAL_CSS = ".ant-modal-wrap:not([style*='display: none']) .ant-modal-content"
+
+    def visible_modal(self, driver):
+        """지금 열려 있는 모달 (여러 개면 가장 나중에 붙은 것, 없으면 False)"""
+        modals = [m for m in driver.find_elements(By.CSS_SELECTOR, self.MODAL_CSS) if m.is_displayed()]
+        if not modals:  # wrap 없이 그려지는 모달 (합성 백오피스 등)
+            modals = [m for m in driver.find_elements(By.CSS_SELECTOR, ".ant-modal-content") if m.is_displayed()]
+        return modals[-1] if modals else False
+
+    def wait_modal_history(self, modal):
+        """
+        모달의 제출 내역 요청이 끝나고 표가 채워질 때까지 대기 (modal 요소 안에서만 확인).
+        행이 있으면 "rows", 요청이 끝났고 스피너 없이 빈 표 표시(ant-table-placeholder)면 "empty",
+        둘 다 아니면 False (열리자마자 비어 있는 표를 '전부 미제출'로 읽지 않도록).
+        """
+        self.waits.network_idle("modal_history", idle_for=0.2, timeout=5)
+
+        def state(d):
+            if modal.find_elements(By.CSS_SELECTOR, "tr.ant-table-row"):
+                return "rows"
+            if modal.find_elements(By.CSS_SELECTOR, ".ant-spin-spinning"):
+                return False
+            return "empty" if modal.find_elements(By.CSS_SELECTOR, ".ant-table-placeholder") else False
+
+        result = self.waits.until("modal_rows", state, timeout=5, budget=self.config.MODAL_WAIT)
+        if result == "rows":
+            # 행이 나눠서 그려지는 경우 개수가 멈출 때까지
+            self.waits.rows_settled("modal_rows_stable", "tr.ant-table-row", stable_for=0.2, timeout=3, root=modal)
+        return result
+
+    def go_next_page(self) -> bool:
+        """다음 페이지 버튼 클릭 (마지막 페이지면 False)"""
         try:
-            search_btn = self.wait.until(EC.element_to_be_clickable((By.XPATH, "//button[contains(., '조회하기')]")))
-            self.force_click(search_btn)
-            time.sleep(3)
-            self.handle_alert()
+            next_btns = self.driver.find_elements(By.CSS_SELECTOR, "li.ant-pagination-next")
+            if next_btns and "ant-pagination-disabled" not in next_btns[0].get_attribute("class"):
+                with run_metrics.span("pagination"):
+                    before = self.current_page()
+                    self.force_click(next_btns[0])
+                    self._wait_page_change(before)
+                return True
         except: pass
+        return False
+
+    def _wait_page_change(self, before: int):
+        """활성 페이지 번호가 바뀌고 표 갱신(XHR)이 끝날 때까지 대기"""
+        self.waits.until("page_change", lambda d: self.current_page() != before, timeout=10,
+                         budget=self.config.PAGE_NAVIGATION_WAIT)
+        self.waits.network_idle("page_rows_loaded", idle_for=0.3, timeout=10)
 
-    def collect_data(self, target_date: str) -> list:
-        print(f"\n🐢 데이터 수집 시작 (타겟: {target_date})")
+    def current_page(self) -> int:
+        try:
+            active = self.driver.find_elements(By.CSS_SELECTOR, "li.ant-pagination-item-active")
+            return int(active[0].get_attribute("title"))
+        except: return 1
+
+    def count_pages(self) -> int:
+        """페이지네이션의 마지막 페이지 번호 (ant 페이지네이션은 생략 시에도 마지막 번호는 노출)"""
+        titles = [li.get_attribute("title") for li in self.driver.find_elements(By.CSS_SELECTOR, "li.ant-pagination-item")]
+        pages = [int(t) for t in titles if t and t.isdigit()]
+        return max(pages) if pages else 1
+
+    def goto_page(self, page: int) -> bool:
+        """특정 페이지로 이동 (번호 버튼이 보이면 바로, 아니면 이전/다음으로 한 칸씩)"""
+        for _ in range(self.MAX_PAGES):
+            current = self.current_page()
+            if current == page:
+                return True
+            direct = self.driver.find_elements(By.CSS_SELECTOR, f"li.ant-pagination-item-{page}")
+            if direct:
+                self.force_click(direct[0])
+                self._wait_page_change(current)
+            elif current < page:
+                if not self.go_next_page(): return False
+            else:
+                prev_btns = self.driver.find_elements(By.CSS_SELECTOR, "li.ant-pagination-prev")
+                if not prev_btns: return False
+                self.force_click(prev_btns[0])
+                self._wait_page_change(current)
+        return False
+
+    def collect_data(self, target_date) -> list:
+        """
+        target_date: 날짜 문자열 하나 또는 날짜 리스트 (백필).
+        끝나면 self.complete = 마지막 페이지까지 실패 학생 없이 수집했는지 (False 면 부분 결과).
+        """
+        print(f"\n🐢 데이터 수집 시작 (타겟: {_describe_dates(target_date)})")
         total_data = []
         current_page = 1
-        MAX_PAGES = 50
+        self.failed_pages.clear()
+        self.complete = False
+
+        # [체크포인트] 완료된 페이지는 건너뛰고 첫 미완료 페이지부터
+        if self.checkpoint:
+            resume = self.checkpoint.first_pending_page()
+            if resume > 1 and self.goto_page(resume):
+                print(f"\n⏩ {resume - 1}페이지까지 완료 -> {resume}페이지부터 이어서 수집")
+                current_page = resume
         
-        while current_page <= MAX_PAGES:
-            print(f"\n📄 [Page {current_page}] 스캔 중...")
-            time.sleep(self.config.DATA_COLLECTION_WAIT)
+        while current_page <= self.MAX_PAGES:
+            if self.checkpoint and current_page in self.checkpoint.pages:
+                print(f"\n📄 [Page {current_page}] 체크포인트 완료 페이지 (건너뜀)")
+            else:
+                print(f"\n📄 [Page {current_page}] 스캔 중...")
+                page_data = self.scan_page(target_date, current_page)
+                if page_data is None:
+                    break
+                total_data.extend(page_data)
             
-            rows = self.driver.find_elements(By.CSS_SELECTOR, "tr.ant-table-row")
-            if not rows:
-                print("   ⚠️ 데이터 없음 (끝)")
+            if not self.go_next_page():
                 break
-            
-            row_count = len(rows)
-            for i in range(row_count):
-                try:
-                    current_row = self.driver.find_elements(By.CSS_SELECTOR, "tr.ant-table-row")[i]
-                    name = current_row.find_elements(By.TAG_NAME, "td")[0].text.strip()
-                    print(f"   🔍 ({i+1}/{row_count}) {name}님...", end="\r")
-                    
-                    btn = current_row.find_element(By.XPATH, ".//button[contains(., '제출 내역 보기') or span[contains(., '제출 내역 보기')]]")
-                    self.force_click(btn)
-                    
-                    modal = self.wait.until(EC.visibility_of_element_located((By.CSS_SELECTOR, ".ant-modal-content")))
-                    time.sleep(self.config.MODAL_WAIT)
-                    
-                    status = 0
-                    found_date = False
-                    modal_rows = modal.find_elements(By.CSS_SELECTOR, "tr.ant-table-row")
-                    for m_row in modal_rows:
-                        cols = m_row.find_elements(By.TAG_NAME, "td")
-                        if not cols: continue
-                        if cols[0].text.strip() == target_date:
-                            status_txt = cols[1].text.strip()
-                            if "미제출" in status_txt: status = 0
-                            elif "제출" in status_txt or "완료" in status_txt: status = 1
-                            else: status = 0
-                            found_date = True
-                            break
-                    
-                    close = modal.find_element(By.XPATH, ".//button[contains(., 'OK')]")
-                    self.force_click(close)
-                    self.wait.until(EC.invisibility_of_element_located((By.CSS_SELECTOR, ".ant-modal-content")))
-                    time.sleep(0.3)
-                    total_data.append({"이름": name, "날짜": target_date, "제출여부": status})
-                    
-                except Exception as e:
-                    print(f"\n   ❌ 에러: {e}")
-                    try: webdriver.ActionChains(self.driver).send_keys(Keys.ESCAPE).perform(); time.sleep(1)
-                    except: pass
-                    continue
-            
-            try:
-                next_btns = self.driver.find_elements(By.CSS_SELECTOR, "li.ant-pagination-next")
-                if next_btns and "ant-pagination-disabled" not in next_btns[0].get_attribute("class"):
-                     self.force_click(next_btns[0])
-                     current_page += 1
-                     time.sleep(2)
-                else: break
-            except: break
-            
+            current_page += 1
+
+        last_page = self.count_pages()
+        self.complete = not self.failed_pages and current_page >= last_page
+        if not self.complete:
+            print(f"\n⚠️ 부분 수집: 실패 페이지 {sorted(self.failed_pages)} / 도달 {current_page}/{last_page}페이지")
+        if self.checkpoint:
+            return _merge_records(self.checkpoint.records(), total_data)
         return total_data
 
-def extract_til_data(manual_date: str = None) -> pd.DataFrame:
+class ParallelTilCrawler:
+    """페이지 큐 + N개 브라우저 워커로 TIL 병렬 수집 (기본 브라우저의 세션 쿠키 공유)"""
+
+    def __init__(self, crawler: BackOfficeCrawler, config: Config):
+        self.crawler = crawler  # 조회까지 끝난 기본 크롤러 -> 워커 0 으로 재사용
+        self.config = config
+        self.failed_pages = set()
+        self.complete = False
+
+    def _spawn_crawler(self, cookies, profile_dir: str) -> BackOfficeCrawler:
+        # 로컬 프로필은 동시에 두 브라우저가 쓸 수 없으므로 워커마다 임시 프로필 사용
+        with run_metrics.span("browser_launch"):
+            driver = ChromeManager.launch_chrome(self.config, profile_dir=profile_dir)
+        crawler = BackOfficeCrawler(driver, self.config, profiler=self.crawler.waits.profiler,
+                                    snapshots=self.crawler.snapshots, checkpoint=self.crawler.checkpoint)
+        crawler.known = self.crawler.known
+        crawler.navigate_and_search(cookies=[dict(c) for c in cookies])  # 워커별 사본 (주입 시 키 삭제됨)
+        return crawler
+
+    def _run_worker(self, worker_id, crawler, cookies, pages, target_date, results):
+        started = time.time()
+        owned = crawler is None
+        profile_dir = tempfile.mkdtemp(prefix="til_worker_") if owned else None
+        done = 0
+        try:
+            if owned:
+                crawler = self._spawn_crawler(cookies, profile_dir)
+            while True:
+                try: page = pages.get_nowait()
+                except queue.Empty: break
+                if not crawler.goto_page(page):
+                    print(f"\n   ⚠️ [Worker {worker_id}] {page}페이지 이동 실패")
+                    continue
+                results[page] = crawler.scan_page(target_date, page) or []
+                if page in crawler.failed_pages:
+                    self.failed_pages.add(page)
+                done += 1
+        except BaseException as e:  # launch_chrome 의 sys.exit 포함
+            print(f"\n   ❌ [Worker {worker_id}] 중단: {e}")
+            run_metrics.incr("errors.til_worker")
+        finally:
+            if owned and crawler:
+                lean_browser.report(crawler.driver, f"worker {worker_id}")
+                try: crawler.driver.quit()
+                except: pass
+            if profile_dir:
+                shutil.rmtree(profile_dir, ignore_errors=True)  # 워커 임시 프로필 (실행마다 새로 만듦)
+        print(f"\n   🧵 [Worker {worker_id}] {done}페이지 완료 ({time.time() - started:.1f}s)")
+
+    def collect_data(self, target_date) -> list:
+        total_pages = min(self.crawler.count_pages(), BackOfficeCrawler.MAX_PAGES)
+        workers = max(1, min(self.config.CRAWL_WORKERS, total_pages))
+        if workers == 1:
+            data = self.crawler.collect_data(target_date)
+            self.complete = self.crawler.complete
+            return data
+        self.failed_pages.clear()
+        self.complete = False
+
+        print(f"\n🐇 병렬 수집 시작 (타겟: {_describe_dates(target_date)}, {total_pages}페이지, 워커 {workers}개)")
+        cookies = self.crawler.driver.get_cookies()
+        # [체크포인트] 완료된 페이지는 큐에 넣지 않음
+        results = dict(self.crawler.checkpoint.pages) if self.crawler.checkpoint else {}
+        if results:
+            print(f"   ⏩ 체크포인트 완료 페이지 {len(results)}개 건너뜀")
+        pages = queue.Queue()
+        for p in range(1, total_pages + 1):
+            if p not in results:
+                pages.put(p)
+
+        threads = [
+            threading.Thread(
+                target=self._run_worker,
+                args=(i, self.crawler if i == 0 else None, cookies, pages, target_date, results),
+            )
+            for i in range(workers)
+        ]
+        for t in threads: t.start()
+        for t in threads: t.join()
+
+        # 워커가 죽어서 남은 페이지는 기본 크롤러로 마무리
+        for p in range(1, total_pages + 1):
+            if p not in results and self.crawler.goto_page(p):
+                print(f"\n   🔁 {p}페이지 재시도 (기본 브라우저)")
+                run_metrics.incr("retries.til_pages")
+                results[p] = self.crawler.scan_page(target_date, p) or []
+                if p in self.crawler.failed_pages:
+                    self.failed_pages.add(p)
+                else:
+                    self.failed_pages.discard(p)
+
+        missing = [p for p in range(1, total_pages + 1) if p not in results]
+        self.complete = not missing and not self.failed_pages
+        if not self.complete:
+            print(f"\n⚠️ 부분 수집: 실패 페이지 {sorted(self.failed_pages)} / 누락 페이지 {missing}")
+
+        # 페이지 순서대로 병합 ((이름, 날짜) 중복 제거)
+        return _merge_records(*(results[p] for p in sorted(results)))
+
+def _merge_records(*groups) -> list:
+    """레코드 묶음들을 순서대로 이어 붙이기 ((이름, 날짜) 먼저 나온 것 우선)"""
+    merged, seen = [], set()
+    for records in groups:
+        for record in records:
+            key = (record["이름"], record["날짜"])
+            if key in seen: continue
+            seen.add(key)
+            merged.append(record)
+    return merged
+
+def load_known_submissions(target_dates, spreadsheet=None) -> dict:
+    """
+    대상 날짜 전부 '제출(1)'로 기록된 학생 {이름: {날짜: 1}}.
+    로컬 히스토리 우선, 비어 있으면 시트에서 1회 시드 (spreadsheet 없으면 새로 연결).
+    """
+    dates = [target_dates] if isinstance(target_dates, str) else list(target_dates)
+    store = HistoryStore()
+    try:
+        if store.is_empty("til"):
+            store.bootstrap_from_sheet("til", (spreadsheet or open_spreadsheet()).sheet1)
+        known = store.values("til", dates)
+    finally:
+        store.close()
+    return {name: history for name, history in known.items()
+            if all(history.get(d) == 1 for d in dates)}
+
+def _mark_partial(df: pd.DataFrame, checkpointed: bool = False):
+    """
+    일부 학생/페이지가 빠진 결과 표시. 저장 시 날짜 파티션을 통째로 바꾸지 않고 (빠진 학생의
+    기존 기록 보존) 파이프라인은 실패로 보고, 체크포인트는 남겨서 재실행 때 이어서 수집.
+    """
+    df.attrs["partial"] = True
+    print("   ⚠️ 부분 수집 결과 -> 기존 기록은 유지하고 수집된 행만 덮어씀 (재실행 필요)")
+    if checkpointed:
+        print("   💾 진행 상황은 체크포인트에 저장됨 (재실행 시 이어서 수집)")
+
+def _collect_over_http(config: Config, target_date) -> pd.DataFrame:
+    """크롬 없이 백오피스 API 로 수집 (COLLECTOR_BACKEND=http). 증분 수집 설정도 그대로 적용."""
+    from http_collector import collect_til
+    known = {}
+    if config.DELTA_CRAWL:
+        try:
+            known = load_known_submissions(target_date)
+        except Exception as e:
+            print(f"   ⚠️ 기존 제출 기록 조회 실패 (전체 확인): {e}")
+    try:
+        with run_metrics.span("til_collect"):
+            failed = []
+            df = pd.DataFrame(collect_til(config, target_date, known, failed=failed))
+        print(f"\n✅ 수집 완료! 총 {len(df)}건.")
+        if failed:
+            _mark_partial(df)
+        return df
+    except Exception as e:
+        print(f"❌ 에러: {e}")
+        return pd.DataFrame()
+
+def extract_til_data(manual_date: str = None, target_dates: list = None, driver=None,
+                     profiler: WaitProfiler = None) -> pd.DataFrame:
+    """
+    target_dates 를 주면 백필 모드 (롱포맷: 학생 x 날짜).
+    driver 를 넘기면 이미 로그인된 세션으로 보고 브라우저 실행/쿠키 주입 생략.
+    """
     config = Config()
-    if manual_date:
+    if target_dates:
+        print(f"📚 [백필 모드] {_describe_dates(target_dates)} 수집")
+        target_date = list(target_dates)
+    elif manual_date:
         print(f"🛠️ [수동 모드] '{manual_date}' 기준 수집")
         target_date = manual_date
     else:
         print("🤖 [자동 모드] 날짜 계산 중...")
         target_date = DateCalculator.get_target_date(config)
         
-    driver = ChromeManager.launch_chrome(config)
+    inject_cookies = driver is None
+    if driver is None:
+        # 크롬 띄우기 전에 쿠키 만료/세션 확인 (죽은 쿠키면 수 초 안에 중단)
+        if config.IS_SERVER:
+            try:
+                SessionManager(config.BACKOFFICE_URL).preflight()
+            except Exception as e:
+                print(f"❌ 에러: {e}")
+                return pd.DataFrame()
+        if config.COLLECTOR == "http":
+            return _collect_over_http(config, target_date)
+        with run_metrics.span("browser_launch"):
+            driver = ChromeManager.launch_chrome(config)
+    owns_profiler = profiler is None
+    profiler = profiler or WaitProfiler()
     try:
-        crawler = BackOfficeCrawler(driver, config)
-        crawler.navigate_and_search()
-        data = crawler.collect_data(target_date)
+        snapshots = SnapshotStore() if config.SAVE_SNAPSHOTS else None
+        checkpoint = CrawlCheckpoint(target_date) if config.USE_CHECKPOINT else None
+        crawler = BackOfficeCrawler(driver, config, profiler=profiler, snapshots=snapshots, checkpoint=checkpoint)
+        if config.DELTA_CRAWL:
+            try:
+                crawler.known = load_known_submissions(target_date)
+                print(f"⏭️ [증분 수집] 이미 제출 확인된 학생 {len(crawler.known)}명은 모달 생략")
+            except Exception as e:
+                print(f"   ⚠️ 기존 제출 기록 조회 실패 (전체 확인): {e}")
+        crawler.navigate_and_search(inject_cookies=inject_cookies)
+        with run_metrics.span("til_collect"):
+            collector = ParallelTilCrawler(crawler, config) if config.CRAWL_WORKERS > 1 else crawler
+            data = collector.collect_data(target_date)
         df = pd.DataFrame(data)
         print(f"\n✅ 수집 완료! 총 {len(df)}건.")
+        if collector.complete:
+            if checkpoint:
+                checkpoint.clear()
+        else:
+            _mark_partial(df, checkpointed=checkpoint is not None)
         return df
     except Exception as e:
+        # 체크포인트는 남겨둠 -> 같은 날짜로 재실행하면 남은 페이지/학생만 수집
         print(f"❌ 에러: {e}")
+        if config.USE_CHECKPOINT:
+            print("   💾 진행 상황은 체크포인트에 저장됨 (재실행 시 이어서 수집)")
         return pd.DataFrame()
+    finally:
+        if inject_cookies:  # 직접 띄운 브라우저만 (통합 실행은 파이프라인에서 보고)
+            lean_browser.report(driver, "til")
+        if owns_profiler:
+            profiler.report(config.WAIT_PROFILE_PATH, label=f"til {_describe_dates(target_date)}")
+
+def resolve_backfill_dates(backfill_range) -> list:
+    """BACKFILL_RANGE -> 수집할 영업일 목록"""
+    config = Config()
+    if backfill_range == "missing":
+        # 시트의 가장 오래된 날짜 ~ 최근 영업일 중 기록이 없는 날 (공용 달력 갭 스캐너)
+        existing = IncrementalSheetWriter(GoogleSheetManager().sheet).existing_dates()
+        if not existing:
+            print("⚠️ 시트에 기존 날짜가 없어 누락일을 계산할 수 없음 (기간을 직접 지정하세요)")
+            return []
+        missing = CALENDAR.missing_days(existing, end=DateCalculator.get_target_date(config))
+        print(f"🔎 누락 영업일 {len(missing)}일: {', '.join(missing) if missing else '없음'}")
+        return missing
+    start, end = backfill_range
+    return DateCalculator.business_days(config, start, end)
 
 # ============================================================
 # 4. 구글 시트 업로더
 # ============================================================
 
-JSON_FILE = "qaqc-pipeline.json" 
-TIL_SHEET_URL = os.environ.get("TIL_SHEET_URL")
-
 class GoogleSheetManager:
-    def __init__(self):
-        if not TIL_SHEET_URL:
-            raise ValueError("❌ 'TIL_SHEET_URL' 없음")
-        self.scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
-        try:
-            self.creds = ServiceAccountCredentials.from_json_keyfile_name(JSON_FILE, self.scope)
-            self.client = gspread.authorize(self.creds)
-            self.sheet = self.client.open_by_url(TIL_SHEET_URL).sheet1
-            print("✅ 구글 시트 연결 성공")
-        except Exception as e:
-            print(f"❌ 시트 연결 실패: {e}")
-            raise e
+    def __init__(self, spreadsheet=None):
+        """
+        spreadsheet: 이미 열린 Spreadsheet (통합 실행 시 인증 1회 공유).
+        없으면 SHEET_BACKEND 설정(gspread / local)으로 새로 연다.
+        """
+        if spreadsheet is None:
+            try:
+                spreadsheet = open_spreadsheet()
+                print("✅ 구글 시트 연결 성공")
+            except Exception as e:
+                print(f"❌ 시트 연결 실패: {e}")
+                raise e
+        self.spreadsheet = spreadsheet
+        self.sheet = spreadsheet.sheet1
 
     def save_data(self, new_df: pd.DataFrame):
         if new_df.empty:
             print("⚠️ 업로드할 데이터 없음")
             return
-        target_date = new_df.iloc[0]['날짜']
-        print(f"\n💾 저장 시작 ({target_date})...")
-        try:
-            existing_data = self.sheet.get_all_records()
-            existing_df = pd.DataFrame(existing_data)
-        except: existing_df = pd.DataFrame()
-
-        if not existing_df.empty and '날짜' in existing_df.columns:
-            existing_df['날짜'] = existing_df['날짜'].astype(str)
-            existing_df = existing_df[existing_df['날짜'] != str(target_date)]
-
-        final_df = pd.concat([new_df, existing_df], ignore_index=True)
-        if '날짜' in final_df.columns:
-            final_df = final_df.sort_values(by='날짜', ascending=False)
-        final_df = final_df.fillna("") 
-
-        self.sheet.clear()
-        data_to_write = [final_df.columns.values.tolist()] + final_df.values.tolist()
-        self.sheet.update(data_to_write)
+        dates = new_df['날짜'].astype(str).unique().tolist()
+        print(f"\n💾 저장 시작 ({_describe_dates(dates[0] if len(dates) == 1 else dates)})...")
+        # 1. 로컬 히스토리에 먼저 기록 -> 2. 내용이 바뀐 날짜만 시트로 동기화
+        with run_metrics.span("sheet_write"):
+            store = HistoryStore()
+            try:
+                store.bootstrap_from_sheet("til", self.sheet)
+                # 부분 수집이면 파티션 교체 대신 키 단위 덮어쓰기 (빠진 학생의 기존 행 보존)
+                store.replace_dates("til", new_df.to_dict("records"), keep_others=new_df.attrs.get("partial", False))
+                store.sync_to_sheet("til", self.sheet)
+                # 3. 날짜별 KPI 요약 갱신 (대시보드는 요약만 읽음)
+                publish_summaries(store, "til", dates, self.spreadsheet)
+            finally:
+                store.close()
+        if hasattr(self.spreadsheet, "metrics"):
+            self.spreadsheet.metrics.report("TIL 저장 누적")
         print(f"✅ 저장 완료!")
 
 def upload_til_data(df: pd.DataFrame):
@@ -435,16 +881,22 @@ def upload_til_data(df: pd.DataFrame):
 
 if __name__ == "__main__":
     print("🔥 [START] 봇 가동 시작")
+    run_metrics.start_run("til")
     
     # 1. 수집
-    df_result = extract_til_data(manual_date=TARGET_DATE_OVERRIDE)
+    if BACKFILL_RANGE:
+        backfill_dates = resolve_backfill_dates(BACKFILL_RANGE)
+        df_result = extract_til_data(target_dates=backfill_dates) if backfill_dates else pd.DataFrame()
+    else:
+        df_result = extract_til_data(manual_date=TARGET_DATE_OVERRIDE)
     
     # 2. 업로드
     if not df_result.empty:
         missed = len(df_result[df_result['제출여부'] == 0])
-        print(f"📊 결과: 전체 {len(df_result)}명 / 제출: {len(df_result)-missed} / 미제출: {missed}")
+        print(f"📊 결과: 전체 {len(df_result)}건 / 제출: {len(df_result)-missed} / 미제출: {missed}")
         upload_til_data(df_result)
     else:
         print("⚠️ 수집된 데이터 없음")
         
+    run_metrics.finish_run()
     print("🏁 [END] 작업 종료")
\ No newline at end of file
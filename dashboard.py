@@ -5,12 +5,19 @@
 import streamlit as st
 import pandas as pd
 import gspread
-from oauth2client.service_account import ServiceAccountCredentials
 import plotly.express as px
 import plotly.graph_objects as go
 import os
 from dotenv import load_dotenv
 from datetime import datetime
+import time
+from history_store import HistoryStore, DEFAULT_PATH as HISTORY_DB_PATH
+from sheet_writer import col_letter, group_runs
+from sheet_backend import open_spreadsheet, backend_name
+from daily_summary import SUMMARY_SHEET, summarize_til, summarize_attendance
+from trends import til_trends, attendance_trends, engagement
+from roster_registry import RosterRegistry
+import run_metrics
 
 # 1. 환경 설정 및 페이지 세팅
 load_dotenv()
@@ -37,53 +44,184 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
-# 2. 데이터 로드 함수 (두 개의 탭을 각각 로드)
+# 2. 데이터 로드 함수 (날짜 인덱스 + 날짜별 조각 캐시)
+# - 날짜 인덱스: 시트의 '날짜' 컬럼 1개만 읽음 (60초 TTL, 가장 싼 변경 신호)
+# - 날짜 조각: (행 위치, 행 수)가 같으면 캐시 재사용 -> 새로 생기거나 바뀐 날짜만 다시 읽음
+#   (로컬 DB 는 날짜 파티션 내용 해시까지 비교, 시트의 제자리 수정은 🔄 새로고침으로 반영)
+# - 화면에는 선택한 날짜 조각만 올림 (히스토리가 쌓여도 로드 시간/메모리 일정)
+# - KPI 카드/차트는 수집기가 미리 계산한 일별 요약(daily_summary)만 읽고, 원본 행은 상세 표를 펼칠 때만 로드
+# - 트렌드용 전체 히스토리는 트렌드 탭 토글을 켤 때만 로드 (정수 ID/일수 압축 프레임으로 캐시, 이름은 표시할 때만 붙임)
+WORKSHEETS = {"til": None, "attendance": "raw_attendance_logs", "daily_summary": SUMMARY_SHEET}  # None = sheet1
+LATEST_REFRESH_SEC = 60  # 최신 날짜는 같은 행 안에서 값이 바뀔 수 있으므로 주기적으로 다시 읽음
+
+@st.cache_resource
+def get_spreadsheet():
+    # SHEET_BACKEND=local 이면 로컬 시트 파일 (네트워크 없음)
+    if backend_name() == "gspread" and not os.environ.get("TIL_SHEET_URL"):
+        return None
+    return open_spreadsheet()
+
+def get_worksheet(kind):
+    spreadsheet = get_spreadsheet()
+    if spreadsheet is None:
+        return None
+    name = WORKSHEETS[kind]
+    return spreadsheet.sheet1 if name is None else spreadsheet.worksheet(name)
+
 @st.cache_data(ttl=60)
-def load_all_data():
+def load_date_index(kind):
+    """{"header": [...], "dates": {날짜: ((시작행, 끝행), ...)}} (로컬 DB 면 (행 수, 내용 해시))"""
     try:
-        json_file = "qaqc-pipeline.json"
-        sheet_url = os.environ.get("TIL_SHEET_URL")
-        
-        if not sheet_url:
-            return None, None
+        # 로컬 히스토리 DB 가 있으면 시트 대신 로컬 인덱스 조회
+        if os.path.exists(HISTORY_DB_PATH):
+            store = HistoryStore(HISTORY_DB_PATH)
+            try:
+                return {"header": None, "dates": store.date_versions(kind)}
+            finally:
+                store.close()
 
-        scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
-        creds = ServiceAccountCredentials.from_json_keyfile_name(json_file, scope)
-        client = gspread.authorize(creds)
-        spreadsheet = client.open_by_url(sheet_url)
-        
-        # TIL 데이터
+        ws = get_worksheet(kind)
+        if ws is None:
+            return {"header": [], "dates": {}}
+        header = ws.row_values(1)
+        if '날짜' not in header:
+            return {"header": header, "dates": {}}
+        col = col_letter(header.index('날짜') + 1)
+        date_col = ws.batch_get([f"{col}2:{col}"])[0]
+
+        rows_by_date = {}
+        for offset, cell in enumerate(date_col):
+            if cell and cell[0]:
+                rows_by_date.setdefault(str(cell[0]), []).append(offset + 2)
+        return {"header": header, "dates": {d: tuple(group_runs(rows)) for d, rows in rows_by_date.items()}}
+    except gspread.exceptions.WorksheetNotFound:
+        return {"header": [], "dates": {}}  # 요약 탭이 아직 없으면 원본으로 계산
+    except Exception as e:
+        st.error(f"❌ 데이터 로드 실패 ({kind}): {e}")
+        return {"header": [], "dates": {}}
+
+@st.cache_data(max_entries=64)
+def load_date_slice(kind, date, signature, header):
+    """한 날짜의 행만 읽어서 DataFrame 으로. signature 가 바뀌면 캐시 미스 -> 재조회."""
+    if os.path.exists(HISTORY_DB_PATH):
+        store = HistoryStore(HISTORY_DB_PATH)
         try:
-            til_sheet = spreadsheet.sheet1 # 혹은 spreadsheet.worksheet("raw_til_submissions")
-            til_data = til_sheet.get_all_records()
-            df_til = pd.DataFrame(til_data)
-        except:
-            df_til = pd.DataFrame()
+            return store.frame(kind, date=date)
+        finally:
+            store.close()
+
+    runs = signature[0]
+    ws = get_worksheet(kind)
+    if ws is None or not runs:
+        return pd.DataFrame()
+    last_col = col_letter(len(header))
+    blocks = ws.batch_get([f"A{start}:{last_col}{end}" for start, end in runs])
+    rows = [row + [""] * (len(header) - len(row)) for block in blocks for row in block]
+    return pd.DataFrame(rows, columns=header)
+
+def get_date_slice(kind, index, date):
+    """선택 날짜 조각 (최신 날짜는 LATEST_REFRESH_SEC 마다 갱신)"""
+    if date not in index["dates"]:
+        return pd.DataFrame()
+    signature = (index["dates"][date],)
+    if date == max(index["dates"]):
+        signature += (int(time.time() // LATEST_REFRESH_SEC),)
+    header = tuple(index["header"]) if index["header"] else None
+    return load_date_slice(kind, date, signature, header)
 
-        # 출석 데이터
+def data_version(index):
+    """날짜 인덱스 -> 캐시 키 (날짜가 추가되거나 행 위치/수가 바뀌면 달라짐)"""
+    return tuple(sorted(index["dates"].items()))
+
+@st.cache_resource
+def get_registry():
+    """학생 이름 <-> 정수 ID (로컬 DB 가 있으면 roster 테이블, 없으면 이 프로세스 안에서 발급)"""
+    return RosterRegistry(HISTORY_DB_PATH)
+
+@st.cache_data(max_entries=4)
+def load_history(kind, version, header):
+    """전체 히스토리 (트렌드 탭 전용, 정수 압축 프레임). version 이 같으면 다시 읽지 않음."""
+    registry = get_registry()
+    compact = registry.compact_til if kind == "til" else registry.compact_attendance
+    if os.path.exists(HISTORY_DB_PATH):
+        store = HistoryStore(HISTORY_DB_PATH)
         try:
-            att_sheet = spreadsheet.worksheet("raw_attendance_logs")
-            att_data = att_sheet.get_all_records()
-            df_att = pd.DataFrame(att_data)
-        except:
-            df_att = pd.DataFrame()
-            
-        return df_til, df_att
+            return compact(store.frame(kind))
+        finally:
+            store.close()
+    ws = get_worksheet(kind)
+    if ws is None or not header:
+        return compact(pd.DataFrame())
+    rows = ws.get_all_values()[1:]
+    return compact(pd.DataFrame([row + [""] * (len(header) - len(row)) for row in rows], columns=list(header)))
 
-    except Exception as e:
-        st.error(f"❌ 데이터 로드 실패: {e}")
-        return pd.DataFrame(), pd.DataFrame()
+@st.cache_data(max_entries=4)
+def load_trends(til_version, att_version, til_header, att_header):
+    """날짜 x 학생 행렬 기반 추이 (데이터 버전이 바뀔 때만 재계산, 이름/날짜 라벨은 마지막에 부착)"""
+    til = load_history("til", til_version, til_header)
+    att = load_history("attendance", att_version, att_header)
+    til_t, att_t = til_trends(til), attendance_trends(att)
+    label = get_registry().for_display
+    if not til_t["cohort"].empty:
+        til_t = {"cohort": label(til_t["cohort"], index="day"), "students": label(til_t["students"], index="student")}
+    if not att_t["students"].empty:
+        att_t = {"cumulative": label(att_t["cumulative"], index="day", columns="student"),
+                 "students": label(att_t["students"], index="student")}
+    both = engagement(til, att)
+    return til_t, att_t, label(both, index="student") if not both.empty else both
+
+@st.cache_data(ttl=300)
+def load_run_reports():
+    """수집 실행 지표 (로컬 logs/run_report.jsonl, 없으면 시트 지표 탭)"""
+    reports = run_metrics.load_reports()
+    if reports:
+        rows = [
+            {"실행": r["started_at"], "구분": r["label"], "총소요": r["duration"],
+             **{k: v["total"] for k, v in r["spans"].items() if not k.startswith("stage.")},
+             "modal_p90": r["observations"].get("modal_latency", {}).get("p90"),
+             "til_rows_per_sec": r["rates"].get("til_rows_per_sec")}
+            for r in reports
+        ]
+        return pd.DataFrame(rows)
+    spreadsheet = get_spreadsheet()
+    if spreadsheet is None or not run_metrics.METRICS_TAB:
+        return pd.DataFrame()
+    try:
+        df = pd.DataFrame(spreadsheet.worksheet(run_metrics.METRICS_TAB).get_all_records())
+    except gspread.exceptions.WorksheetNotFound:
+        return pd.DataFrame()
+    for col in ["총소요", *run_metrics.TAB_SPANS]:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+    return df.rename(columns={"실행ID": "실행"})
+
+SUMMARY_NUMERIC = ["총원", "제출", "미제출", "출석", "지각조퇴", "결석", "비율"]
+
+def get_summary(index, date, kind):
+    """선택 날짜의 요약 1행 (dict). 요약 탭에 없으면 None -> 호출부에서 원본으로 계산"""
+    summary = get_date_slice("daily_summary", index, date)
+    if summary.empty or '구분' not in summary.columns:
+        return None
+    row = summary[summary['구분'] == kind]
+    if row.empty:
+        return None
+    row = row.iloc[0].to_dict()
+    for col in SUMMARY_NUMERIC:
+        row[col] = pd.to_numeric(row.get(col), errors='coerce')
+        row[col] = 0 if pd.isna(row[col]) else row[col]
+    return row
+
+def name_list(value):
+    return [n.strip() for n in str(value or "").split(",") if n.strip()]
 
 def main():
-    # --- 데이터 준비 ---
-    df_til, df_att = load_all_data()
+    # --- 데이터 준비 (날짜 인덱스만, 본문은 선택 날짜만) ---
+    til_index = load_date_index("til")
+    att_index = load_date_index("attendance")
+    summary_index = load_date_index("daily_summary")
     
     # 날짜 통합 (두 시트의 날짜를 합쳐서 선택지 생성)
-    all_dates = set()
-    if not df_til.empty and '날짜' in df_til.columns:
-        all_dates.update(df_til['날짜'].astype(str).unique())
-    if not df_att.empty and '날짜' in df_att.columns:
-        all_dates.update(df_att['날짜'].astype(str).unique())
+    all_dates = set(til_index["dates"]) | set(att_index["dates"])
     
     sorted_dates = sorted(list(all_dates), reverse=True)
 
@@ -99,7 +237,12 @@ def main():
             
         st.divider()
         if st.button("🔄 새로고침", use_container_width=True):
-            st.cache_data.clear()
+            # 시트는 같은 위치의 행을 덮어쓴 수정(업서트/백필/재채점)을 인덱스로 알 수 없으므로
+            # 조각/히스토리 캐시도 비움 (로컬 DB 는 내용 해시가 signature 에 있어 자동 갱신)
+            load_date_index.clear()
+            load_date_slice.clear()
+            load_history.clear()
+            load_trends.clear()
             st.rerun()
         
         st.caption(f"Last Update: {datetime.now().strftime('%H:%M:%S')}")
@@ -108,40 +251,39 @@ def main():
     st.title(f"🏢 QA 4기 운영 현황 ({selected_date})")
     
     # 탭 분리
-    tab1, tab2 = st.tabs(["📝 TIL 제출 현황", "⏰ 출석 관리 현황"])
+    tab1, tab2, tab3 = st.tabs(["📝 TIL 제출 현황", "⏰ 출석 관리 현황", "📈 트렌드"])
 
     # =================================================================
     # [TAB 1] TIL 대시보드
     # =================================================================
     with tab1:
-        if df_til.empty:
+        if not til_index["dates"]:
             st.warning("TIL 데이터가 없습니다.")
         else:
-            # 오늘 데이터 필터링
-            today_til = df_til[df_til['날짜'] == selected_date].copy()
+            # KPI 는 요약 1행만 사용 (요약이 없으면 원본 조각으로 계산)
+            summary = get_summary(summary_index, selected_date, "TIL")
+            if summary is None and selected_date in til_index["dates"]:
+                summary = summarize_til(get_date_slice("til", til_index, selected_date), selected_date)
             
-            if not today_til.empty:
-                submit_mask = today_til['제출여부'].astype(str).str.contains('1|제출|완료')
-                submit_cnt = len(today_til[submit_mask])
-                miss_cnt = len(today_til) - submit_cnt
-                rate = round((submit_cnt / len(today_til)) * 100, 1)
+            if summary and summary["총원"]:
+                total, submit_cnt, miss_cnt = int(summary["총원"]), int(summary["제출"]), int(summary["미제출"])
+                rate = summary["비율"]
 
                 # KPI
                 c1, c2, c3 = st.columns(3)
-                c1.metric("총원", f"{len(today_til)}명")
+                c1.metric("총원", f"{total}명")
                 c2.metric("제출", f"{submit_cnt}명", f"{rate}%")
                 c3.metric("미제출", f"{miss_cnt}명", delta=f"-{miss_cnt}", delta_color="inverse")
 
                 # 미제출자 명단
                 if miss_cnt > 0:
-                    miss_names = today_til[~submit_mask]['이름'].tolist()
-                    st.error(f"🚨 **미제출자:** {', '.join(miss_names)}")
+                    st.error(f"🚨 **미제출자:** {', '.join(name_list(summary['미제출자']))}")
                 else:
                     st.success("🎉 전원 제출 완료!")
                 
                 st.divider()
                 
-                # 차트 & 테이블
+                # 차트 & 테이블 (원본 행은 펼칠 때만 로드)
                 col_l, col_r = st.columns([1, 2])
                 with col_l:
                     fig = px.pie(names=['제출', '미제출'], values=[submit_cnt, miss_cnt], 
@@ -149,9 +291,11 @@ def main():
                     st.plotly_chart(fig, use_container_width=True)
                 
                 with col_r:
-                    def highlight_til(s):
-                        return ['background-color: #ffcdd2' if '0' in str(v) or '미제출' in str(v) else '' for v in s]
-                    st.dataframe(today_til[['이름', '제출여부', '날짜']].style.apply(highlight_til, subset=['제출여부']), use_container_width=True)
+                    if st.toggle("📋 상세 제출 목록 보기", key="til_detail"):
+                        today_til = get_date_slice("til", til_index, selected_date)
+                        def highlight_til(s):
+                            return ['background-color: #ffcdd2' if '0' in str(v) or '미제출' in str(v) else '' for v in s]
+                        st.dataframe(today_til[['이름', '제출여부', '날짜']].style.apply(highlight_til, subset=['제출여부']), use_container_width=True)
             else:
                 st.info(f"{selected_date}일자 TIL 데이터가 없습니다.")
 
@@ -159,56 +303,115 @@ def main():
     # [TAB 2] 출석 대시보드
     # =================================================================
     with tab2:
-        if df_att.empty:
+        if not att_index["dates"]:
             st.warning("출석 데이터가 없습니다.")
         else:
-            # 오늘 데이터 필터링
-            today_att = df_att[df_att['날짜'] == selected_date].copy()
+            # KPI 는 요약 1행만 사용 (요약이 없으면 원본 조각으로 계산)
+            summary = get_summary(summary_index, selected_date, "출석")
+            if summary is None and selected_date in att_index["dates"]:
+                summary = summarize_attendance(get_date_slice("attendance", att_index, selected_date), selected_date)
             
-            if not today_att.empty:
+            if summary and summary["총원"]:
                 # 상태별 카운트 (점수 기반: 1=출석, 0.5=지각/조퇴, 0=결석)
-                # 문자열로 들어올 수도 있으니 형변환 안전장치
-                today_att['상태'] = pd.to_numeric(today_att['상태'], errors='coerce').fillna(0)
-                
-                present_cnt = len(today_att[today_att['상태'] == 1])
-                issue_cnt = len(today_att[today_att['상태'] == 0.5]) # 지각/조퇴
-                absent_cnt = len(today_att[today_att['상태'] == 0])
+                present_cnt, issue_cnt, absent_cnt = int(summary["출석"]), int(summary["지각조퇴"]), int(summary["결석"])
                 
                 # KPI
                 ac1, ac2, ac3, ac4 = st.columns(4)
-                ac1.metric("총원", f"{len(today_att)}명")
+                ac1.metric("총원", f"{int(summary['총원'])}명")
                 ac2.metric("✅ 정상 출석", f"{present_cnt}명")
                 ac3.metric("⚠️ 지각/조퇴", f"{issue_cnt}명", delta_color="off")
                 ac4.metric("🚨 결석", f"{absent_cnt}명", delta_color="inverse")
                 
                 # 이슈 인원 명단 (지각/조퇴/결석)
-                issues = today_att[today_att['상태'] < 1]
-                if not issues.empty:
-                    st.warning(f"📢 **관리 필요 인원 ({len(issues)}명)**")
-                    st.dataframe(issues[['이름', '입실시간', '퇴실시간', '상태']], use_container_width=True)
+                if issue_cnt + absent_cnt > 0:
+                    st.warning(f"📢 **관리 필요 인원 ({issue_cnt + absent_cnt}명)**")
+                    if issue_cnt:
+                        st.write(f"⚠️ 지각/조퇴: {', '.join(name_list(summary['지각조퇴자']))}")
+                    if absent_cnt:
+                        st.write(f"🚨 결석: {', '.join(name_list(summary['결석자']))}")
                 else:
                     st.success("🎉 전원 정상 출석!")
                 
                 st.divider()
                 
-                # 상세 테이블
+                # 상세 테이블 (원본 행은 펼칠 때만 로드)
                 st.subheader("📋 상세 출결 로그")
-                
-                # 색상 하이라이팅 함수
-                def highlight_att(row):
-                    val = row['상태']
-                    if val == 0: return ['background-color: #ffcdd2'] * len(row) # 결석(빨강)
-                    elif val == 0.5: return ['background-color: #fff9c4'] * len(row) # 지각/조퇴(노랑)
-                    return [''] * len(row)
-
-                st.dataframe(
-                    today_att[['이름', '입실시간', '퇴실시간', '상태']].style.apply(highlight_att, axis=1),
-                    use_container_width=True,
-                    height=500
-                )
+                if st.toggle("상세 로그 보기", key="att_detail"):
+                    today_att = get_date_slice("attendance", att_index, selected_date).copy()
+                    # 문자열로 들어올 수도 있으니 형변환 안전장치
+                    today_att['상태'] = pd.to_numeric(today_att['상태'], errors='coerce').fillna(0)
+
+                    # 색상 하이라이팅 함수
+                    def highlight_att(row):
+                        val = row['상태']
+                        if val == 0: return ['background-color: #ffcdd2'] * len(row) # 결석(빨강)
+                        elif val == 0.5: return ['background-color: #fff9c4'] * len(row) # 지각/조퇴(노랑)
+                        return [''] * len(row)
+
+                    st.dataframe(
+                        today_att[['이름', '입실시간', '퇴실시간', '상태']].style.apply(highlight_att, axis=1),
+                        use_container_width=True,
+                        height=500
+                    )
                 
             else:
                 st.info(f"{selected_date}일자 출석 데이터가 없습니다.")
 
+    # =================================================================
+    # [TAB 3] 기수 전체 트렌드
+    # =================================================================
+    with tab3:
+        # 전체 히스토리(시트면 두 워크시트 전체)를 읽으므로 펼칠 때만 계산 (상세 표 토글과 같은 방식)
+        if not st.toggle("전체 기간 트렌드 보기", key="trend_detail"):
+            st.caption("켜면 TIL/출석 전체 히스토리를 불러와 추이를 계산합니다. (데이터가 바뀔 때까지 캐시)")
+        else:
+            til_t, att_t, both_t = load_trends(
+                data_version(til_index), data_version(att_index),
+                tuple(til_index["header"] or ()), tuple(att_index["header"] or ()),
+            )
+
+            st.subheader("📝 TIL 제출률 추이")
+            if til_t["cohort"].empty:
+                st.info("TIL 히스토리가 없습니다.")
+            else:
+                fig = px.line(til_t["cohort"], y=til_t["cohort"].columns, markers=True,
+                              labels={"value": "제출률(%)", "variable": ""})
+                st.plotly_chart(fig, use_container_width=True)
+                st.caption("학생별 연속 제출 / 최근 제출률")
+                st.dataframe(til_t["students"], use_container_width=True)
+
+            st.divider()
+
+            st.subheader("⏰ 출석 누적 점수 / 상습 지각 랭킹")
+            if att_t["students"].empty:
+                st.info("출석 히스토리가 없습니다.")
+            else:
+                col_l, col_r = st.columns([1, 1])
+                with col_l:
+                    ranking = att_t["students"].head(10)
+                    fig = px.bar(ranking, x=ranking.index, y=["지각조퇴", "결석"], barmode="stack",
+                                 color_discrete_sequence=['#FFA15A', '#EF553B'], labels={"value": "횟수", "x": ""})
+                    st.plotly_chart(fig, use_container_width=True)
+                with col_r:
+                    st.dataframe(att_t["students"], use_container_width=True)
+                fig = px.line(att_t["cumulative"], labels={"value": "누적 점수", "variable": "이름"})
+                st.plotly_chart(fig, use_container_width=True)
+
+            if not both_t.empty:
+                st.caption("출석한 날의 TIL 제출률 (낮은 순)")
+                st.dataframe(both_t, use_container_width=True)
+
+        st.divider()
+
+        st.subheader("⚙️ 수집 성능 추이")
+        runs = load_run_reports()
+        if runs.empty:
+            st.info("실행 지표가 없습니다. (logs/run_report.jsonl 또는 RUN_METRICS_TAB)")
+        else:
+            span_cols = [c for c in run_metrics.TAB_SPANS if c in runs.columns]
+            fig = px.bar(runs, x="실행", y=span_cols, labels={"value": "초", "variable": "구간"})
+            st.plotly_chart(fig, use_container_width=True)
+            st.dataframe(runs.tail(20), use_container_width=True)
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
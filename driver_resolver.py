@@ -0,0 +1,105 @@
+# ============================================================
+# [Driver Resolver] 크롬 메이저 버전 기준 chromedriver 경로 캐시
+# ============================================================
+# ChromeDriverManager().install() 은 매 실행마다 최신 버전 조회(네트워크)를 한다.
+# 여기서는 설치된 크롬의 메이저 버전을 키로 드라이버 경로를 로컬에 캐시해서
+# 크롬이 업데이트되지 않은 이상 네트워크 없이 바로 드라이버를 찾는다.
+#
+# 탐색 순서: 로컬 캐시 -> 시스템 chromedriver(버전 일치) -> webdriver_manager(네트워크)
+#          -> Selenium Manager (Service() 에 경로 없이 맡김)
+
+import json
+import os
+import re
+import shutil
+import subprocess
+import time
+
+CACHE_DIR = os.environ.get("CHROMEDRIVER_CACHE_DIR", os.path.expanduser("~/.cache/qaqc_chromedriver"))
+INDEX_FILE = "index.json"
+
+
+def _major_version(command: list):
+    """'Google Chrome 120.0.6099.109' / 'ChromeDriver 120.0...' -> '120'"""
+    try:
+        out = subprocess.run(command, capture_output=True, text=True, timeout=10).stdout
+    except Exception:
+        return None
+    match = re.search(r"(\d+)\.\d+\.\d+", out)
+    return match.group(1) if match else None
+
+
+def chrome_major_version(chrome_path: str):
+    return _major_version([chrome_path, "--version"])
+
+
+def _load_index(cache_dir: str) -> dict:
+    try:
+        with open(os.path.join(cache_dir, INDEX_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def _save_index(cache_dir: str, index: dict):
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(os.path.join(cache_dir, INDEX_FILE), "w", encoding="utf-8") as f:
+            json.dump(index, f, indent=2)
+    except Exception as e:
+        print(f"   ⚠️ 드라이버 캐시 저장 실패: {e}")
+
+
+def _cache_binary(cache_dir: str, major: str, path: str) -> str:
+    """드라이버 바이너리를 캐시 폴더로 복사 (webdriver_manager 캐시가 지워져도 유지)"""
+    target_dir = os.path.join(cache_dir, major)
+    os.makedirs(target_dir, exist_ok=True)
+    target = os.path.join(target_dir, os.path.basename(path))
+    if os.path.abspath(path) != os.path.abspath(target):
+        shutil.copy2(path, target)
+    return target
+
+
+def resolve_chromedriver(chrome_path: str, cache_dir: str = CACHE_DIR):
+    """
+    chromedriver 경로 반환. None 이면 Selenium Manager 에 맡긴다는 뜻 (Service() 그대로 사용).
+    """
+    started = time.perf_counter()
+    major = chrome_major_version(chrome_path)
+    index = _load_index(cache_dir)
+    path, source = None, None
+
+    # 1. 로컬 캐시 (네트워크 X)
+    cached = index.get(major) if major else None
+    if cached and os.path.exists(cached):
+        path, source = cached, "cache"
+
+    # 2. 시스템 chromedriver (버전 일치 시, 네트워크 X)
+    if not path and major:
+        system = shutil.which("chromedriver")
+        if system and _major_version([system, "--version"]) == major:
+            path, source = system, "system"
+
+    # 3. webdriver_manager (네트워크)
+    if not path:
+        try:
+            from webdriver_manager.chrome import ChromeDriverManager
+            path, source = ChromeDriverManager().install(), "webdriver_manager"
+        except Exception as e:
+            print(f"   ⚠️ webdriver_manager 실패 (오프라인?): {e}")
+
+    # 새로 찾은 경로는 캐시에 기록
+    if path and major and source != "cache":
+        try:
+            index[major] = _cache_binary(cache_dir, major, path)
+            _save_index(cache_dir, index)
+        except Exception as e:
+            print(f"   ⚠️ 드라이버 캐시 복사 실패: {e}")
+
+    # 4. Selenium Manager (Service() 에 경로 없이)
+    if not path:
+        source = "selenium_manager"
+
+    elapsed = time.perf_counter() - started
+    print(f"   🧭 chromedriver 확인: {source} (크롬 {major or '?'}) {elapsed:.2f}s")
+    return path
@@ -0,0 +1,282 @@
+# ============================================================
+# [History Store] 로컬 SQLite 히스토리 (원본 저장소) + 구글 시트 동기화
+# ============================================================
+# 지금까지는 구글 시트가 DB 겸 전송 수단이라 저장/조회 때마다 시트 전체를
+# 내려받았다. 이제 수집기는 로컬 SQLite 에 먼저 쓰고, 변경된 날짜(파티션)만
+# 시트로 밀어 올린다. 분석/대시보드는 (날짜, 이름) 인덱스로 로컬 조회.
+#
+# 날짜 파티션마다 내용 해시를 기록해서 "시트에 마지막으로 올린 해시"와
+# 다른 날짜만 동기화 대상이 된다.
+#
+# roster 테이블: 이름 -> 고정 정수 ID (처음 기록된 순서대로 발급, 한 번 정해지면 바뀌지 않음).
+# 분석/대시보드는 이 ID 로 압축한 프레임을 쓴다 (roster_registry).
+
+import hashlib
+import json
+import os
+import sqlite3
+from datetime import datetime
+
+import pandas as pd
+
+from sheet_writer import IncrementalSheetWriter
+
+DEFAULT_PATH = os.environ.get("HISTORY_DB_PATH", "data/history.sqlite")
+
+ROSTER_TABLES = ("til", "attendance")  # 이름을 roster ID 로 등록하는 테이블
+
+# 테이블 스키마: (컬럼, 타입, 시트/DataFrame 라벨). 앞의 두 컬럼이 (날짜, 식별자) 키.
+TABLES = {
+    "til": {
+        "columns": [("date", "TEXT", "날짜"), ("name", "TEXT", "이름"), ("submitted", "INTEGER", "제출여부")],
+        "fill": "",
+    },
+    "attendance": {
+        "columns": [
+            ("date", "TEXT", "날짜"), ("name", "TEXT", "이름"),
+            ("in_time", "TEXT", "입실시간"), ("out_time", "TEXT", "퇴실시간"), ("status", "REAL", "상태"),
+        ],
+        "fill": "-",
+    },
+    # 일별 KPI 요약 (구분: TIL / 출석) -> 대시보드 KPI 카드/차트 전용
+    "daily_summary": {
+        "columns": [
+            ("date", "TEXT", "날짜"), ("kind", "TEXT", "구분"), ("total", "INTEGER", "총원"),
+            ("submitted", "INTEGER", "제출"), ("missed", "INTEGER", "미제출"),
+            ("present", "INTEGER", "출석"), ("late", "INTEGER", "지각조퇴"), ("absent", "INTEGER", "결석"),
+            ("rate", "REAL", "비율"),
+            ("missed_names", "TEXT", "미제출자"), ("late_names", "TEXT", "지각조퇴자"), ("absent_names", "TEXT", "결석자"),
+        ],
+        "fill": "",
+    },
+}
+
+
+def _key(table: str):
+    """(날짜 컬럼, 식별 컬럼)"""
+    return TABLES[table]["columns"][0][0], TABLES[table]["columns"][1][0]
+
+
+def _clean(value, sql_type: str):
+    """시트/크롤러 값 -> SQLite 타입 ('-', '' 는 NULL)"""
+    if value is None or (isinstance(value, float) and value != value):
+        return None
+    if isinstance(value, str):
+        value = value.strip()
+        if value in ("", "-"):
+            return None
+    if hasattr(value, "item"):
+        value = value.item()
+    try:
+        if sql_type == "INTEGER":
+            return int(float(value))
+        if sql_type == "REAL":
+            return float(value)
+    except (TypeError, ValueError):
+        return None
+    return str(value)
+
+
+class HistoryStore:
+    """날짜 x 이름 단위 로컬 히스토리 (til / attendance)"""
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self._init_schema()
+
+    def _init_schema(self):
+        for table, spec in TABLES.items():
+            cols = ", ".join(f"{c} {t}" for c, t, _ in spec["columns"])
+            date_col, id_col = _key(table)
+            self.conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({cols}, PRIMARY KEY ({date_col}, {id_col}))")
+            self.conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_{id_col} ON {table} ({id_col}, {date_col})")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS partitions ("
+            " tbl TEXT, date TEXT, hash TEXT, synced_hash TEXT, updated_at TEXT, synced_at TEXT,"
+            " PRIMARY KEY (tbl, date))"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS roster (id INTEGER PRIMARY KEY, name TEXT UNIQUE NOT NULL, first_seen TEXT)"
+        )
+        if self.conn.execute("SELECT 1 FROM roster LIMIT 1").fetchone() is None:
+            # 기존 DB: 히스토리에 있는 이름을 처음 나온 날짜 순으로 1회 등록
+            union = " UNION ALL ".join(f"SELECT name, date FROM {t}" for t in ROSTER_TABLES)
+            self.conn.execute(
+                f"INSERT OR IGNORE INTO roster (name, first_seen)"
+                f" SELECT name, MIN(date) AS d FROM ({union}) GROUP BY name ORDER BY d, name"
+            )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    # ---------------- 쓰기 ----------------
+
+    def _rows(self, table: str, records: list) -> list:
+        spec = TABLES[table]["columns"]
+        rows = []
+        for r in records:
+            row = tuple(_clean(r.get(label, r.get(col)), sql_type) for col, sql_type, label in spec)
+            if row[0] and row[1]:
+                rows.append(row)
+        return rows
+
+    def _partition_hash(self, table: str, date: str) -> str:
+        cols = ", ".join(c for c, _, _ in TABLES[table]["columns"])
+        rows = self.conn.execute(f"SELECT {cols} FROM {table} WHERE date = ? ORDER BY {_key(table)[1]}", (date,)).fetchall()
+        return hashlib.sha1(json.dumps(rows, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+    def replace_dates(self, table: str, records: list, synced: bool = False, keep_others: bool = False) -> list:
+        """
+        레코드에 포함된 날짜 파티션을 통째로 교체. 반환값은 내용이 바뀐 날짜 목록.
+        keep_others=True 면 파티션을 지우지 않고 키 단위로만 덮어씀 (요약 TIL/출석 행 공존).
+        """
+        rows = self._rows(table, records)
+        dates = sorted({row[0] for row in rows})
+        if not dates:
+            return []
+        cols = [c for c, _, _ in TABLES[table]["columns"]]
+        now = datetime.now().isoformat(timespec="seconds")
+        changed = []
+        with self.conn:
+            if table in ROSTER_TABLES:
+                self._register(sorted({(row[0], row[1]) for row in rows}))
+            if not keep_others:
+                self.conn.executemany(f"DELETE FROM {table} WHERE date = ?", [(d,) for d in dates])
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO {table} ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})", rows
+            )
+            for d in dates:
+                new_hash = self._partition_hash(table, d)
+                prev = self.conn.execute(
+                    "SELECT hash, synced_hash FROM partitions WHERE tbl = ? AND date = ?", (table, d)
+                ).fetchone()
+                synced_hash = new_hash if synced else (prev[1] if prev else None)
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO partitions (tbl, date, hash, synced_hash, updated_at, synced_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (table, d, new_hash, synced_hash, now, now if synced else None),
+                )
+                if new_hash != synced_hash:
+                    changed.append(d)
+        return changed
+
+    # ---------------- roster ----------------
+
+    def _register(self, seen: list):
+        """[(날짜, 이름)] -> 처음 보는 이름만 ID 발급 (트랜잭션 안에서 호출)"""
+        self.conn.executemany("INSERT OR IGNORE INTO roster (name, first_seen) VALUES (?, ?)",
+                              [(name, date) for date, name in seen])
+
+    def register_names(self, names, first_seen: str = None) -> dict:
+        """이름 목록 등록(주어진 순서대로 발급) 후 {이름: ID} (이미 있는 이름은 기존 ID 유지)"""
+        with self.conn:
+            self._register([(first_seen, n) for n in dict.fromkeys(names)])
+        return self.roster()
+
+    def roster(self) -> dict:
+        """{이름: ID}"""
+        return dict(self.conn.execute("SELECT name, id FROM roster"))
+
+    # ---------------- 읽기 ----------------
+
+    def dates(self, table: str) -> list:
+        return [r[0] for r in self.conn.execute(f"SELECT DISTINCT date FROM {table} ORDER BY date")]
+
+    def date_counts(self, table: str) -> dict:
+        """{날짜: 행 수} (대시보드 날짜 인덱스 / 변경 감지용)"""
+        return dict(self.conn.execute(f"SELECT date, COUNT(*) FROM {table} GROUP BY date"))
+
+    def date_versions(self, table: str) -> dict:
+        """{날짜: (행 수, 내용 해시)} (같은 행 수로 덮어쓴 수정/백필/재채점도 감지)"""
+        hashes = dict(self.conn.execute("SELECT date, hash FROM partitions WHERE tbl = ?", (table,)))
+        return {d: (count, hashes.get(d)) for d, count in self.date_counts(table).items()}
+
+    def is_empty(self, table: str) -> bool:
+        return self.conn.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone() is None
+
+    def frame(self, table: str, date: str = None, start: str = None, end: str = None, name: str = None) -> pd.DataFrame:
+        """인덱스 조회 -> 시트와 같은 한글 컬럼의 DataFrame"""
+        spec = TABLES[table]["columns"]
+        where, params = [], []
+        if date:
+            where.append("date = ?"); params.append(date)
+        if start:
+            where.append("date >= ?"); params.append(start)
+        if end:
+            where.append("date <= ?"); params.append(end)
+        if name:
+            where.append(f"{_key(table)[1]} = ?"); params.append(name)
+        sql = f"SELECT {', '.join(c for c, _, _ in spec)} FROM {table}"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY date DESC, {_key(table)[1]}"
+        df = pd.read_sql_query(sql, self.conn, params=params)
+        text_cols = [c for c, t, _ in spec if t == "TEXT"]
+        df[text_cols] = df[text_cols].fillna(TABLES[table]["fill"])  # 빈 입/퇴실 -> 시트 표기('-')
+        int_cols = [c for c, t, _ in spec if t == "INTEGER"]
+        df[int_cols] = df[int_cols].astype("Int64")  # NULL 이 섞여도 정수 유지 (2 -> 2.0 방지)
+        return df.rename(columns={c: label for c, _, label in spec})
+
+    def values(self, table: str, dates: list, column: str = None) -> dict:
+        """{식별자: {날짜: 값}} (column 기본값은 키 다음 첫 컬럼, NULL 은 제외)"""
+        column = column or TABLES[table]["columns"][2][0]
+        id_col = _key(table)[1]
+        rows = self.conn.execute(
+            f"SELECT date, {id_col}, {column} FROM {table} WHERE date IN ({', '.join('?' * len(dates))})"
+            f" AND {column} IS NOT NULL",
+            list(dates),
+        )
+        out = {}
+        for date, key, value in rows:
+            out.setdefault(key, {})[date] = value
+        return out
+
+    def records(self, table: str, dates: list) -> list:
+        """시트 업로드용 레코드 (NULL 은 시트 표기값으로)"""
+        fill = TABLES[table]["fill"]
+        df = pd.concat([self.frame(table, date=d) for d in dates], ignore_index=True) if dates else pd.DataFrame()
+        if df.empty:
+            return []
+        df = df.astype(object).where(df.notna(), fill)
+        return df.to_dict("records")
+
+    # ---------------- 시트 동기화 ----------------
+
+    def dirty_dates(self, table: str) -> list:
+        rows = self.conn.execute(
+            "SELECT date FROM partitions WHERE tbl = ? AND (synced_hash IS NULL OR synced_hash != hash) ORDER BY date",
+            (table,),
+        )
+        return [r[0] for r in rows]
+
+    def mark_synced(self, table: str, dates: list):
+        now = datetime.now().isoformat(timespec="seconds")
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE partitions SET synced_hash = hash, synced_at = ? WHERE tbl = ? AND date = ?",
+                [(now, table, d) for d in dates],
+            )
+
+    def bootstrap_from_sheet(self, table: str, worksheet):
+        """로컬 DB 가 비어 있으면 시트 전체를 1회 내려받아 시드 (이미 시트에 있으므로 synced 처리)"""
+        if not self.is_empty(table):
+            return
+        print(f"   📥 [{table}] 로컬 히스토리 비어 있음 -> 시트에서 1회 시드")
+        records = worksheet.get_all_records()
+        self.replace_dates(table, records, synced=True)
+
+    def sync_to_sheet(self, table: str, worksheet) -> list:
+        """변경된 날짜 파티션만 시트에 업서트"""
+        dirty = self.dirty_dates(table)
+        if not dirty:
+            print(f"   ✅ [{table}] 시트와 동기화 상태 (변경 없음)")
+            return []
+        print(f"   🔄 [{table}] 변경 파티션 {len(dirty)}개 동기화: {', '.join(dirty)}")
+        labels = tuple(label for _, _, label in TABLES[table]["columns"][:2])
+        writer = IncrementalSheetWriter(worksheet, fill_value=TABLES[table]["fill"], key_columns=labels)
+        writer.upsert_records(self.records(table, dirty))
+        self.mark_synced(table, dirty)
+        return dirty
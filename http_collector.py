@@ -0,0 +1,173 @@
+# ============================================================
+# [HTTP Collector] 브라우저 없는 수집기 (asyncio + aiohttp, 세션 쿠키 재사용)
+# ============================================================
+# 두 봇 모두 백오피스 API 가 내려주는 데이터를 보려고 크롬을 띄운다.
+# 여기서는 BACKOFFICE_COOKIES 로 같은 API 를 직접 호출한다.
+#   - keep-alive 커넥션 풀 1개 (TCPConnector) + Semaphore 로 동시 요청 수 제한
+#   - 출석: 대시보드 API 1회 -> 같은 채점 규칙(score_records)
+#   - TIL: 명단 페이지 순회 -> 학생별 제출 내역을 동시에 조회
+# 반환값은 AttendanceCrawler / BackOfficeCrawler.collect_data 와 같은 레코드 dict.
+# 응답 스키마는 network_capture 의 필드 후보로 해석 (스키마 변경 시 거기만 수정).
+#
+#   COLLECTOR_BACKEND=http  (Config.COLLECTOR)
+#   ATTENDANCE_API_PATH / TIL_ROSTER_API_PATH / TIL_HISTORY_API_PATH 로 엔드포인트 지정
+#   (크롬 performance 로그에 찍힌 실제 XHR 경로를 넣으면 된다)
+#
+# 브라우저 경로는 카테고리(QA/QC) / 코스(KDT QA 4회차)를 골라서 조회하므로, 같은 레코드를 받으려면
+# 명단/출석 경로에 기수 필터가 꼭 들어가야 한다. 템플릿에서 쓸 수 있는 값:
+#   {category} = Config.CATEGORY, {course} = Config.COURSE_NAME (URL 인코딩됨)
+# 실제 API 의 필터 파라미터 이름이 다르면 경로 템플릿에서 맞춰 준다.
+
+import asyncio
+import os
+import time
+from urllib.parse import quote, urljoin
+
+import run_metrics
+from attendance_scoring import ScoringRules, score_records
+from network_capture import build_history, parse_attendance_records, parse_students, parse_submission_records
+from session_manager import LOGIN_MARKERS, cookie_header, load_cookies
+
+ATTENDANCE_API = os.environ.get("ATTENDANCE_API_PATH", "/api/attendance?date={date}&category={category}&course={course}")
+TIL_ROSTER_API = os.environ.get("TIL_ROSTER_API_PATH",
+                                "/api/til/students?page={page}&size={size}&category={category}&course={course}")
+TIL_HISTORY_API = os.environ.get("TIL_HISTORY_API_PATH", "/api/til/history?userId={id}&name={name}")
+
+ROSTER_PAGE_SIZE = 100
+MAX_ROSTER_PAGES = 200
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class HttpCollector:
+    """aiohttp 세션 1개로 백오피스 API 호출 (async with 로 열고 닫음)"""
+
+    def __init__(self, base_url: str, cookies: list = None, concurrency: int = 8,
+                 timeout: float = 15, retries: int = 2, category: str = "", course: str = ""):
+        self.base_url = base_url
+        self.cohort = {"category": quote(category or ""), "course": quote(course or "")}  # 경로 템플릿용 기수 필터
+        self.cookies = load_cookies() if cookies is None else cookies
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.retries = retries
+        self.session = None
+        self.semaphore = None
+
+    async def __aenter__(self):
+        import aiohttp  # 선택 의존성: http 수집기를 쓸 때만 필요
+        self._aiohttp = aiohttp
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.concurrency, keepalive_timeout=30),
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers={"Cookie": cookie_header(self.cookies), "User-Agent": "Mozilla/5.0",
+                     "Accept": "application/json"},
+        )
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.session.close()
+
+    async def get_json(self, path: str):
+        """GET -> JSON. 로그인 페이지로 튕기면 LOGIN_FAILED, 5xx/429/네트워크 오류는 재시도."""
+        url = urljoin(self.base_url, path)
+        async with self.semaphore:
+            for attempt in range(self.retries + 1):
+                started = time.perf_counter()
+                try:
+                    async with self.session.get(url) as response:
+                        if response.status in (401, 403) or any(m in str(response.url) for m in LOGIN_MARKERS):
+                            raise PermissionError(f"LOGIN_FAILED: {path} -> HTTP {response.status} ({response.url})")
+                        if response.status in RETRY_STATUSES and attempt < self.retries:
+                            raise self._aiohttp.ClientResponseError(
+                                response.request_info, (), status=response.status)
+                        response.raise_for_status()
+                        payload = await response.json(content_type=None)
+                    run_metrics.incr("http_requests")
+                    run_metrics.observe("http_latency", time.perf_counter() - started)
+                    return payload
+                except PermissionError:
+                    raise
+                except (self._aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    if attempt >= self.retries:
+                        raise
+                    run_metrics.incr("retries.http")
+                    print(f"   🔁 재시도 {attempt + 1}/{self.retries}: {path} ({e.__class__.__name__})")
+                    await asyncio.sleep(0.5 * 2 ** attempt)
+
+    # ---------------- 출석 ----------------
+
+    async def attendance(self, target_date: str, rules: ScoringRules) -> list:
+        payload = await self.get_json(ATTENDANCE_API.format(date=target_date, **self.cohort))
+        records = [{"날짜": target_date, **r} for r in parse_attendance_records(payload)]
+        return score_records(records, rules)
+
+    # ---------------- TIL ----------------
+
+    async def roster(self, page_size: int = ROSTER_PAGE_SIZE) -> list:
+        """명단 전체 (페이지가 비거나 page_size 보다 짧으면 끝)"""
+        students, seen = [], set()
+        for page in range(1, MAX_ROSTER_PAGES + 1):
+            batch = parse_students(await self.get_json(TIL_ROSTER_API.format(page=page, size=page_size, **self.cohort)))
+            fresh = [s for s in batch if s["name"] not in seen]
+            seen.update(s["name"] for s in fresh)
+            students.extend(fresh)
+            if len(batch) < page_size or not fresh:
+                break
+        return students
+
+    async def history(self, student: dict, wanted: set) -> dict:
+        path = TIL_HISTORY_API.format(id=quote("" if student["id"] is None else str(student["id"])), name=quote(student["name"]))
+        records = parse_submission_records(await self.get_json(path), student["name"])
+        history = build_history(records).get(student["name"], {})
+        return {d: history.get(d, 0) for d in wanted}
+
+    async def til(self, target_dates, known: dict = None, failed: list = None) -> list:
+        """failed 리스트를 주면 제출 내역 조회에 실패한 학생 이름을 추가 (부분 결과 판단용)"""
+        dates = [target_dates] if isinstance(target_dates, str) else list(target_dates)
+        known = known or {}
+        students = await self.roster()
+        print(f"   📋 명단 {len(students)}명 (이미 제출 확인 {sum(s['name'] in known for s in students)}명 생략)")
+        pending = [s for s in students if s["name"] not in known]
+        results = await asyncio.gather(*(self.history(s, set(dates)) for s in pending), return_exceptions=True)
+
+        histories = dict(known)
+        for student, result in zip(pending, results):
+            if isinstance(result, PermissionError):
+                raise result
+            if isinstance(result, Exception):
+                print(f"   ❌ {student['name']}님 제출 내역 조회 실패: {result}")
+                run_metrics.incr("errors.http_history")
+                if failed is not None:
+                    failed.append(student["name"])
+                continue
+            histories[student["name"]] = result
+        return [
+            {"이름": s["name"], "날짜": d, "제출여부": histories[s["name"]].get(d, 0)}
+            for s in students if s["name"] in histories for d in dates
+        ]
+
+
+# ============================================================
+# 동기 진입점 (봇/파이프라인에서 호출)
+# ============================================================
+async def _with_collector(config, work):
+    async with HttpCollector(config.BACKOFFICE_URL, concurrency=config.HTTP_CONCURRENCY,
+                             category=config.CATEGORY, course=config.COURSE_NAME) as collector:
+        return await work(collector)
+
+
+def collect_attendance(config, target_date: str) -> list:
+    """AttendanceCrawler.collect_data 와 같은 채점된 레코드"""
+    print(f"\n🌐 [HTTP 수집기] 출석 수집 (타겟: {target_date})")
+    rules = ScoringRules.from_config(config)
+    data = asyncio.run(_with_collector(config, lambda c: c.attendance(target_date, rules)))
+    print(f"   📄 총 {len(data)}명의 데이터 수신")
+    return data
+
+
+def collect_til(config, target_dates, known: dict = None, failed: list = None) -> list:
+    """BackOfficeCrawler.collect_data 와 같은 {"이름", "날짜", "제출여부"} 레코드 (failed: 조회 실패 학생)"""
+    print(f"\n🌐 [HTTP 수집기] TIL 수집 (동시 요청 {config.HTTP_CONCURRENCY}개)")
+    data = asyncio.run(_with_collector(config, lambda c: c.til(target_dates, known, failed)))
+    run_metrics.incr("til_rows", len(data))
+    return data
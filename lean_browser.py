@@ -0,0 +1,150 @@
+# ============================================================
+# [Lean Browser] 이미지/폰트/미디어/트래커 차단 (CDP Network.setBlockedURLs) + 절감량 보고
+# ============================================================
+# 백오피스 SPA 는 이동할 때마다 이미지, 웹폰트, 분석 스크립트까지 전부 받는다.
+# 표 데이터는 JS 번들 + XHR 만으로 그려지므로 나머지는 요청 단계에서 막는다.
+#   - 시작 옵션: 이미지 content setting 차단 (새 프로필/헤드리스에서만 적용됨)
+#   - CDP: Network.setBlockedURLs (기존 크롬에 붙는 로컬 모드에서도 적용)
+# performance 로그의 Network 이벤트로 차단된 요청 수 / 실제 받은 바이트를 세고,
+# 차단 없이 돌았던 실행의 유형별 평균 크기로 절감 바이트를 추정한다.
+#
+#   LEAN_BROWSER=0 이면 차단 없이 실행 (이때 유형별 평균 크기를 기준값으로 갱신)
+
+import json
+import os
+from collections import Counter
+
+import run_metrics
+
+BASELINE_PATH = os.environ.get("LEAN_BASELINE_PATH", "logs/lean_baseline.json")
+
+BLOCKED_URL_PATTERNS = [
+    # 이미지
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico", "*.avif",
+    # 웹폰트
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    # 미디어
+    "*.mp4", "*.webm", "*.mp3", "*.m4a",
+    # 분석/트래커 (표 렌더링과 무관한 서드파티)
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*connect.facebook.net*",
+    "*hotjar.com*", "*amplitude.com*", "*mixpanel.com*", "*clarity.ms*", "*channel.io*", "*beusable.net*",
+]
+CONTENT_SETTINGS = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.default_content_setting_values.notifications": 2,
+}
+
+
+def apply_options(options):
+    """ChromeOptions 에 차단 설정 + Network 이벤트 로그 (드라이버 생성 전에 호출)"""
+    options.add_experimental_option("prefs", CONTENT_SETTINGS)
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+
+def enable(driver, patterns: list = None):
+    """CDP 로 URL 패턴 차단 + 절감량 집계기 부착 (driver.network_stats)"""
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns or BLOCKED_URL_PATTERNS})
+        print(f"   🪶 [경량 브라우저] 이미지/폰트/미디어/트래커 차단 ({len(patterns or BLOCKED_URL_PATTERNS)}개 패턴)")
+    except Exception as e:
+        print(f"   ⚠️ 요청 차단 설정 실패 (전체 로드): {e}")
+    attach_stats(driver, lean=True)
+
+
+def attach_stats(driver, lean: bool):
+    if getattr(driver, "network_stats", None) is None:
+        driver.network_stats = NetworkStats(lean)
+    return driver.network_stats
+
+
+class NetworkStats:
+    """performance 로그 Network 이벤트 -> 유형별 요청 수 / 받은 바이트 / 차단 수"""
+
+    def __init__(self, lean: bool):
+        self.lean = lean
+        self.types = {}            # requestId -> 리소스 유형
+        self.requests = Counter()  # 유형별 완료 요청 수
+        self.bytes = Counter()     # 유형별 받은 바이트 (압축 전송량)
+        self.blocked = Counter()   # 유형별 차단 요청 수
+
+    def observe(self, entries: list):
+        """driver.get_log('performance') 항목 처리 (network_capture 와 로그를 나눠 씀)"""
+        for entry in entries:
+            try:
+                message = json.loads(entry["message"])["message"]
+            except Exception:
+                continue
+            method, params = message.get("method"), message.get("params", {})
+            if method == "Network.requestWillBeSent":
+                self.types[params["requestId"]] = params.get("type", "Other")
+            elif method == "Network.loadingFinished":
+                kind = self.types.get(params["requestId"], "Other")
+                self.requests[kind] += 1
+                self.bytes[kind] += int(params.get("encodedDataLength", 0))
+            elif method == "Network.loadingFailed" and params.get("blockedReason"):
+                self.blocked[params.get("type") or self.types.get(params["requestId"], "Other")] += 1
+
+    def drain(self, driver):
+        try:
+            self.observe(driver.get_log("performance"))
+        except Exception:
+            pass
+
+    def reset(self):
+        self.requests.clear()
+        self.bytes.clear()
+        self.blocked.clear()
+
+    def summary(self, baseline: dict) -> dict:
+        saved = sum(count * baseline.get(kind, 0) for kind, count in self.blocked.items())
+        return {
+            "lean": self.lean,
+            "requests": sum(self.requests.values()), "bytes": sum(self.bytes.values()),
+            "blocked_requests": sum(self.blocked.values()), "blocked_by_type": dict(self.blocked),
+            "saved_bytes_est": int(saved),
+        }
+
+
+def _load_baseline() -> dict:
+    try:
+        with open(BASELINE_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def _save_baseline(stats: NetworkStats):
+    """차단 없이 돈 실행의 유형별 평균 크기 (다음 경량 실행의 절감량 추정용)"""
+    baseline = _load_baseline()
+    for kind, count in stats.requests.items():
+        if count:
+            baseline[kind] = round(stats.bytes[kind] / count)
+    try:
+        os.makedirs(os.path.dirname(BASELINE_PATH) or ".", exist_ok=True)
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, ensure_ascii=False)
+    except Exception as e:
+        print(f"   ⚠️ 경량 브라우저 기준값 저장 실패: {e}")
+
+
+def report(driver, label: str = "") -> dict:
+    """남은 로그를 읽고 요청/바이트/차단 수 출력 + 실행 지표에 기록"""
+    stats = getattr(driver, "network_stats", None)
+    if stats is None:
+        return {}
+    stats.drain(driver)
+    if not stats.lean:
+        _save_baseline(stats)
+    summary = stats.summary(_load_baseline())
+    stats.reset()  # 같은 브라우저로 다시 보고해도 중복 집계 없음
+    saved = f", 절감 추정 {summary['saved_bytes_est'] / 1024:.0f}KB" if summary["saved_bytes_est"] else ""
+    print(f"   🪶 [네트워크{' ' + label if label else ''}] 요청 {summary['requests']}건 / "
+          f"{summary['bytes'] / 1024:.0f}KB 수신 / 차단 {summary['blocked_requests']}건{saved}")
+    # 병렬 워커 브라우저까지 합산되도록 카운터로 기록
+    run_metrics.incr("browser_requests", summary["requests"])
+    run_metrics.incr("browser_bytes", summary["bytes"])
+    run_metrics.incr("browser_blocked_requests", summary["blocked_requests"])
+    run_metrics.incr("browser_saved_bytes_est", summary["saved_bytes_est"])
+    return summary
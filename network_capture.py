@@ -0,0 +1,199 @@
+# ============================================================
+# [Network Capture] 백오피스 XHR/fetch JSON 응답 캡처 -> TIL 제출 내역 파싱
+# ============================================================
+# 대시보드가 이미 호출하는 API 응답을 크롬 DevTools performance 로그로 잡아서
+# 학생별 제출 내역을 모달 없이 바로 얻는다.
+# 캡처가 실패하거나 일부 학생이 빠지면 해당 학생만 기존 모달 경로로 처리.
+
+import base64
+import json
+
+# 응답 JSON 안에서 찾을 필드 후보 (백오피스 스키마 변경 시 여기만 수정)
+NAME_KEYS = ("name", "userName", "username", "studentName", "realName", "이름")
+DATE_KEYS = ("date", "tilDate", "submitDate", "submittedDate", "targetDate", "날짜")
+STATUS_KEYS = ("status", "submitStatus", "isSubmitted", "submitted", "제출여부")
+LIST_NAME_KEYS = ("user", "student", "member")  # 중첩 객체 안의 이름 (예: {"user": {"name": ...}})
+ID_KEYS = ("userId", "studentId", "memberId", "id")
+CHECK_IN_KEYS = ("checkIn", "checkInTime", "checkInAt", "inTime", "enterTime", "입실", "입실시간")
+CHECK_OUT_KEYS = ("checkOut", "checkOutTime", "checkOutAt", "outTime", "leaveTime", "퇴실", "퇴실시간")
+
+
+def normalize_status(value) -> int:
+    """제출 상태 값 -> 1(제출) / 0(미제출)"""
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (int, float)):
+        return 1 if value > 0 else 0
+    text = str(value).strip()
+    if "미제출" in text or text.upper() in ("NOT_SUBMITTED", "UNSUBMITTED", "FALSE", "N", ""):
+        return 0
+    if "제출" in text or "완료" in text or text.upper() in ("SUBMITTED", "DONE", "COMPLETE", "TRUE", "Y"):
+        return 1
+    return 0
+
+
+def _first(obj: dict, keys):
+    for k in keys:
+        if k in obj and obj[k] not in (None, ""):
+            return obj[k]
+    return None
+
+
+def _own_name(obj: dict):
+    name = _first(obj, NAME_KEYS)
+    if isinstance(name, str):
+        return name.strip()
+    for k in LIST_NAME_KEYS:
+        nested = obj.get(k)
+        if isinstance(nested, dict):
+            name = _first(nested, NAME_KEYS)
+            if isinstance(name, str):
+                return name.strip()
+    return None
+
+
+def parse_submission_records(payload, name=None) -> list:
+    """
+    JSON 응답에서 (이름, 날짜, 제출여부) 레코드를 재귀적으로 추출.
+    - 평평한 형태: [{"name": "홍길동", "date": "2025-11-27", "status": "제출"}]
+    - 중첩 형태: {"data": [{"user": {"name": ...}, "tils": [{"date": ..., "status": ...}]}]}
+    상위 객체의 이름은 하위 리스트로 상속된다.
+    """
+    records = []
+    if isinstance(payload, list):
+        for item in payload:
+            records.extend(parse_submission_records(item, name))
+    elif isinstance(payload, dict):
+        name = _own_name(payload) or name
+        date = _first(payload, DATE_KEYS)
+        status = _first(payload, STATUS_KEYS)
+        if name and isinstance(date, str) and status is not None:
+            records.append({"이름": name, "날짜": date[:10], "제출여부": normalize_status(status)})
+        for value in payload.values():
+            if isinstance(value, (list, dict)):
+                records.extend(parse_submission_records(value, name))
+    return records
+
+
+def _clock(value) -> str:
+    """'2025-12-01T09:03:12' / '09:03:12' / '09:03' -> '09:03' (없으면 '-')"""
+    if not isinstance(value, str) or not value.strip():
+        return "-"
+    text = value.strip()
+    if "T" in text:
+        text = text.split("T", 1)[1]
+    elif " " in text:
+        text = text.rsplit(" ", 1)[1]
+    return text[:5] if len(text) >= 5 and text[2] == ":" else "-"
+
+
+def parse_students(payload) -> list:
+    """명단 응답 -> [{"id": ..., "name": ...}] (응답 순서 유지, 이름 중복 제거)"""
+    students, seen = [], set()
+
+    def walk(node):
+        if isinstance(node, list):
+            for item in node:
+                walk(item)
+        elif isinstance(node, dict):
+            name = _own_name(node)
+            if name and name not in seen and _first(node, DATE_KEYS) is None:
+                seen.add(name)
+                nested = next((node[k] for k in LIST_NAME_KEYS if isinstance(node.get(k), dict)), {})
+                own_id = _first(node, ID_KEYS)
+                students.append({"id": own_id if own_id is not None else _first(nested, ID_KEYS), "name": name})
+                return
+            for value in node.values():
+                if isinstance(value, (list, dict)):
+                    walk(value)
+
+    walk(payload)
+    return students
+
+
+def parse_attendance_records(payload) -> list:
+    """출석 대시보드 응답 -> [{"이름", "입실시간", "퇴실시간"}] (시각은 HH:MM, 없으면 '-')"""
+    records = []
+    if isinstance(payload, list):
+        for item in payload:
+            records.extend(parse_attendance_records(item))
+    elif isinstance(payload, dict):
+        name = _own_name(payload)
+        check_in, check_out = _first(payload, CHECK_IN_KEYS), _first(payload, CHECK_OUT_KEYS)
+        if name and any(k in payload for k in CHECK_IN_KEYS + CHECK_OUT_KEYS):  # null 이어도 키가 있으면 출석 행
+            records.append({"이름": name, "입실시간": _clock(check_in), "퇴실시간": _clock(check_out)})
+            return records
+        for value in payload.values():
+            if isinstance(value, (list, dict)):
+                records.extend(parse_attendance_records(value))
+    return records
+
+
+def build_history(records: list) -> dict:
+    """레코드 리스트 -> {이름: {날짜: 제출여부}} (같은 날짜 중복 시 제출 우선)"""
+    history = {}
+    for r in records:
+        dates = history.setdefault(r["이름"], {})
+        dates[r["날짜"]] = max(dates.get(r["날짜"], 0), r["제출여부"])
+    return history
+
+
+class PerformanceLogCapture:
+    """크롬 performance 로그에서 XHR/fetch JSON 응답 본문을 수집"""
+
+    RESOURCE_TYPES = ("XHR", "Fetch")
+
+    def __init__(self, driver, url_keywords=None):
+        self.driver = driver
+        self.url_keywords = [k.lower() for k in (url_keywords or [])]
+
+    @staticmethod
+    def enable(options):
+        """ChromeOptions 에 performance 로그 수집 설정 (드라이버 생성 전에 호출)"""
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+    def _wanted(self, url: str) -> bool:
+        if not self.url_keywords:
+            return True
+        url = url.lower()
+        return any(k in url for k in self.url_keywords)
+
+    def drain_responses(self) -> list:
+        """지금까지 쌓인 로그를 비우고, JSON 응답 본문 리스트 반환"""
+        try:
+            entries = self.driver.get_log("performance")
+        except Exception as e:
+            print(f"   ⚠️ performance 로그 읽기 실패: {e}")
+            return []
+        # 같은 로그를 쓰는 경량 브라우저 집계기에도 전달 (get_log 는 읽으면 비워짐)
+        stats = getattr(self.driver, "network_stats", None)
+        if stats is not None:
+            stats.observe(entries)
+
+        payloads = []
+        for entry in entries:
+            try:
+                message = json.loads(entry["message"])["message"]
+                if message.get("method") != "Network.responseReceived":
+                    continue
+                params = message["params"]
+                response = params.get("response", {})
+                if params.get("type") not in self.RESOURCE_TYPES:
+                    continue
+                if "json" not in response.get("mimeType", "") or not self._wanted(response.get("url", "")):
+                    continue
+                body = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": params["requestId"]})
+                text = body.get("body", "")
+                if body.get("base64Encoded"):
+                    text = base64.b64decode(text).decode("utf-8")
+                payloads.append(json.loads(text))
+            except Exception:
+                continue  # 본문이 이미 버려졌거나 JSON 이 아닌 응답
+        return payloads
+
+    def capture_history(self) -> dict:
+        """현재까지 캡처된 응답 -> {이름: {날짜: 제출여부}}"""
+        records = []
+        for payload in self.drain_responses():
+            records.extend(parse_submission_records(payload))
+        return build_history(records)
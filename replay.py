@@ -0,0 +1,129 @@
+# ============================================================
+# [Replay] 저장된 원본 스냅샷 -> 같은 파서로 재처리 (브라우저 없음)
+# ============================================================
+# 파서 버그를 고쳤거나 출석 채점 규칙을 바꿨을 때 다음 크롤링을 기다리지 않고
+# 디스크의 스냅샷으로 레코드를 다시 만든다.
+#
+#   python replay.py --kind attendance                 # 최근 출석 실행을 재처리해서 미리보기
+#   python replay.py --kind til --run 20251201-150000 --save     # 로컬 히스토리에 반영
+#   python replay.py --kind attendance --upload       # 히스토리 + 시트 + 일별 요약까지 반영
+#
+# GitHub Actions 실행의 스냅샷은 실행별 아티팩트(snapshots-<run_id>-<attempt>)로 30일 보관된다.
+# 같은 디렉터리에 내려받으면 내용 주소 저장소라 로컬 스냅샷과 그대로 합쳐진다.
+#   gh run download <run_id> -n snapshots-<run_id>-1 -D data/snapshots
+
+import argparse
+import time
+
+import pandas as pd
+
+from attendance_scoring import ScoringRules
+from history_store import HistoryStore
+from snapshot_store import SnapshotStore
+
+KINDS = {"attendance": "attendance_table", "til": "til_page"}
+
+
+def replay_attendance(snapshots: SnapshotStore, run_id: str, rules: ScoringRules) -> list:
+    from daily_attendance import parse_attendance_rows
+    records = []
+    for entry, rows in snapshots.iter_payloads(run_id, "attendance_table"):
+        records.extend(parse_attendance_rows(rows, entry["date"], rules))
+    return records
+
+
+def replay_til(snapshots: SnapshotStore, run_id: str, missing: list = None) -> list:
+    """
+    페이지 스냅샷의 학생 순서대로, 라이브 scan_page 와 같은 판단으로 재처리.
+      - til_decisions 가 있으면 학생별 판단 출처를 그대로 따름 (모달이면 모달 스냅샷을 다시 파싱,
+        캡처/증분/체크포인트면 당시 값 사용)
+      - 없으면(이전 스냅샷) 대상 날짜를 전부 담은 캡처 -> 모달 스냅샷 순
+    결과를 만들 수 없는 학생(라이브 실패, 스냅샷 없음)은 missing 리스트에 이름을 추가.
+    """
+    from daily_til_bot import parse_modal_rows
+    captured = {}
+    for _, payload in snapshots.iter_payloads(run_id, "til_captured"):
+        for name, history in payload.items():
+            captured.setdefault(name, {}).update(history)
+    modals = {entry["name"]: rows for entry, rows in snapshots.iter_payloads(run_id, "til_modal")}
+    decisions = {}
+    for _, payload in snapshots.iter_payloads(run_id, "til_decisions"):
+        decisions.update(payload)
+
+    records, seen = [], set()
+    for entry, rows in snapshots.iter_payloads(run_id, "til_page"):
+        dates = entry["dates"]
+        wanted = set(dates)
+        for row in rows:
+            if not row["cells"]:
+                continue
+            name = row["cells"][0]
+            decision = decisions.get(name)
+            source = decision["source"] if decision else None
+            if source == "modal" and name in modals:
+                history = parse_modal_rows(modals[name], wanted)
+            elif source in ("captured", "known", "checkpoint"):
+                history = decision["history"]
+            elif decision is None and name in captured and wanted <= captured[name].keys():
+                history = captured[name]
+            elif decision is None and name in modals:
+                history = parse_modal_rows(modals[name], wanted)
+            else:
+                if missing is not None and name not in missing:
+                    missing.append(name)  # 라이브 수집에서도 실패했거나 스냅샷이 없는 학생
+                continue
+            for d in dates:
+                if (name, d) not in seen:
+                    seen.add((name, d))
+                    records.append({"이름": name, "날짜": d, "제출여부": history.get(d, 0)})
+    return records
+
+
+def replay(kind: str, run_id: str = None, snapshots: SnapshotStore = None, missing: list = None) -> list:
+    """missing 리스트를 주면 재처리할 수 없었던 학생 이름을 추가 (부분 재처리 판단용)"""
+    snapshots = snapshots or SnapshotStore()
+    run_id = run_id or snapshots.latest_run(KINDS[kind])
+    if not run_id:
+        print(f"⚠️ [{kind}] 스냅샷이 없습니다.")
+        return []
+    started = time.perf_counter()
+    if kind == "attendance":
+        from daily_attendance import Config
+        records = replay_attendance(snapshots, run_id, ScoringRules.from_config(Config()))
+    else:
+        records = replay_til(snapshots, run_id, missing)
+    print(f"🔁 [{kind}] 실행 {run_id} 재처리: {len(records)}건 ({time.perf_counter() - started:.2f}s)")
+    return records
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="원본 스냅샷 재처리 (브라우저 없음)")
+    parser.add_argument("--kind", choices=list(KINDS), required=True)
+    parser.add_argument("--run", default=None, help="실행 id (기본: 가장 최근)")
+    parser.add_argument("--save", action="store_true", help="로컬 히스토리에 반영 (시트는 다음 동기화 때)")
+    parser.add_argument("--upload", action="store_true", help="로컬 히스토리 + 구글 시트 + 일별 요약 반영")
+    args = parser.parse_args()
+
+    missing = []
+    records = replay(args.kind, args.run, missing=missing)
+    if missing:
+        # 빠진 학생이 있으면 날짜 파티션을 통째로 바꾸지 않음 (그 학생의 기존 기록 보존)
+        print(f"⚠️ 재처리 불가 {len(missing)}명 -> 수집된 행만 덮어씀: {', '.join(missing[:10])}{' ...' if len(missing) > 10 else ''}")
+    if records:
+        print(pd.DataFrame(records).head(10).to_string())
+    if records and args.upload:
+        if args.kind == "attendance":
+            from daily_attendance import AttendanceSheetManager
+            AttendanceSheetManager().save_data(records)
+        else:
+            from daily_til_bot import GoogleSheetManager
+            df = pd.DataFrame(records)
+            df.attrs["partial"] = bool(missing)
+            GoogleSheetManager().save_data(df)
+    elif records and args.save:
+        store = HistoryStore()
+        try:
+            changed = store.replace_dates(args.kind, records, keep_others=bool(missing))
+            print(f"💾 로컬 히스토리 반영: 변경 날짜 {changed or '없음'}")
+        finally:
+            store.close()
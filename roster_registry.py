@@ -0,0 +1,142 @@
+# ============================================================
+# [Roster Registry] 학생 이름 -> 고정 정수 ID + 히스토리 압축 프레임
+# ============================================================
+# 히스토리 프레임은 행마다 한글 이름/날짜 문자열(object 컬럼)을 들고 다녀서
+# 날짜 x 학생 수만큼 파이썬 문자열이 쌓인다. 여기서는 분석용 프레임을 정수로만 둔다.
+#   - student_id: int32 (HistoryStore 의 roster 테이블, 처음 기록된 순서대로 고정 발급)
+#   - day: int32 (1970-01-01 기준 일수, 정렬/차이 계산이 정수 연산)
+#   - 제출여부: int8 (1/0) / 출석 상태: int8 고정소수점 (점수 x 2 -> 2=출석, 1=지각/조퇴, 0=결석)
+#   - 입/퇴실: int16 (자정 기준 분, 기록 없음 = -1)
+# 이름/날짜 문자열로는 화면에 내보낼 때만 바꾼다 (names / day_labels / for_display).
+# TIL x 출석 조인은 (day, student_id) 정수 병합.
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from daily_summary import SUBMIT_PATTERN
+
+SCORE_SCALE = 2  # 출석 점수 고정소수점 배율 (0.5 단위)
+NO_TIME = -1
+KEYS = ["day", "student_id"]
+
+
+def day_numbers(dates) -> np.ndarray:
+    """'YYYY-MM-DD' -> int32 일수 (파싱 실패 = 0)"""
+    parsed = pd.to_datetime(pd.Series(dates, dtype=object).astype(str).str[:10], format="%Y-%m-%d", errors="coerce")
+    days = parsed.to_numpy(dtype="datetime64[D]").astype(np.int64)
+    return np.where(parsed.isna().to_numpy(), 0, days).astype(np.int32)
+
+
+def day_labels(days) -> pd.Index:
+    """int32 일수 -> 'YYYY-MM-DD' (화면 표시용)"""
+    return pd.Index(np.asarray(days, dtype="datetime64[D]").astype(str), name="날짜")
+
+
+def _minutes(times: pd.Series) -> np.ndarray:
+    """'HH:MM(:SS)' -> 자정 기준 분 (int16, 기록 없음 = -1)"""
+    parts = times.astype(str).str.extract(r"(\d{1,2}):(\d{2})").astype(float)
+    minutes = (parts[0] * 60 + parts[1]).fillna(NO_TIME)
+    return minutes.to_numpy().astype(np.int16)
+
+
+class RosterRegistry:
+    """{이름: ID} 양방향 조회. path 가 있으면 HistoryStore 의 roster 테이블과 동기화."""
+
+    def __init__(self, path: str = None):
+        self.path = path if path and os.path.exists(path) else None
+        self.ids = {}
+        self._names = np.array([], dtype=object)
+        if self.path:
+            self._reload()
+
+    def _reload(self, new_names=None, first_seen: str = None):
+        from history_store import HistoryStore  # 순환 import 방지 (history_store -> sheet_writer)
+        store = HistoryStore(self.path)
+        try:
+            self._set(store.register_names(new_names, first_seen) if new_names else store.roster())
+        finally:
+            store.close()
+
+    def _set(self, ids: dict):
+        self.ids = dict(ids)
+        names = np.full(max(self.ids.values(), default=-1) + 1, None, dtype=object)
+        for name, i in self.ids.items():
+            names[i] = name
+        self._names = names
+
+    def encode(self, names: pd.Series, days: np.ndarray = None) -> np.ndarray:
+        """이름 -> int32 ID (처음 보는 이름은 등장한 날짜, 이름 순으로 새 ID 발급)"""
+        names = names.astype(str)
+        codes, uniques = pd.factorize(names)
+        fresh = [n for n in uniques if n not in self.ids]
+        if fresh:
+            first = {}
+            if days is not None:
+                first = pd.Series(days).groupby(codes).min().to_dict()
+            position = {n: i for i, n in enumerate(uniques)}
+            fresh.sort(key=lambda n: (first.get(position[n], 0), n))
+            if self.path:
+                self._reload(fresh)
+            else:
+                start = max(self.ids.values(), default=0) + 1
+                self._set({**self.ids, **{n: start + i for i, n in enumerate(fresh)}})
+        lookup = np.array([self.ids[n] for n in uniques], dtype=np.int32)
+        return lookup[codes] if len(codes) else np.array([], dtype=np.int32)
+
+    def names(self, ids) -> pd.Index:
+        """int32 ID -> 이름 (화면 표시용)"""
+        ids = np.asarray(ids, dtype=np.int64)
+        valid = (ids >= 0) & (ids < len(self._names))
+        out = np.full(len(ids), None, dtype=object)
+        out[valid] = self._names[ids[valid]]
+        return pd.Index(out, name="이름")
+
+    # ---------------- 압축 프레임 ----------------
+
+    def _keys(self, df: pd.DataFrame) -> pd.DataFrame:
+        days = day_numbers(df['날짜'])
+        return pd.DataFrame({"day": days, "student_id": self.encode(df['이름'], days)})
+
+    def compact_til(self, df: pd.DataFrame) -> pd.DataFrame:
+        """TIL 원본(날짜/이름/제출여부) -> day, student_id, submitted(int8)"""
+        if df.empty:
+            return pd.DataFrame({c: pd.Series(dtype=t) for c, t in
+                                 [("day", "int32"), ("student_id", "int32"), ("submitted", "int8")]})
+        out = self._keys(df)
+        out["submitted"] = df['제출여부'].astype(str).str.contains(SUBMIT_PATTERN).to_numpy().astype(np.int8)
+        return out
+
+    def compact_attendance(self, df: pd.DataFrame) -> pd.DataFrame:
+        """출석 원본(날짜/이름/입실/퇴실/상태) -> day, student_id, score(int8, x2), in_min/out_min(int16)"""
+        if df.empty:
+            return pd.DataFrame({c: pd.Series(dtype=t) for c, t in
+                                 [("day", "int32"), ("student_id", "int32"), ("score", "int8"),
+                                  ("in_min", "int16"), ("out_min", "int16")]})
+        out = self._keys(df)
+        status = pd.to_numeric(df['상태'], errors='coerce').fillna(0).to_numpy()
+        out["score"] = np.rint(status * SCORE_SCALE).astype(np.int8)
+        for col, label in (("in_min", "입실시간"), ("out_min", "퇴실시간")):
+            out[col] = _minutes(df[label]) if label in df.columns else np.int16(NO_TIME)
+        return out
+
+    def for_display(self, frame: pd.DataFrame, index: str = None, columns: str = None) -> pd.DataFrame:
+        """정수 축 -> 이름/날짜 라벨 ("student" / "day")"""
+        frame = frame.copy()
+        labels = {"student": self.names, "day": day_labels}
+        if index:
+            frame.index = labels[index](frame.index)
+        if columns:
+            frame.columns = labels[columns](frame.columns)
+        return frame
+
+
+def join(til: pd.DataFrame, attendance: pd.DataFrame, how: str = "inner") -> pd.DataFrame:
+    """TIL x 출석 (day, student_id) 정수 병합"""
+    return til.merge(attendance, on=KEYS, how=how)
+
+
+def memory_bytes(df: pd.DataFrame) -> int:
+    """object 컬럼 문자열까지 포함한 실제 메모리"""
+    return int(df.memory_usage(deep=True).sum())
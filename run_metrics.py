@@ -0,0 +1,208 @@
+# ============================================================
+# [Run Metrics] 실행 단위 구간(span)/카운터/지연 분포 기록 + 리포트
+# ============================================================
+# 이모지 print 로만 남던 실행 기록을 구조화한다.
+#   - span:     브라우저 실행, 로그인, 옵션 선택, 페이지 이동, 시트 저장 등 구간 소요 시간
+#   - counter:  수집 행 수, 모달 오픈 수, 재시도, 단계별 에러
+#   - observe:  학생별 모달 지연 같은 분포 (p50/p90/p99)
+# 실행이 끝나면 logs/run_report.jsonl 에 1줄로 누적하고, RUN_METRICS_TAB 이 설정돼
+# 있으면 시트의 지표 탭에도 1행 추가 (대시보드 '수집 성능' 차트에서 사용).
+#
+# 크롤러/업로더는 모듈 함수(span / incr / observe)만 부르면 된다. 실행 중인
+# RunMetrics 가 없으면 전부 아무 일도 하지 않는다 (logging 과 같은 방식).
+
+import json
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+
+REPORT_PATH = os.environ.get("RUN_REPORT_PATH", "logs/run_report.jsonl")
+METRICS_TAB = os.environ.get("RUN_METRICS_TAB")  # 예: "run_metrics" (없으면 시트 기록 안 함)
+
+# 처리량 = 카운터 / 구간 합계
+RATES = {
+    "til_rows_per_sec": ("til_rows", "til_collect"),
+    "attendance_rows_per_sec": ("attendance_rows", "attendance_collect"),
+}
+# 지표 탭 컬럼 (실행 1행)
+TAB_SPANS = ("browser_launch", "login", "select_options", "attendance_collect", "til_collect",
+             "pagination", "sheet_write")
+TAB_HEADER = (["날짜", "실행ID", "구분", "총소요"] + list(TAB_SPANS)
+              + ["modal_p50", "modal_p90", "til_rows_per_sec", "attendance_rows_per_sec",
+                 "retries", "errors", "sheet_calls", "sheet_cells_written"])
+
+
+def _percentile(values: list, q: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(q / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+class RunMetrics:
+    """실행 1회의 구간/카운터/분포 (병렬 워커에서 동시에 기록 가능)"""
+
+    def __init__(self, label: str):
+        self.label = label
+        self.run_id = datetime.now().strftime("%Y%m%d-%H%M%S")
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+        self._t0 = time.perf_counter()
+        self._lock = threading.Lock()
+        self.spans = defaultdict(lambda: {"count": 0, "total": 0.0, "max": 0.0})
+        self.counters = Counter()
+        self.observations = defaultdict(list)
+        self.extra = {}
+
+    @contextmanager
+    def span(self, name: str):
+        """구간 소요 시간 (같은 이름은 합산). 예외가 나면 errors.<name> 도 +1"""
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.incr(f"errors.{name}")
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                s = self.spans[name]
+                s["count"] += 1
+                s["total"] += elapsed
+                s["max"] = max(s["max"], elapsed)
+
+    def incr(self, name: str, value: int = 1):
+        with self._lock:
+            self.counters[name] += value
+
+    def observe(self, name: str, value: float):
+        with self._lock:
+            self.observations[name].append(value)
+
+    def attach(self, key: str, value):
+        """부가 정보 (대기 프로파일, 시트 호출 수 등)"""
+        self.extra[key] = value
+
+    # ---------------- 리포트 ----------------
+
+    def summary(self) -> dict:
+        spans = {k: {"count": v["count"], "total": round(v["total"], 3), "max": round(v["max"], 3)}
+                 for k, v in self.spans.items()}
+        observations = {
+            name: {"count": len(values), "p50": round(_percentile(values, 50), 3),
+                   "p90": round(_percentile(values, 90), 3), "p99": round(_percentile(values, 99), 3),
+                   "max": round(max(values), 3)}
+            for name, values in self.observations.items() if values
+        }
+        rates = {}
+        for rate, (counter, span) in RATES.items():
+            if self.counters.get(counter) and spans.get(span, {}).get("total"):
+                rates[rate] = round(self.counters[counter] / spans[span]["total"], 2)
+        return {
+            "run_id": self.run_id, "label": self.label, "started_at": self.started_at,
+            "duration": round(time.perf_counter() - self._t0, 3),
+            "spans": spans, "counters": dict(self.counters), "observations": observations,
+            "rates": rates,
+            "errors": {k[len("errors."):]: v for k, v in self.counters.items() if k.startswith("errors.")},
+            **self.extra,
+        }
+
+    def tab_row(self, summary: dict) -> list:
+        modal = summary["observations"].get("modal_latency", {})
+        sheet = summary.get("sheet", {})
+        return (
+            [summary["started_at"][:10], summary["run_id"], summary["label"], summary["duration"]]
+            + [summary["spans"].get(name, {}).get("total", "") for name in TAB_SPANS]
+            + [modal.get("p50", ""), modal.get("p90", ""),
+               summary["rates"].get("til_rows_per_sec", ""), summary["rates"].get("attendance_rows_per_sec", ""),
+               sum(v for k, v in summary["counters"].items() if k.startswith("retries.")),
+               sum(summary["errors"].values()),
+               sum(sheet.get("calls", {}).values()), sheet.get("cells", {}).get("written", "")]
+        )
+
+    def report(self, path: str = REPORT_PATH, spreadsheet=None) -> dict:
+        """콘솔 요약 + JSONL 누적 + (METRICS_TAB 설정 시) 시트 지표 탭에 1행"""
+        if spreadsheet is not None and hasattr(spreadsheet, "metrics"):
+            self.attach("sheet", spreadsheet.metrics.snapshot())
+        summary = self.summary()
+
+        print(f"\n📊 [실행 지표] {summary['label']} {summary['duration']:.1f}s")
+        for name, s in sorted(summary["spans"].items(), key=lambda kv: -kv[1]["total"]):
+            print(f"   - {name}: {s['count']}회, 합계 {s['total']:.2f}s, 최대 {s['max']:.2f}s")
+        for name, o in summary["observations"].items():
+            print(f"   - {name}: p50 {o['p50']:.2f}s / p90 {o['p90']:.2f}s / p99 {o['p99']:.2f}s ({o['count']}건)")
+        for rate, value in summary["rates"].items():
+            print(f"   - {rate}: {value}")
+        if summary["errors"]:
+            print(f"   ⚠️ 에러: {summary['errors']}")
+
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(summary, ensure_ascii=False) + "\n")
+        except Exception as e:
+            print(f"   ⚠️ 실행 리포트 저장 실패: {e}")
+
+        if METRICS_TAB and spreadsheet is not None:
+            try:
+                from daily_summary import get_or_create_worksheet
+                worksheet = get_or_create_worksheet(spreadsheet, METRICS_TAB)
+                rows = [self.tab_row(summary)]
+                if not worksheet.row_values(1):
+                    rows.insert(0, TAB_HEADER)
+                worksheet.append_rows(rows, table_range="A1")
+            except Exception as e:
+                print(f"   ⚠️ 지표 탭 기록 실패: {e}")
+        return summary
+
+
+# ============================================================
+# 모듈 함수 (실행 중인 RunMetrics 에 기록, 없으면 무시)
+# ============================================================
+_active = None
+
+
+def start_run(label: str) -> RunMetrics:
+    global _active
+    _active = RunMetrics(label)
+    return _active
+
+
+def finish_run(spreadsheet=None, path: str = REPORT_PATH) -> dict:
+    global _active
+    run, _active = _active, None
+    return run.report(path, spreadsheet) if run else {}
+
+
+def active() -> RunMetrics:
+    return _active
+
+
+@contextmanager
+def span(name: str):
+    if _active is None:
+        yield
+    else:
+        with _active.span(name):
+            yield
+
+
+def incr(name: str, value: int = 1):
+    if _active is not None:
+        _active.incr(name, value)
+
+
+def observe(name: str, value: float):
+    if _active is not None:
+        _active.observe(name, value)
+
+
+def load_reports(path: str = REPORT_PATH, limit: int = 200) -> list:
+    """최근 실행 리포트 (대시보드 성능 차트용)"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            lines = f.readlines()[-limit:]
+    except FileNotFoundError:
+        return []
+    return [json.loads(line) for line in lines if line.strip()]
@@ -0,0 +1,193 @@
+# ============================================================
+# [Pipeline Runner] 출석 + TIL 단일 세션 통합 실행
+# ============================================================
+# 브라우저 실행 / 로그인(쿠키 주입) / 구글 시트 인증을 한 번씩만 하고
+# 출석 -> TIL 수집기를 같은 세션에서 차례로 돌린다.
+# COLLECTOR_BACKEND=http 면 크롬 없이 http_collector 로 수집.
+#
+#   python run_pipeline.py                      # 출석 + TIL
+#   python run_pipeline.py --stages til         # TIL 만
+#   python run_pipeline.py --stages attendance --attendance-date 2025-12-01
+
+import argparse
+import sys
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+
+import daily_attendance as att
+import daily_til_bot as til
+from waits import SmartWait, WaitProfiler
+from sheet_backend import open_spreadsheet
+import run_metrics
+import lean_browser
+from session_manager import SessionManager, load_cookies, selenium_cookies
+
+STAGES = ("attendance", "til")
+
+
+class StageTimer:
+    """단계별 소요 시간 기록 (실행 지표에는 stage.<이름> 구간으로도 남김)"""
+
+    def __init__(self):
+        self.timings = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        started = time.perf_counter()
+        try:
+            with run_metrics.span(f"stage.{name}"):
+                yield
+        finally:
+            self.timings[name] = round(time.perf_counter() - started, 3)
+            print(f"   ⏱️ [{name}] {self.timings[name]:.1f}s")
+
+    def report(self):
+        total = sum(self.timings.values())
+        print(f"\n⏱️ [단계별 소요 시간] 총 {total:.1f}s")
+        for name, sec in self.timings.items():
+            print(f"   - {name}: {sec:.1f}s")
+
+
+def login_once(driver, config, profiler: WaitProfiler):
+    """백오피스 도메인 진입 + (서버) 쿠키 주입 1회. 이후 수집기는 쿠키 주입 생략."""
+    print("\n🔐 백오피스 로그인 (1회)...")
+    driver.get(config.BACKOFFICE_URL)
+    if config.IS_SERVER:
+        cookies = load_cookies()
+        if not cookies:
+            raise Exception("LOGIN_FAILED: BACKOFFICE_COOKIES 없음")
+        for cookie in selenium_cookies(cookies):
+            try: driver.add_cookie(cookie)
+            except: pass
+        driver.refresh()
+
+    waits = SmartWait(driver, profiler, timeout=config.WAIT_TIMEOUT)
+    waits.document_ready("pipeline_login", budget=8)
+    if "login" in driver.current_url or "google.com" in driver.current_url:
+        if config.IS_SERVER:
+            raise Exception("LOGIN_FAILED: 쿠키 만료 또는 IP 차단.")
+        print("👉 [로컬] 직접 로그인 후 터미널에서 엔터를 치세요.")
+        input()
+    print("✅ 로그인 완료")
+
+
+def run_pipeline(stages=STAGES, attendance_date: str = None, til_date: str = None, startup: dict = None) -> dict:
+    """
+    출석/TIL 을 한 브라우저 세션에서 수집 후 업로드.
+    startup: 경량 CLI(cli.py)의 판단/모듈 로드 시간 -> 실행 지표에 함께 기록.
+    반환값: {"attendance": [레코드], "til": DataFrame, "timings": {단계: 초}, "sheet_metrics": {호출/셀 수},
+             "failed": [수집/저장 결과가 없는 요청 단계]} (failed 가 있으면 CLI 는 0 이 아닌 코드로 종료)
+    """
+    timer = StageTimer()
+    run_metrics.start_run("pipeline")
+    if startup:
+        run_metrics.active().attach("startup", startup)
+    spreadsheet = None
+    til_config = til.Config()
+    result = {"attendance": [], "til": pd.DataFrame(), "timings": timer.timings, "sheet_metrics": {}, "failed": []}
+
+    # 1. 날짜 결정 (주말/공휴일이면 해당 단계 생략)
+    if "attendance" in stages and not attendance_date:
+        attendance_date = att.DateCalculator.get_target_date(att.Config())
+    if "til" in stages and not til_date:
+        til_date = til.DateCalculator.get_target_date(til_config)
+    run_attendance = "attendance" in stages and bool(attendance_date)
+    run_til = "til" in stages and bool(til_date)
+    print(f"🗓️ 출석: {attendance_date if run_attendance else '생략'} / TIL: {til_date if run_til else '생략'}")
+    if not (run_attendance or run_til):
+        print("😴 수집할 단계가 없습니다.")
+        run_metrics.finish_run()
+        return result
+
+    # 2. 크롬 실행 전 세션 점검 (쿠키 만료면 브라우저 부팅 없이 즉시 중단)
+    if til_config.IS_SERVER:
+        try:
+            with timer.stage("session_check"):
+                SessionManager(til_config.BACKOFFICE_URL).preflight()
+        except Exception as e:
+            print(f"❌ 수집 중단: {e}")
+            result["failed"] = [s for s, ran in (("attendance", run_attendance), ("til", run_til)) if ran]
+            timer.report()
+            run_metrics.finish_run()
+            return result
+
+    profiler = WaitProfiler()
+    if til_config.COLLECTOR == "http":
+        # 3-4. 브라우저 없이 백오피스 API 직접 호출 (COLLECTOR_BACKEND=http)
+        if run_attendance:
+            with timer.stage("attendance_crawl"):
+                result["attendance"] = att.extract_attendance_data(attendance_date)
+        if run_til:
+            with timer.stage("til_crawl"):
+                result["til"] = til.extract_til_data(manual_date=til_date)
+    else:
+        # 3. 브라우저 + 로그인 1회
+        with timer.stage("browser_launch"):
+            driver = til.ChromeManager.launch_chrome(til_config)
+        try:
+            with timer.stage("login"):
+                login_once(driver, til_config, profiler)
+
+            # 4. 수집 (같은 세션에서 순서대로)
+            if run_attendance:
+                with timer.stage("attendance_crawl"):
+                    result["attendance"] = att.extract_attendance_data(attendance_date, driver=driver, profiler=profiler)
+            if run_til:
+                with timer.stage("til_crawl"):
+                    result["til"] = til.extract_til_data(manual_date=til_date, driver=driver, profiler=profiler)
+        except Exception as e:
+            print(f"❌ 수집 중단: {e}")
+        finally:
+            lean_browser.report(driver, "pipeline")
+            if til_config.IS_SERVER:
+                try: driver.quit()
+                except: pass
+
+    # 5. 업로드 (시트 인증 1회 공유)
+    collected = {"attendance": bool(result["attendance"]), "til": not result["til"].empty}
+    saved = set()
+    if any(collected.values()):
+        try:
+            with timer.stage("sheet_auth"):
+                spreadsheet = open_spreadsheet()
+            if collected["attendance"]:
+                with timer.stage("attendance_upload"):
+                    att.AttendanceSheetManager(spreadsheet).save_data(result["attendance"])
+                saved.add("attendance")
+            if collected["til"]:
+                with timer.stage("til_upload"):
+                    til.GoogleSheetManager(spreadsheet).save_data(result["til"])
+                saved.add("til")
+            result["sheet_metrics"] = spreadsheet.metrics.snapshot()
+        except Exception as e:
+            print(f"❌ 시트 저장 실패: {e}")
+
+    # 요청했는데 수집/저장 결과가 없는 단계 -> 실패로 보고 (CLI 종료 코드 -> 워크플로 재실행 가능)
+    requested = {"attendance": run_attendance, "til": run_til}
+    # TIL 부분 수집(실패 학생/누락 페이지)도 실패 -> 재실행 시 체크포인트에서 이어서 수집
+    partial = {"til": result["til"].attrs.get("partial", False)}
+    result["failed"] = [s for s in STAGES if requested[s] and (s not in saved or partial.get(s))]
+    if result["failed"]:
+        print(f"🚨 결과 없는 단계: {', '.join(result['failed'])} (다시 실행 필요)")
+
+    timer.report()
+    profiler.report(til_config.WAIT_PROFILE_PATH, label="pipeline")
+    run_metrics.active().attach("waits", profiler.summary())
+    run_metrics.finish_run(spreadsheet)
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="출석 + TIL 단일 세션 통합 실행")
+    parser.add_argument("--stages", default=",".join(STAGES), help="실행 단계 (쉼표 구분: attendance,til)")
+    parser.add_argument("--attendance-date", default=None, help="출석 수집 날짜 (기본: 오늘 KST)")
+    parser.add_argument("--til-date", default=None, help="TIL 수집 날짜 (기본: 최근 영업일)")
+    args = parser.parse_args()
+
+    print("🔥 [통합 파이프라인] 가동 시작")
+    selected = [s.strip() for s in args.stages.split(",") if s.strip() in STAGES]
+    outcome = run_pipeline(selected, attendance_date=args.attendance_date, til_date=args.til_date)
+    print("🏁 [END] 작업 종료")
+    sys.exit(1 if outcome["failed"] else 0)
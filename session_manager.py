@@ -0,0 +1,168 @@
+# ============================================================
+# [Session Manager] 백오피스 쿠키 만료/세션 상태 사전 점검
+# ============================================================
+# 지금까지는 크롬을 띄우고 쿠키를 넣고 페이지를 다 읽은 뒤에야 로그인 페이지로
+# 튕긴 걸 알았다 (LOGIN_FAILED). 여기서는 크롬 실행 전에
+#   1. BACKOFFICE_COOKIES 의 expiry 를 파싱해서 만료/임박 쿠키를 보고하고
+#   2. 쿠키로 인증이 필요한 JSON API 에 가벼운 요청 1회를 보내 JSON 이 오는지 확인한다.
+#      (SPA 루트는 로그인 여부와 무관하게 HTML 200 이라 판단 근거가 안 됨 -> 판단 불가로 취급)
+# 결과는 쿠키 내용 해시 기준으로 잠깐 캐시 (출석/TIL 이 연달아 돌 때 중복 점검 방지).
+
+import hashlib
+import json
+import os
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime
+from urllib.parse import urljoin
+
+HEALTH_CACHE_PATH = os.environ.get("SESSION_HEALTH_CACHE", "logs/session_health.json")
+HEALTH_CACHE_TTL = 600        # 초. 같은 쿠키로 10분 안에 다시 점검하지 않음
+EXPIRY_WARN_SEC = 24 * 3600   # 만료 24시간 전부터 경고
+LOGIN_MARKERS = ("login", "google.com")
+# 인증이 필요한 JSON 엔드포인트 (기본: TIL 명단 1건, http_collector 의 TIL_ROSTER_API_PATH 와 같은 API)
+SESSION_CHECK_PATH = os.environ.get("SESSION_CHECK_PATH", "/api/til/students?page=1&size=1")
+SELENIUM_DROP_KEYS = ("expiry", "sameSite", "domain")
+
+
+def load_cookies(cookies_json: str = None) -> list:
+    """BACKOFFICE_COOKIES (JSON 배열) -> 쿠키 목록. 없으면 []"""
+    cookies_json = cookies_json if cookies_json is not None else os.environ.get("BACKOFFICE_COOKIES")
+    if not cookies_json:
+        return []
+    cookies = json.loads(cookies_json)
+    return cookies if isinstance(cookies, list) else []
+
+
+def selenium_cookies(cookies: list) -> list:
+    """driver.add_cookie 용 사본 (expiry/sameSite/domain 제거, 원본은 보존)"""
+    return [{k: v for k, v in c.items() if k not in SELENIUM_DROP_KEYS} for c in cookies]
+
+
+def expiry_report(cookies: list, now: float = None) -> dict:
+    """
+    {"expired": [(이름, 만료시각)], "expiring": [(이름, 남은초)], "session": [이름], "earliest": 만료시각|None}
+    expiry 가 없는 쿠키는 브라우저 세션 쿠키로 취급.
+    """
+    now = now if now is not None else time.time()
+    report = {"expired": [], "expiring": [], "session": [], "earliest": None}
+    for c in cookies:
+        name = c.get("name", "?")
+        expiry = c.get("expiry", c.get("expires", c.get("expirationDate")))
+        try:
+            expiry = float(expiry)
+        except (TypeError, ValueError):
+            report["session"].append(name)
+            continue
+        if expiry <= 0:
+            report["session"].append(name)
+            continue
+        if expiry <= now:
+            report["expired"].append((name, datetime.fromtimestamp(expiry).isoformat(timespec="minutes")))
+        elif expiry - now <= EXPIRY_WARN_SEC:
+            report["expiring"].append((name, int(expiry - now)))
+        if report["earliest"] is None or expiry < report["earliest"]:
+            report["earliest"] = expiry
+    return report
+
+
+def cookie_header(cookies: list) -> str:
+    """쿠키 목록 -> HTTP Cookie 헤더 값 (세션 점검 / HTTP 수집기 공용)"""
+    return "; ".join(f"{c['name']}={c['value']}" for c in cookies if "name" in c and "value" in c)
+
+
+def check_session(url: str, cookies: list, timeout: float = 5) -> tuple:
+    """
+    쿠키로 url(인증 필요 JSON API)에 GET 1회 -> (True/False/None, 설명).
+    JSON 200 이면 True, 로그인 페이지로 리디렉션되거나 401/403 이면 False,
+    HTML(앱 셸) 응답 / 네트워크 오류 등 판단 불가면 None.
+    """
+    request = urllib.request.Request(url, headers={"Cookie": cookie_header(cookies), "User-Agent": "Mozilla/5.0",
+                                                   "Accept": "application/json"})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            final_url = response.geturl()
+            if any(marker in final_url for marker in LOGIN_MARKERS):
+                return False, f"로그인 페이지로 리디렉션 ({final_url})"
+            content_type = response.headers.get("Content-Type", "")
+            body = response.read(65536)
+            try:
+                json.loads(body.decode("utf-8"))
+            except ValueError:
+                return None, f"HTTP {response.status} 비 JSON 응답 ({content_type or '?'}, 인증 여부 판단 불가)"
+            return True, f"HTTP {response.status} JSON"
+    except urllib.error.HTTPError as e:
+        if e.code in (401, 403):
+            return False, f"HTTP {e.code}"
+        return None, f"HTTP {e.code}"
+    except Exception as e:
+        return None, f"점검 실패: {e}"
+
+
+def _load_cache() -> dict:
+    try:
+        with open(HEALTH_CACHE_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def _save_cache(cache: dict):
+    try:
+        os.makedirs(os.path.dirname(HEALTH_CACHE_PATH) or ".", exist_ok=True)
+        with open(HEALTH_CACHE_PATH, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+    except Exception as e:
+        print(f"   ⚠️ 세션 점검 캐시 저장 실패: {e}")
+
+
+class SessionManager:
+    """크롬 실행 전 쿠키/세션 점검 (실패 시 LOGIN_FAILED 로 즉시 중단)"""
+
+    def __init__(self, base_url: str, cookies_json: str = None):
+        # SESSION_CHECK_URL (전체 URL) > BACKOFFICE_URL + SESSION_CHECK_PATH
+        self.check_url = os.environ.get("SESSION_CHECK_URL") or urljoin(base_url or "", SESSION_CHECK_PATH)
+        self.cookies = load_cookies(cookies_json)
+
+    @property
+    def fingerprint(self) -> str:
+        return hashlib.sha1(json.dumps(self.cookies, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def preflight(self) -> bool:
+        """
+        True = 세션 유효(또는 판단 불가 -> 브라우저에서 확인), 쿠키가 없으면 False.
+        만료가 확실하면 Exception("LOGIN_FAILED: ...") 로 크롬을 띄우기 전에 중단.
+        """
+        started = time.perf_counter()
+        if not self.cookies:
+            print("   ⚠️ BACKOFFICE_COOKIES 없음 -> 세션 점검 생략")
+            return False
+
+        report = expiry_report(self.cookies)
+        for name, remain in report["expiring"]:
+            print(f"   ⏳ 쿠키 '{name}' 만료 임박 ({remain // 3600}시간 {remain % 3600 // 60}분 남음)")
+        timed = len(self.cookies) - len(report["session"])
+        if timed and len(report["expired"]) == timed:
+            expired = ", ".join(f"{n}({at})" for n, at in report["expired"])
+            raise Exception(f"LOGIN_FAILED: 모든 쿠키 만료 -> {expired}. BACKOFFICE_COOKIES 를 갱신하세요.")
+        for name, at in report["expired"]:
+            print(f"   ⚠️ 쿠키 '{name}' 만료됨 ({at})")
+
+        cache = _load_cache()
+        cached = cache.get(self.fingerprint)
+        if cached and time.time() - cached["checked_at"] < HEALTH_CACHE_TTL:
+            print(f"   🩺 세션 점검 캐시 사용 ({cached['detail']})")
+            return True
+
+        ok, detail = check_session(self.check_url, self.cookies)
+        elapsed = time.perf_counter() - started
+        if ok is False:
+            cache.pop(self.fingerprint, None)
+            _save_cache(cache)
+            raise Exception(f"LOGIN_FAILED: 세션 만료 ({detail}). BACKOFFICE_COOKIES 를 갱신하세요.")
+        if ok:
+            cache[self.fingerprint] = {"checked_at": time.time(), "detail": detail}
+            _save_cache(cache)
+        print(f"   🩺 세션 점검: {detail if ok else detail + ' -> 브라우저에서 확인'} ({elapsed:.1f}s)")
+        return True
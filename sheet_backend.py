@@ -0,0 +1,287 @@
+# ============================================================
+# [Sheet Backend] 구글 시트 백엔드 교체 (gspread / 로컬 SQLite) + 호출/셀 집계
+# ============================================================
+# 업로더/대시보드는 gspread Spreadsheet/Worksheet 의 일부 메서드만 쓴다.
+# 같은 인터페이스를 로컬 파일(SQLite)로 구현해서 네트워크 없이 전체 파이프라인을
+# 돌릴 수 있게 하고, 두 백엔드 모두 API 호출 수 / 읽고 쓴 셀 수를 센다.
+#
+#   SHEET_BACKEND=gspread (기본)  qaqc-pipeline.json + TIL_SHEET_URL
+#   SHEET_BACKEND=local           LOCAL_SHEETS_PATH (기본 data/local_sheets.sqlite)
+
+import json
+import os
+import sqlite3
+import threading
+from collections import Counter
+
+import gspread
+from gspread.utils import a1_to_rowcol
+
+JSON_FILE = "qaqc-pipeline.json"
+SCOPE = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
+LOCAL_PATH = os.environ.get("LOCAL_SHEETS_PATH", "data/local_sheets.sqlite")
+
+READ_METHODS = ("row_values", "col_values", "batch_get", "get_all_values", "get_all_records")
+WRITE_METHODS = ("update", "batch_update", "append_rows", "insert_rows", "delete_rows")
+
+
+class SheetMetrics:
+    """백엔드 공용 집계: calls[메서드], cells['read'/'written']"""
+
+    def __init__(self):
+        self.calls = Counter()
+        self.cells = Counter()
+
+    def record(self, method: str, read: int = 0, written: int = 0):
+        self.calls[method] += 1
+        self.cells["read"] += read
+        self.cells["written"] += written
+
+    def snapshot(self) -> dict:
+        return {"calls": dict(self.calls), "cells": dict(self.cells)}
+
+    def reset(self):
+        self.calls.clear()
+        self.cells.clear()
+
+    def report(self, label: str = "시트"):
+        calls = sum(self.calls.values())
+        detail = ", ".join(f"{k} {v}" for k, v in sorted(self.calls.items()))
+        print(f"   📊 [{label}] API 호출 {calls}회 ({detail or '-'}) / "
+              f"셀 읽기 {self.cells['read']} · 쓰기 {self.cells['written']}")
+
+
+def _count_cells(value) -> int:
+    """반환값/입력값의 셀 수 (리스트 중첩, 레코드 dict 모두 지원)"""
+    if isinstance(value, dict):
+        if "values" in value:
+            return _count_cells(value["values"])
+        return len(value)
+    if isinstance(value, (list, tuple)):
+        return sum(_count_cells(v) if isinstance(v, (list, tuple, dict)) else 1 for v in value)
+    return 0
+
+
+# ============================================================
+# 1. gspread (집계 프록시)
+# ============================================================
+class CountingWorksheet:
+    """gspread Worksheet 프록시 (읽기/쓰기 메서드 호출과 셀 수 기록)"""
+
+    def __init__(self, worksheet, spreadsheet: "CountingSpreadsheet"):
+        self._ws = worksheet
+        self.spreadsheet = spreadsheet
+        self.metrics = spreadsheet.metrics
+
+    def __getattr__(self, name):
+        attr = getattr(self._ws, name)
+        if name in READ_METHODS:
+            def read(*args, **kwargs):
+                result = attr(*args, **kwargs)
+                self.metrics.record(name, read=_count_cells(result))
+                return result
+            return read
+        if name in WRITE_METHODS:
+            def write(*args, **kwargs):
+                values = args[0] if args else kwargs.get("values", kwargs.get("data"))
+                self.metrics.record(name, written=0 if name == "delete_rows" else _count_cells(values))
+                return attr(*args, **kwargs)
+            return write
+        return attr
+
+
+class CountingSpreadsheet:
+    """gspread Spreadsheet 프록시 (워크시트를 CountingWorksheet 로 감쌈)"""
+
+    def __init__(self, spreadsheet, metrics: SheetMetrics = None):
+        self._ss = spreadsheet
+        self.metrics = metrics or SheetMetrics()
+
+    @property
+    def sheet1(self):
+        return CountingWorksheet(self._ss.sheet1, self)
+
+    def worksheet(self, title: str):
+        return CountingWorksheet(self._ss.worksheet(title), self)
+
+    def add_worksheet(self, title: str, rows: int = 1000, cols: int = 26):
+        return CountingWorksheet(self._ss.add_worksheet(title=title, rows=rows, cols=cols), self)
+
+    def __getattr__(self, name):
+        return getattr(self._ss, name)
+
+
+# ============================================================
+# 2. 로컬 SQLite (gspread 동작 흉내)
+# ============================================================
+class LocalWorksheet:
+    """행 목록을 메모리에 두고 변경 시 SQLite 에 시트 단위로 기록"""
+
+    def __init__(self, title: str, spreadsheet: "LocalSpreadsheet", rows: list = None):
+        self.title = title
+        self.spreadsheet = spreadsheet
+        self.metrics = spreadsheet.metrics
+        self.rows = rows or []
+
+    def _flush(self):
+        self.spreadsheet._save(self.title, self.rows)
+
+    def _write(self, row: int, col: int, values: list):
+        for i, values_row in enumerate(values):
+            while len(self.rows) < row + i:
+                self.rows.append([])
+            target = self.rows[row + i - 1]
+            for j, value in enumerate(values_row):
+                while len(target) < col + j:
+                    target.append("")
+                target[col + j - 1] = value
+
+    def _range(self, a1: str) -> tuple:
+        start, _, end = a1.partition(":")
+        row, col = a1_to_rowcol(start)
+        if end and end.isalpha():  # 'C' 처럼 끝 행이 없는 열 범위
+            return row, col, len(self.rows), a1_to_rowcol(f"{end}1")[1]
+        end_row, end_col = a1_to_rowcol(end) if end else (row, col)
+        return row, col, end_row, end_col
+
+    # ---------------- 읽기 (gspread 처럼 뒤쪽 빈 셀/빈 행은 잘라서 반환) ----------------
+
+    def row_values(self, row: int) -> list:
+        values = list(self.rows[row - 1]) if len(self.rows) >= row else []
+        while values and values[-1] == "":
+            values.pop()
+        self.metrics.record("row_values", read=len(values))
+        return values
+
+    def col_values(self, col: int) -> list:
+        values = [r[col - 1] if len(r) >= col else "" for r in self.rows]
+        while values and values[-1] == "":
+            values.pop()
+        self.metrics.record("col_values", read=len(values))
+        return values
+
+    def batch_get(self, ranges: list) -> list:
+        out = []
+        for a1 in ranges:
+            row, col, end_row, end_col = self._range(a1)
+            block = []
+            for values in self.rows[row - 1:end_row]:
+                cells = list(values[col - 1:end_col])
+                while cells and cells[-1] == "":
+                    cells.pop()
+                block.append(cells)
+            while block and not block[-1]:
+                block.pop()
+            out.append(block)
+        self.metrics.record("batch_get", read=_count_cells(out))
+        return out
+
+    def get_all_values(self) -> list:
+        self.metrics.record("get_all_values", read=_count_cells(self.rows))
+        return [list(r) for r in self.rows]
+
+    def get_all_records(self) -> list:
+        self.metrics.record("get_all_records", read=_count_cells(self.rows))
+        if not self.rows:
+            return []
+        header = self.rows[0]
+        return [dict(zip(header, r + [""] * (len(header) - len(r)))) for r in self.rows[1:]]
+
+    # ---------------- 쓰기 ----------------
+
+    def update(self, values: list, range_name: str = "A1", **kwargs):
+        row, col = a1_to_rowcol(range_name.split(":")[0])
+        self._write(row, col, values)
+        self._flush()
+        self.metrics.record("update", written=_count_cells(values))
+
+    def batch_update(self, data: list, **kwargs):
+        for item in data:
+            row, col = a1_to_rowcol(item["range"].split(":")[0])
+            self._write(row, col, item["values"])
+        self._flush()
+        self.metrics.record("batch_update", written=_count_cells(data))
+
+    def append_rows(self, values: list, table_range: str = None, **kwargs):
+        self.rows.extend([list(v) for v in values])
+        self._flush()
+        self.metrics.record("append_rows", written=_count_cells(values))
+
+    def insert_rows(self, values: list, row: int = 1, **kwargs):
+        self.rows[row - 1:row - 1] = [list(v) for v in values]
+        self._flush()
+        self.metrics.record("insert_rows", written=_count_cells(values))
+
+    def delete_rows(self, start_index: int, end_index: int = None):
+        del self.rows[start_index - 1:(end_index or start_index)]
+        self._flush()
+        self.metrics.record("delete_rows")
+
+
+class LocalSpreadsheet:
+    """로컬 SQLite 파일 하나 = 스프레드시트 하나 (path=':memory:' 면 저장 안 함)"""
+
+    def __init__(self, path: str = LOCAL_PATH, metrics: SheetMetrics = None):
+        self.path = path
+        self.metrics = metrics or SheetMetrics()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)  # 대시보드 스레드에서도 사용
+        self.conn.execute("CREATE TABLE IF NOT EXISTS sheets (title TEXT PRIMARY KEY, pos INTEGER, rows TEXT)")
+        self.conn.commit()
+        self.sheets = {
+            title: LocalWorksheet(title, self, json.loads(rows))
+            for title, rows in self.conn.execute("SELECT title, rows FROM sheets ORDER BY pos")
+        }
+        if not self.sheets:
+            self.add_worksheet("sheet1")
+
+    def _save(self, title: str, rows: list):
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO sheets (title, pos, rows) VALUES (?, ?, ?)",
+                (title, list(self.sheets).index(title), json.dumps(rows, ensure_ascii=False)),
+            )
+
+    @property
+    def sheet1(self) -> LocalWorksheet:
+        return next(iter(self.sheets.values()))
+
+    def worksheet(self, title: str) -> LocalWorksheet:
+        if title not in self.sheets:
+            raise gspread.exceptions.WorksheetNotFound(title)
+        return self.sheets[title]
+
+    def add_worksheet(self, title: str, rows: int = 1000, cols: int = 26) -> LocalWorksheet:
+        self.sheets[title] = LocalWorksheet(title, self)
+        self._save(title, [])
+        return self.sheets[title]
+
+    def worksheets(self) -> list:
+        return list(self.sheets.values())
+
+
+# ============================================================
+# 3. 선택
+# ============================================================
+def backend_name() -> str:
+    return os.environ.get("SHEET_BACKEND", "gspread").lower()
+
+
+def open_spreadsheet(backend: str = None, sheet_url: str = None, metrics: SheetMetrics = None):
+    """설정된 백엔드의 Spreadsheet (gspread 면 인증 1회). 둘 다 .metrics 로 집계 확인."""
+    backend = (backend or backend_name()).lower()
+    if backend == "local":
+        print(f"🗂️ [로컬 시트 백엔드] {LOCAL_PATH}")
+        return LocalSpreadsheet(LOCAL_PATH, metrics)
+    if backend != "gspread":
+        raise ValueError(f"❌ 알 수 없는 SHEET_BACKEND: {backend}")
+
+    from oauth2client.service_account import ServiceAccountCredentials
+    sheet_url = sheet_url or os.environ.get("TIL_SHEET_URL")
+    if not sheet_url:
+        raise ValueError("❌ 'TIL_SHEET_URL' 없음")
+    creds = ServiceAccountCredentials.from_json_keyfile_name(JSON_FILE, SCOPE)
+    client = gspread.authorize(creds)
+    return CountingSpreadsheet(client.open_by_url(sheet_url), metrics)
@@ -0,0 +1,161 @@
+# ============================================================
+# [Sheet Writer] 날짜 단위 증분 업서트 (시트 전체 재작성 X)
+# ============================================================
+# 기존 save_data 는 get_all_records() -> clear() -> update(전체) 구조라
+# 히스토리가 쌓일수록 느려지고, clear~update 사이에는 시트가 비어 있었음.
+# 여기서는 헤더 + 키 컬럼(날짜/이름)만 읽어서 (날짜, 이름) -> 행 번호
+# 인덱스를 만들고, 해당 날짜의 행만 한 번의 batch_update 로 덮어쓴다.
+# 신규 인원은 해당 날짜 블록 바로 아래, 신규 날짜는 더 오래된 날짜 블록 위에
+# insert_rows 로 끼워 넣어 기존 시트의 날짜 내림차순(최신이 2행)을 유지한다.
+# 명단에서 빠진 인원은 행 삭제.
+
+from gspread.utils import rowcol_to_a1
+
+KEY_COLUMNS = ("날짜", "이름")
+
+
+def col_letter(col: int) -> str:
+    """1 -> 'A', 27 -> 'AA'"""
+    return rowcol_to_a1(1, col)[:-1]
+
+
+def group_runs(row_numbers):
+    """[2,3,4,7,8] -> [(2,4), (7,8)] (연속 구간 묶기)"""
+    runs = []
+    for r in sorted(row_numbers):
+        if runs and r == runs[-1][1] + 1:
+            runs[-1][1] = r
+        else:
+            runs.append([r, r])
+    return [tuple(run) for run in runs]
+
+
+class IncrementalSheetWriter:
+    """(날짜, 이름) -> 행 번호 인덱스를 이용한 날짜 블록 단위 업서트"""
+
+    def __init__(self, worksheet, fill_value="", key_columns=KEY_COLUMNS):
+        """key_columns: (날짜 컬럼, 행 식별 컬럼). 요약 시트처럼 이름이 아닌 키도 가능"""
+        self.worksheet = worksheet
+        self.fill_value = fill_value
+        self.key_columns = tuple(key_columns)
+
+    def _cell(self, value):
+        if value is None:
+            return self.fill_value
+        if hasattr(value, "item"):  # numpy 스칼라 -> 파이썬 기본형
+            value = value.item()
+        if isinstance(value, float) and value != value:  # NaN
+            return self.fill_value
+        return value
+
+    def existing_dates(self) -> set:
+        """시트에 이미 기록된 날짜 집합 (백필 대상 계산용)"""
+        _, index = self.load_index()
+        return {date for date, _ in index if date}
+
+    def load_index(self):
+        """헤더 + 키 컬럼 2개만 읽어서 (날짜, 이름) -> 행 번호 인덱스 구성"""
+        header = self.worksheet.row_values(1)
+        if not header:
+            return [], {}
+        missing = [k for k in self.key_columns if k not in header]
+        if missing:
+            raise ValueError(f"❌ 시트 헤더에 키 컬럼 없음: {missing}")
+
+        ranges = [
+            f"{col_letter(header.index(k) + 1)}2:{col_letter(header.index(k) + 1)}"
+            for k in self.key_columns
+        ]
+        date_col, name_col = self.worksheet.batch_get(ranges)
+
+        index = {}
+        for offset in range(max(len(date_col), len(name_col))):
+            date = date_col[offset][0] if offset < len(date_col) and date_col[offset] else ""
+            name = name_col[offset][0] if offset < len(name_col) and name_col[offset] else ""
+            if date or name:
+                index[(str(date), str(name))] = offset + 2  # 1행은 헤더
+        return header, index
+
+    @staticmethod
+    def _insert_row(date: str, index: dict) -> int:
+        """신규 행이 들어갈 위치 (시트는 날짜 내림차순 전제)
+        - 이미 있는 날짜: 그 날짜 블록의 마지막 행 바로 아래
+        - 새 날짜: 더 오래된 날짜 중 가장 위 행 (없으면 시트 맨 아래)"""
+        same = [row for (d, _), row in index.items() if d == date]
+        if same:
+            return max(same) + 1
+        older = [row for (d, _), row in index.items() if d < date]
+        return min(older) if older else max(index.values(), default=1) + 1
+
+    def upsert_date(self, target_date: str, records: list) -> dict:
+        """target_date 블록만 교체. 반환값은 갱신/추가/삭제 행 수."""
+        target_date = str(target_date)
+        return self.upsert_records([{**r, self.key_columns[0]: target_date} for r in records])
+
+    def upsert_records(self, records: list) -> dict:
+        """여러 날짜가 섞인 롱포맷 레코드를 날짜 블록별로 교체 (API 호출은 날짜 수와 무관)
+        신규 행은 맨 아래 append 가 아니라 날짜 내림차순 위치에 삽입 (최신 날짜가 2행)"""
+        stats = {"updated": 0, "appended": 0, "deleted": 0}
+        if not records:
+            return stats
+
+        header, index = self.load_index()
+        columns = list(records[0].keys())
+
+        # 1. 빈 시트 -> 헤더 포함 최초 기록
+        if not header:
+            ordered = sorted(records, key=lambda r: str(r.get(self.key_columns[0], "")), reverse=True)
+            rows = [[self._cell(r.get(c)) for c in columns] for r in ordered]
+            self.worksheet.update([columns] + rows)
+            stats["appended"] = len(rows)
+            print(f"   ➕ 빈 시트 -> 헤더 포함 {len(rows)}행 최초 기록")
+            return stats
+
+        # 2. 신규 컬럼이 있으면 헤더 확장
+        new_cols = [c for c in columns if c not in header]
+        if new_cols:
+            header = header + new_cols
+            self.worksheet.update([header], "A1")
+
+        last_col = col_letter(len(header))
+        target_dates = {str(r.get(self.key_columns[0], "")) for r in records}
+        existing = {key: row for key, row in index.items() if key[0] in target_dates}
+
+        updates, inserts, seen = {}, {}, set()
+        for record in records:
+            key = tuple(str(record.get(k, "")) for k in self.key_columns)
+            values = [self._cell(record.get(c)) for c in header]
+            values[header.index(self.key_columns[0])] = key[0]
+            if key in existing and key not in seen:
+                updates[existing[key]] = values
+            else:
+                inserts.setdefault(self._insert_row(key[0], index), []).append((key[0], values))
+            seen.add(key)
+        stale = [row for key, row in existing.items() if key not in seen]
+
+        # 3. 기존 행 덮어쓰기: 연속 구간끼리 묶어서 단일 batch_update 호출
+        if updates:
+            payload = [
+                {"range": f"A{start}:{last_col}{end}",
+                 "values": [updates[r] for r in range(start, end + 1)]}
+                for start, end in group_runs(updates)
+            ]
+            self.worksheet.batch_update(payload)
+            stats["updated"] = len(updates)
+
+        # 4. 신규 행 삽입 + 명단에서 빠진 행 삭제
+        #    아래쪽 위치부터 처리해야 위쪽 행 번호가 안 밀림 (같은 위치면 삭제 먼저)
+        ops = [(start, 1, end) for start, end in group_runs(stale)]
+        ops += [(row, 0, rows) for row, rows in inserts.items()]
+        for row, is_delete, arg in sorted(ops, reverse=True):
+            if is_delete:
+                self.worksheet.delete_rows(row, arg)
+            else:
+                # 같은 위치에 들어가는 여러 날짜도 최신 날짜가 위로 (같은 날짜 안에서는 입력 순서)
+                block = [values for _, values in sorted(arg, key=lambda item: item[0], reverse=True)]
+                self.worksheet.insert_rows(block, row=row)
+        stats["appended"] = sum(len(rows) for rows in inserts.values())
+        stats["deleted"] = len(stale)
+
+        print(f"   ✏️ 갱신 {stats['updated']}행 / ➕ 추가 {stats['appended']}행 / 🗑️ 삭제 {stats['deleted']}행")
+        return stats
@@ -0,0 +1,89 @@
+# ============================================================
+# [Snapshot Store] 원본 표 스냅샷 (내용 주소 저장소) + 재처리용 조회
+# ============================================================
+# 크롤러가 읽은 표 원본(행/셀 텍스트 JSON)을 실행마다 gzip 으로 남긴다.
+# 파서 버그 수정이나 채점 규칙 변경 시 다음 스케줄 크롤링을 기다리지 않고
+# 디스크의 스냅샷을 같은 파서에 다시 흘려보내면 된다 (replay.py). 회귀 픽스처로도 사용.
+#
+#   data/snapshots/objects/ab/abcdef....json.gz   내용 해시 = 파일 이름 (같은 내용은 1번만 저장)
+#   data/snapshots/runs/<run_id>.jsonl            실행별 목록 (종류, 메타, 해시)
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+
+DEFAULT_DIR = os.environ.get("SNAPSHOT_DIR", "data/snapshots")
+
+
+class SnapshotStore:
+    """실행(run) 단위 스냅샷 기록/조회"""
+
+    def __init__(self, root: str = DEFAULT_DIR, run_id: str = None):
+        self.root = root
+        self.run_id = run_id or datetime.now().strftime("%Y%m%d-%H%M%S")
+        self.saved = 0
+        self._lock = threading.Lock()  # 병렬 TIL 워커가 같은 실행 목록에 기록
+
+    def _object_path(self, sha: str) -> str:
+        return os.path.join(self.root, "objects", sha[:2], f"{sha}.json.gz")
+
+    def _manifest_path(self, run_id: str) -> str:
+        return os.path.join(self.root, "runs", f"{run_id}.jsonl")
+
+    # ---------------- 쓰기 ----------------
+
+    def put(self, kind: str, payload, **meta) -> str:
+        """payload(JSON 직렬화 가능) 저장 -> 내용 해시. 실패해도 수집은 계속 (None 반환)."""
+        try:
+            raw = json.dumps(payload, ensure_ascii=False, sort_keys=True).encode("utf-8")
+            sha = hashlib.sha256(raw).hexdigest()
+            path = self._object_path(sha)
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with gzip.open(path, "wb") as f:
+                    f.write(raw)
+            entry = {"kind": kind, "sha": sha, "captured_at": datetime.now().isoformat(timespec="seconds"), **meta}
+            manifest = self._manifest_path(self.run_id)
+            os.makedirs(os.path.dirname(manifest), exist_ok=True)
+            with self._lock:
+                with open(manifest, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                self.saved += 1
+            return sha
+        except Exception as e:
+            print(f"   ⚠️ 스냅샷 저장 실패 ({kind}): {e}")
+            return None
+
+    # ---------------- 읽기 ----------------
+
+    def get(self, sha: str):
+        with gzip.open(self._object_path(sha), "rb") as f:
+            return json.loads(f.read().decode("utf-8"))
+
+    def runs(self) -> list:
+        """실행 id 목록 (오래된 순)"""
+        folder = os.path.join(self.root, "runs")
+        if not os.path.isdir(folder):
+            return []
+        return sorted(name[:-len(".jsonl")] for name in os.listdir(folder) if name.endswith(".jsonl"))
+
+    def latest_run(self, kind: str):
+        """kind 스냅샷이 있는 가장 최근 실행 id (없으면 None)"""
+        for run_id in reversed(self.runs()):
+            if self.entries(run_id, kind):
+                return run_id
+        return None
+
+    def entries(self, run_id: str, kind: str = None) -> list:
+        """실행의 스냅샷 목록 (kind 로 필터)"""
+        with open(self._manifest_path(run_id), encoding="utf-8") as f:
+            entries = [json.loads(line) for line in f if line.strip()]
+        return [e for e in entries if kind is None or e["kind"] == kind]
+
+    def iter_payloads(self, run_id: str, kind: str = None):
+        """(메타, payload) 순회"""
+        for entry in self.entries(run_id, kind):
+            yield entry, self.get(entry["sha"])
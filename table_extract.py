@@ -0,0 +1,50 @@
+# ============================================================
+# [Table Extract] 표 한 페이지를 execute_script 1회로 읽기
+# ============================================================
+# 행마다 find_elements / .text 를 부르면 WebDriver 왕복이 (행 x 셀) 번 생긴다.
+# 여기서는 브라우저 안에서 모든 행의 셀 텍스트(+ 버튼 라벨)를 JSON 으로 모아
+# 한 번에 돌려받고, 파싱은 파이썬 메모리에서 한다. 버튼 클릭도 (행 번호, 라벨)로 1회 호출.
+
+# arguments[0] = 행 CSS 선택자, arguments[1] = 검색 루트 요소 (없으면 document)
+ROWS_JS = """
+return Array.from((arguments[1] || document).querySelectorAll(arguments[0])).map(function (row) {
+    var cells = row.querySelectorAll('td');
+    if (!cells.length) { cells = row.children; }
+    return {
+        text: (row.innerText || '').trim(),
+        cells: Array.from(cells).map(function (c) { return (c.innerText || '').trim(); }),
+        buttons: Array.from(row.querySelectorAll('button')).map(function (b) { return (b.innerText || '').trim(); })
+    };
+});
+"""
+
+# arguments[0] = 행 CSS 선택자, arguments[1] = 행 번호, arguments[2] = 버튼 라벨(포함)
+CLICK_JS = """
+var row = document.querySelectorAll(arguments[0])[arguments[1]];
+var label = arguments[2];
+if (!row) { return false; }
+var btn = Array.from(row.querySelectorAll('button')).find(function (b) {
+    return (b.innerText || '').indexOf(label) !== -1;
+});
+if (!btn) { return false; }
+btn.click();
+return true;
+"""
+
+
+def extract_rows(driver, row_css: str, root=None) -> list:
+    """
+    [{"text": 행 전체 텍스트, "cells": [셀 텍스트...], "buttons": [버튼 라벨...]}] (왕복 1회)
+    root(WebElement)를 주면 그 요소 안의 행만 (예: 지금 열린 모달).
+    """
+    return driver.execute_script(ROWS_JS, row_css, root) or []
+
+
+def row_lines(row: dict) -> list:
+    """행 텍스트를 줄 단위로 (WebElement.text.split('\\n') 와 같은 모양, 빈 줄 제외)"""
+    return [line.strip() for line in row["text"].split("\n") if line.strip()]
+
+
+def click_row_button(driver, row_css: str, index: int, label: str) -> bool:
+    """index 번째 행에서 label 을 포함한 버튼 클릭 (왕복 1회). 없으면 False."""
+    return bool(driver.execute_script(CLICK_JS, row_css, index, label))
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# 저장소 루트의 평평한 모듈(network_capture, http_collector ...)을 바로 import
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
@@ -0,0 +1,62 @@
+# 브라우저 없는 HTTP 수집기를 로컬 백오피스 스텁(BackofficeServer)에 대고 확인
+import pytest
+
+pytest.importorskip("aiohttp")
+
+import daily_attendance as att
+import http_collector
+from attendance_scoring import ScoringRules
+from synthetic import BackofficeServer, SyntheticCohort
+
+
+@pytest.fixture(scope="module")
+def cohort():
+    return SyntheticCohort(120, days=5)
+
+
+@pytest.fixture
+def server(cohort):
+    with BackofficeServer(cohort) as server:
+        yield server
+
+
+def config_for(server, **overrides):
+    class HttpConfig(att.Config):
+        BACKOFFICE_URL = server.url
+        HTTP_CONCURRENCY = 4
+    for key, value in overrides.items():
+        setattr(HttpConfig, key, value)
+    return HttpConfig()
+
+
+def test_attendance_matches_browser_parser(cohort, server):
+    records = http_collector.collect_attendance(config_for(server), cohort.target_date)
+    expected = att.parse_attendance_rows(cohort.attendance_rows(), cohort.target_date,
+                                         ScoringRules.from_config(att.Config()))
+    assert records == expected
+
+
+def test_til_matches_synthetic_history(cohort, server):
+    dates = cohort.dates[-2:]
+    records = http_collector.collect_til(config_for(server), dates)
+    assert records == [{"이름": n, "날짜": d, "제출여부": cohort.submissions[n][d]}
+                       for n in cohort.names for d in dates]
+
+
+def test_til_skips_known_students(cohort, server):
+    target = cohort.target_date
+    known = {n: {target: 1} for n in cohort.names[:30]}
+    before = server.requests
+    records = http_collector.collect_til(config_for(server), target, known)
+    by_name = {r["이름"]: r["제출여부"] for r in records}
+    assert len(records) == len(cohort.names)
+    assert all(by_name[n] == 1 for n in known)
+    assert all(by_name[n] == cohort.submissions[n][target] for n in cohort.names[30:])
+    history_calls = server.requests - before - 2  # 명단 2페이지 (100 + 20)
+    assert history_calls == len(cohort.names) - len(known)
+
+
+def test_other_cohort_gets_nothing(cohort, server):
+    config = config_for(server, COURSE_NAME="QA 3기")
+    assert http_collector.collect_attendance(config, cohort.target_date) == []
+    assert http_collector.collect_til(config, cohort.target_date) == []
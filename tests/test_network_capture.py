@@ -0,0 +1,71 @@
+# 녹화해 둔 백오피스 응답(fixtures/network)으로 캡처 파서 확인
+import json
+import os
+
+import pytest
+
+from network_capture import build_history, normalize_status, parse_submission_records
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "network")
+
+
+def load(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.mark.parametrize("value, expected", [
+    (True, 1), (False, 0), (1, 1), (0, 0), (2.0, 1), (-1, 0),
+    ("제출", 1), ("제출 완료", 1), ("미제출", 0), ("완료", 1),
+    ("SUBMITTED", 1), ("submitted", 1), ("NOT_SUBMITTED", 0), ("UNSUBMITTED", 0),
+    ("Y", 1), ("N", 0), ("true", 1), ("FALSE", 0), ("", 0), (" ", 0), ("보류", 0),
+])
+def test_normalize_status(value, expected):
+    assert normalize_status(value) == expected
+
+
+def test_flat_list():
+    records = parse_submission_records(load("til_flat_list.json"))
+    assert records == [
+        {"이름": "김민수", "날짜": "2025-11-26", "제출여부": 1},
+        {"이름": "김민수", "날짜": "2025-11-27", "제출여부": 0},
+        {"이름": "이서연", "날짜": "2025-11-26", "제출여부": 1},
+        {"이름": "이서연", "날짜": "2025-11-27", "제출여부": 1},
+    ]
+
+
+def test_nested_page_inherits_name_and_trims_datetime():
+    records = parse_submission_records(load("til_nested_page.json"))
+    assert {"이름": "박지훈", "날짜": "2025-11-27", "제출여부": 1} in records
+    assert {"이름": "박지훈", "날짜": "2025-11-26", "제출여부": 0} in records
+    assert {r["이름"] for r in records} == {"박지훈", "최유진"}
+    assert all(len(r["날짜"]) == 10 for r in records)
+
+
+def test_modal_history_uses_given_name():
+    records = parse_submission_records(load("til_modal_history.json"), "김민수")
+    assert build_history(records) == {"김민수": {"2025-11-27": 1, "2025-11-26": 0, "2025-11-25": 1}}
+
+
+def test_roster_latest_korean_keys():
+    history = build_history(parse_submission_records(load("til_roster_latest.json")))
+    assert history == {"김민수": {"2025-11-27": 1}, "이서연": {"2025-11-27": 0}}
+
+
+def test_build_history_prefers_submitted_on_duplicates():
+    history = build_history(parse_submission_records(load("til_nested_page.json")))
+    assert history["최유진"] == {"2025-11-27": 1}
+    assert history["박지훈"] == {"2025-11-27": 1, "2025-11-26": 0}
+
+
+def test_build_history_partial_capture_lacks_other_dates():
+    # 목록 응답은 학생당 날짜 1개만 담을 수 있음 -> 나머지 대상 날짜는 캡처에 없어야 함 (모달로 확인)
+    history = build_history(parse_submission_records(load("til_roster_latest.json")))
+    wanted = {"2025-11-26", "2025-11-27"}
+    assert not wanted <= history["김민수"].keys()
+
+
+def test_ignores_payloads_without_records():
+    assert parse_submission_records({"success": True, "data": {"content": []}}) == []
+    assert parse_submission_records({"name": "김민수", "date": "2025-11-27"}) == []
+    assert parse_submission_records([1, "x", None]) == []
@@ -0,0 +1,49 @@
+# 스냅샷 재처리가 라이브 scan_page 와 같은 학생별 판단을 하는지 확인
+import pytest
+
+pytest.importorskip("selenium")
+
+from replay import replay_til
+from snapshot_store import SnapshotStore
+
+DATE = "2025-12-01"
+
+
+def page_rows(*names):
+    return [{"text": n, "cells": [n, "QA 4기"], "buttons": ["제출 내역 보기"]} for n in names]
+
+
+def modal_rows(*pairs):
+    return [{"text": f"{d}\n{s}", "cells": [d, s], "buttons": []} for d, s in pairs]
+
+
+@pytest.fixture
+def snapshots(tmp_path):
+    return SnapshotStore(root=str(tmp_path), run_id="run1")
+
+
+def test_legacy_snapshots_require_full_capture_and_report_missing(snapshots):
+    snapshots.put("til_page", page_rows("A", "B", "C"), dates=[DATE])
+    snapshots.put("til_captured", {"C": {"2025-11-28": 1}})  # 대상 날짜 없는 캡처
+    snapshots.put("til_modal", modal_rows((DATE, "제출")), name="B")
+
+    missing = []
+    records = replay_til(snapshots, "run1", missing)
+    assert records == [{"이름": "B", "날짜": DATE, "제출여부": 1}]
+    assert missing == ["A", "C"]
+
+
+def test_decisions_follow_live_source(snapshots):
+    snapshots.put("til_page", page_rows("A", "B", "C", "D"), dates=[DATE])
+    snapshots.put("til_modal", modal_rows((DATE, "미제출")), name="B")
+    snapshots.put("til_decisions", {
+        "A": {"source": "known", "history": {DATE: 1}},
+        "B": {"source": "modal", "history": {DATE: 1}},  # 모달은 스냅샷을 다시 파싱 (파서 수정 반영)
+        "C": {"source": "captured", "history": {DATE: 1}},
+        "D": {"source": "failed", "history": {}},
+    }, dates=[DATE], page=1)
+
+    missing = []
+    records = replay_til(snapshots, "run1", missing)
+    assert {r["이름"]: r["제출여부"] for r in records} == {"A": 1, "B": 0, "C": 1}
+    assert missing == ["D"]
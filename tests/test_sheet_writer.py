@@ -0,0 +1,46 @@
+# 증분 업서트가 시트의 날짜 내림차순(최신이 2행)을 유지하는지 확인
+import pytest
+
+pytest.importorskip("gspread")
+
+from sheet_backend import LocalSpreadsheet
+from sheet_writer import IncrementalSheetWriter
+
+
+def rec(date, name, value="O"):
+    return {"날짜": date, "이름": name, "제출여부": value}
+
+
+@pytest.fixture
+def sheet():
+    ws = LocalSpreadsheet(":memory:").sheet1
+    IncrementalSheetWriter(ws).upsert_records(
+        [rec("2025-12-01", "A"), rec("2025-12-03", "A"), rec("2025-12-03", "B")]
+    )
+    return ws
+
+
+def keys(ws):
+    return [tuple(r[:2]) for r in ws.get_all_values()[1:]]
+
+
+def test_first_write_is_newest_first(sheet):
+    assert keys(sheet) == [("2025-12-03", "A"), ("2025-12-03", "B"), ("2025-12-01", "A")]
+
+
+def test_new_dates_are_inserted_in_date_order(sheet):
+    IncrementalSheetWriter(sheet).upsert_records(
+        [rec("2025-12-02", "A"), rec("2025-12-04", "A"), rec("2025-11-30", "A")]
+    )
+    assert [d for d, _ in keys(sheet)] == [
+        "2025-12-04", "2025-12-03", "2025-12-03", "2025-12-02", "2025-12-01", "2025-11-30",
+    ]
+
+
+def test_block_replace_keeps_position(sheet):
+    stats = IncrementalSheetWriter(sheet).upsert_date(
+        "2025-12-03", [rec("2025-12-03", "B", "X"), rec("2025-12-03", "C")]
+    )
+    assert stats == {"updated": 1, "appended": 1, "deleted": 1}
+    assert keys(sheet) == [("2025-12-03", "B"), ("2025-12-03", "C"), ("2025-12-01", "A")]
+    assert sheet.get_all_values()[1][2] == "X"
@@ -0,0 +1,102 @@
+# ============================================================
+# [Trends] 기수 전체 추이 (날짜 x 학생 행렬 + 롤링 집계)
+# ============================================================
+# 원본 행을 학생마다 루프 돌며 세지 않고, 한 번 날짜 x 학생 행렬로 피벗한 뒤
+# NumPy/pandas 벡터 연산(cumsum, rolling)으로 전부 계산한다.
+# 대시보드는 데이터 버전(날짜 인덱스)이 바뀔 때만 다시 계산 (st.cache_data).
+#
+# 입력은 roster_registry 압축 프레임 (day / student_id 정수 키). 결과도 정수 축
+# (행렬 index = day, columns / 학생 표 index = student_id) 이고, 이름/날짜 라벨은
+# 화면에 낼 때 RosterRegistry.for_display 로 붙인다.
+
+import numpy as np
+import pandas as pd
+
+from roster_registry import SCORE_SCALE, join
+
+ROLLING_WINDOWS = (5, 20)
+
+
+def pivot(df: pd.DataFrame, values: np.ndarray) -> pd.DataFrame:
+    """(day, student_id) 정수 행 -> 날짜 x 학생 float32 행렬 (없는 칸은 NaN, 날짜 오름차순)"""
+    days, day_pos = np.unique(df['day'].to_numpy(), return_inverse=True)
+    ids, id_pos = np.unique(df['student_id'].to_numpy(), return_inverse=True)
+    grid = np.full((len(days), len(ids)), np.nan, dtype=np.float32)
+    grid[day_pos, id_pos] = values  # (day, student_id) 는 히스토리 키라 중복 없음
+    return pd.DataFrame(grid, index=pd.Index(days, name="day"), columns=pd.Index(ids, name="student_id"))
+
+
+def til_matrix(df: pd.DataFrame) -> pd.DataFrame:
+    """제출=1 / 미제출=0"""
+    return pivot(df, df['submitted'].to_numpy())
+
+
+def attendance_matrix(df: pd.DataFrame) -> pd.DataFrame:
+    """출석 점수 (1=출석, 0.5=지각/조퇴, 0=결석)"""
+    return pivot(df, df['score'].to_numpy() / SCORE_SCALE)
+
+
+def streaks(matrix: pd.DataFrame) -> pd.DataFrame:
+    """
+    학생별 (현재 연속 제출, 최장 연속 제출).
+    누적합에서 마지막 미제출 시점의 누적합을 빼면 각 칸의 '연속 길이'가 된다.
+    """
+    hits = (matrix.fillna(0).to_numpy() == 1).astype(np.int32)
+    if hits.size == 0:
+        return pd.DataFrame(columns=["현재연속", "최장연속"])
+    total = hits.cumsum(axis=0)
+    reset = np.maximum.accumulate(np.where(hits == 0, total, 0), axis=0)
+    run = total - reset
+    return pd.DataFrame({"현재연속": run[-1], "최장연속": run.max(axis=0)}, index=matrix.columns)
+
+
+def rolling_rates(matrix: pd.DataFrame, windows=ROLLING_WINDOWS) -> pd.DataFrame:
+    """기수 전체 일별 제출률 + 최근 N일 롤링 평균 (%)"""
+    daily = matrix.mean(axis=1).astype(np.float64) * 100  # float32 행렬 -> 표시용 집계만 float64
+    out = pd.DataFrame({"일별": daily})
+    for w in windows:
+        out[f"{w}일 평균"] = daily.rolling(w, min_periods=1).mean()
+    return out.round(1)
+
+
+def til_trends(df: pd.DataFrame, windows=ROLLING_WINDOWS) -> dict:
+    """{"cohort": 날짜별 롤링 제출률, "students": 학생별 연속/최근 제출률}"""
+    if df.empty:
+        return {"cohort": pd.DataFrame(), "students": pd.DataFrame()}
+    matrix = til_matrix(df)
+    students = streaks(matrix)
+    for w in windows:
+        students[f"최근{w}일 제출률"] = (matrix.tail(w).mean(axis=0).astype(np.float64) * 100).round(1)
+    students["누적 제출"] = matrix.sum(axis=0).astype(np.int32)
+    return {"cohort": rolling_rates(matrix, windows), "students": students.sort_values("현재연속", ascending=False)}
+
+
+def attendance_trends(df: pd.DataFrame) -> dict:
+    """{"cumulative": 날짜 x 학생 누적 점수, "students": 학생별 누적 점수/지각 랭킹}"""
+    if df.empty:
+        return {"cumulative": pd.DataFrame(), "students": pd.DataFrame()}
+    matrix = attendance_matrix(df)
+    values = matrix.to_numpy()
+    days = np.isfinite(values).sum(axis=0)
+    totals = np.nansum(values, axis=0, dtype=np.float64)
+    students = pd.DataFrame({
+        "누적점수": totals,
+        "출석률": np.round(totals / np.maximum(days, 1) * 100, 1),
+        "지각조퇴": (values == 0.5).sum(axis=0),
+        "결석": (values == 0).sum(axis=0),
+        "수업일": days,
+    }, index=matrix.columns)
+    students = students.sort_values(["지각조퇴", "결석"], ascending=False)
+    return {"cumulative": matrix.fillna(0).cumsum(), "students": students}
+
+
+def engagement(til: pd.DataFrame, attendance: pd.DataFrame) -> pd.DataFrame:
+    """학생별 출석한 날(지각/조퇴 포함)의 TIL 제출률 ((day, student_id) 정수 병합)"""
+    if til.empty or attendance.empty:
+        return pd.DataFrame(columns=["출석일", "출석일 TIL 제출", "출석일 제출률"])
+    both = join(til[["day", "student_id", "submitted"]], attendance[["day", "student_id", "score"]])
+    attended = both[both['score'] > 0]
+    grouped = attended.groupby("student_id")['submitted']
+    students = pd.DataFrame({"출석일": grouped.size(), "출석일 TIL 제출": grouped.sum().astype(np.int32)})
+    students["출석일 제출률"] = (students["출석일 TIL 제출"] / students["출석일"] * 100).round(1)
+    return students.sort_values("출석일 제출률")
@@ -0,0 +1,170 @@
+# ============================================================
+# [Wait Layer] 고정 sleep 대신 조건 기반 대기 + 대기 시간 프로파일러
+# ============================================================
+# time.sleep(5), sleep(8) 같은 고정 대기를 "조건이 만족될 때까지만" 기다리는
+# 대기로 교체한다. 모든 대기는 이름을 붙여 소요 시간을 기록하고,
+# 예전 고정 sleep 값(budget)과 비교해서 얼마나 줄었는지 리포트한다.
+
+import json
+import os
+import time
+from collections import defaultdict
+from datetime import datetime
+
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+
+# 페이지 안에서 진행 중인 XHR/fetch 개수 추적 (새 문서마다 자동 주입)
+XHR_TRACKER_JS = """
+if (window.__qaqcPending === undefined) {
+  window.__qaqcPending = 0;
+  const origSend = XMLHttpRequest.prototype.send;
+  XMLHttpRequest.prototype.send = function() {
+    window.__qaqcPending++;
+    this.addEventListener('loadend', () => { window.__qaqcPending--; });
+    return origSend.apply(this, arguments);
+  };
+  if (window.fetch) {
+    const origFetch = window.fetch;
+    window.fetch = function() {
+      window.__qaqcPending++;
+      return origFetch.apply(this, arguments).finally(() => { window.__qaqcPending--; });
+    };
+  }
+}
+"""
+
+SPINNER_CSS = ".ant-spin-spinning"
+
+
+class WaitProfiler:
+    """이름 붙은 대기별 소요 시간 기록 (실행 1회 단위)"""
+
+    def __init__(self):
+        self.records = defaultdict(list)  # name -> [(elapsed, ok, budget)]
+
+    def record(self, name: str, elapsed: float, ok: bool, budget: float = None):
+        self.records[name].append((elapsed, ok, budget))
+
+    def summary(self) -> dict:
+        result = {}
+        for name, items in self.records.items():
+            elapsed = [e for e, _, _ in items]
+            budgets = [b for _, _, b in items if b is not None]
+            result[name] = {
+                "count": len(items),
+                "total": round(sum(elapsed), 3),
+                "avg": round(sum(elapsed) / len(items), 3),
+                "max": round(max(elapsed), 3),
+                "timeouts": sum(1 for _, ok, _ in items if not ok),
+                "budget": round(sum(budgets), 3) if budgets else None,
+            }
+        return result
+
+    def report(self, path: str = None, label: str = ""):
+        """콘솔 출력 + (path 지정 시) JSON-lines 로 누적 저장"""
+        summary = self.summary()
+        if not summary:
+            return summary
+        total = sum(s["total"] for s in summary.values())
+        budget = sum(s["budget"] or 0 for s in summary.values())
+        print(f"\n⏱️ [대기 프로파일] 총 {total:.1f}s (기존 고정 sleep 기준 {budget:.1f}s)")
+        for name, s in sorted(summary.items(), key=lambda kv: -kv[1]["total"]):
+            budget_txt = f" / 기존 {s['budget']:.1f}s" if s["budget"] is not None else ""
+            timeout_txt = f" ⚠️ timeout {s['timeouts']}" if s["timeouts"] else ""
+            print(f"   - {name}: {s['count']}회, 합계 {s['total']:.2f}s, 최대 {s['max']:.2f}s{budget_txt}{timeout_txt}")
+
+        if path:
+            try:
+                os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+                with open(path, "a", encoding="utf-8") as f:
+                    line = {"run_at": datetime.now().isoformat(timespec="seconds"), "label": label, "waits": summary}
+                    f.write(json.dumps(line, ensure_ascii=False) + "\n")
+            except Exception as e:
+                print(f"   ⚠️ 대기 프로파일 저장 실패: {e}")
+        return summary
+
+
+class SmartWait:
+    """DOM/네트워크 조건이 만족될 때까지만 대기 (타임아웃 시 예외 대신 False)"""
+
+    IGNORED = (NoSuchElementException, StaleElementReferenceException)
+
+    def __init__(self, driver, profiler: WaitProfiler = None, timeout: float = 20, poll: float = 0.1):
+        self.driver = driver
+        self.profiler = profiler or WaitProfiler()
+        self.timeout = timeout
+        self.poll = poll
+        self.install_xhr_tracker()
+
+    def install_xhr_tracker(self):
+        if self.driver is None:
+            return
+        try:
+            self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": XHR_TRACKER_JS})
+        except Exception:
+            pass  # CDP 미지원 드라이버 -> network_idle 은 document.readyState 로 대체
+
+    def until(self, name: str, condition, timeout: float = None, budget: float = None):
+        """condition(driver) 가 truthy 가 될 때까지 폴링. 결과값 또는 False 반환."""
+        timeout = self.timeout if timeout is None else timeout
+        started = time.monotonic()
+        result = False
+        while True:
+            try:
+                result = condition(self.driver)
+            except self.IGNORED:
+                result = False
+            if result or time.monotonic() - started >= timeout:
+                break
+            time.sleep(self.poll)
+        self.profiler.record(name, time.monotonic() - started, bool(result), budget)
+        return result
+
+    def sleep(self, name: str, seconds: float):
+        """아직 조건으로 바꾸지 못한 고정 대기 (기록만 남김)"""
+        time.sleep(seconds)
+        self.profiler.record(name, seconds, True, seconds)
+
+    # ---------------- 조건 헬퍼 ----------------
+
+    def _held(self, probe, hold: float):
+        """probe(driver) 값이 hold 초 동안 변하지 않으면 True 를 돌려주는 조건"""
+        state = {"value": object(), "since": 0.0}
+
+        def condition(driver):
+            value = probe(driver)
+            now = time.monotonic()
+            if value != state["value"]:
+                state["value"], state["since"] = value, now
+                return False
+            return now - state["since"] >= hold and value is not None and value is not False
+        return condition
+
+    def document_ready(self, name: str, timeout: float = None, budget: float = None):
+        return self.until(
+            name, lambda d: d.execute_script("return document.readyState") == "complete", timeout, budget
+        )
+
+    def no_spinner(self, name: str, timeout: float = None, budget: float = None):
+        return self.until(name, lambda d: not d.find_elements(By.CSS_SELECTOR, SPINNER_CSS), timeout, budget)
+
+    def network_idle(self, name: str, idle_for: float = 0.5, timeout: float = None, budget: float = None):
+        """진행 중인 XHR/fetch 가 idle_for 초 동안 0개이고 스피너가 없으면 통과"""
+        def probe(d):
+            pending = d.execute_script("return window.__qaqcPending === undefined ? -1 : window.__qaqcPending")
+            if pending == -1:  # 트래커 없음
+                pending = 0 if d.execute_script("return document.readyState") == "complete" else 1
+            return pending == 0 and not d.find_elements(By.CSS_SELECTOR, SPINNER_CSS)
+        return self.until(name, self._held(probe, idle_for), timeout, budget)
+
+    def rows_settled(self, name: str, css: str, min_rows: int = 1, stable_for: float = 0.4,
+                     timeout: float = None, budget: float = None, root=None):
+        """
+        css 에 해당하는 행 개수가 stable_for 초 동안 그대로면 통과 (min_rows=0 이면 빈 표도 허용).
+        root(WebElement)를 주면 그 요소 안에서만 셈.
+        """
+        def probe(d):
+            count = len((root or d).find_elements(By.CSS_SELECTOR, css))
+            return count if count >= min_rows else None
+        return self.until(name, self._held(probe, stable_for), timeout, budget)